@@ -0,0 +1,19 @@
+"""
+Vectorized analysis of parsed methods.
+
+Requires the optional `numpy` dependency (`pip install sgf-parser[numpy]`).
+"""
+
+from sgf_parser.analysis.aggregate import aggregate_intervals
+from sgf_parser.analysis.application_class import application_classes
+from sgf_parser.analysis.bedrock import bedrock_grid, bedrock_points
+from sgf_parser.analysis.cpt import cpt_parameters, cpt_parameters_batch
+from sgf_parser.analysis.dissipation import dissipation_parameters, dissipation_parameters_batch
+from sgf_parser.analysis.dp import DP_EQUIPMENT, DPEquipment, dp_parameters, dp_parameters_batch
+from sgf_parser.analysis.drilling import drilling_parameters, drilling_parameters_batch
+from sgf_parser.analysis.filters import hampel_filter, hampel_filter_batch, rolling_filter, rolling_filter_batch
+from sgf_parser.analysis.merge import group_by_borehole, merge_boreholes, merge_methods
+from sgf_parser.analysis.resample import depth_grid, resample, resample_arrays
+from sgf_parser.analysis.rolling import DepthWindows
+from sgf_parser.analysis.segmentation import detect_layers, detect_layers_batch
+from sgf_parser.analysis.spatial import SpatialIndex
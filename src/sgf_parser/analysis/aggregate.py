@@ -0,0 +1,133 @@
+"""
+Statistics per depth interval over many methods, e.g. for regional reporting
+"""
+
+import re
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.columns import concat_method_arrays
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method
+
+DEFAULT_STATISTICS = ("count", "mean", "min", "p50", "max")
+
+_PERCENTILE = re.compile(r"p(\d+(?:\.\d+)?)")
+
+# Relative tolerance when assigning depths to regular intervals, so that e.g. depth 0.3 with step 0.1 is in [0.3, 0.4)
+_RELATIVE_TOLERANCE = 1e-9
+
+
+def _check_statistic(statistic: str):
+    if statistic in ("count", "mean", "std", "min", "max"):
+        return
+    match = _PERCENTILE.fullmatch(statistic)
+    if match is None or float(match.group(1)) > 100:
+        raise ValueError(f"Unknown statistic {statistic!r}, must be count, mean, std, min, max or a percentile p0-p100")
+
+
+def aggregate_intervals(
+    methods: Sequence["Method"],
+    fields: Sequence[str],
+    interval: float | Sequence[float] = 1.0,
+    statistics: Sequence[str] = DEFAULT_STATISTICS,
+    origin: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """
+    Compute statistics of the given numeric data fields per depth interval, for many methods at once.
+
+    The intervals are either regular, given as the interval length (m) from origin, or given as the sorted interval
+    edges (m). Each interval includes its top and excludes its base (except the base of the last given edge).
+
+    The statistics are any of "count" (number of values), "mean", "std" (population standard deviation), "min", "max"
+    and percentiles as "p<q>", e.g. "p10" or "p50" (median), with linear interpolation. Missing values are ignored.
+
+    Returns a table as a dict of arrays, with one row per method and interval having data rows, ordered by method and
+    depth:
+    - method: Position of the method in methods
+    - depth_from, depth_to: Depth (m) of the interval
+    - "<field>_<statistic>": The statistics of each field, NaN if the interval has no values of the field
+    """
+    for statistic in statistics:
+        _check_statistic(statistic)
+
+    arrays, offsets = concat_method_arrays(methods, ("depth", *fields))
+    depth = arrays["depth"]
+    method = np.repeat(np.arange(len(methods)), np.diff(offsets))
+
+    if np.isscalar(interval):
+        step = float(interval)  # type: ignore[arg-type]
+        if step <= 0:
+            raise ValueError(f"The interval must be positive, got {interval!r}")
+        with np.errstate(invalid="ignore"):
+            position = np.floor((depth - origin) / step + _RELATIVE_TOLERANCE * np.abs(depth - origin) / step)
+        inside = ~np.isnan(position)
+    else:
+        edges = np.asarray(interval, dtype=np.float64)
+        if len(edges) < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError("The interval edges must be at least two increasing depths")
+        position = np.searchsorted(edges, depth, side="right").astype(np.float64) - 1
+        # The base of the last interval is included
+        position[depth == edges[-1]] = len(edges) - 2
+        inside = ~np.isnan(depth) & (position >= 0) & (position < len(edges) - 1)
+
+    method, position = method[inside], position[inside].astype(np.int64)
+    values = {name: arrays[name][inside] for name in fields}
+
+    # Group the rows by (method, interval), keeping the groups ordered by method and depth
+    order = np.lexsort((position, method))
+    method, position = method[order], position[order]
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = (np.diff(method) != 0) | (np.diff(position) != 0)
+    starts = np.flatnonzero(new_group)
+    group = np.cumsum(new_group) - 1
+
+    if np.isscalar(interval):
+        depth_from = origin + position[starts] * step
+        depth_to = depth_from + step
+    else:
+        depth_from, depth_to = edges[position[starts]], edges[position[starts] + 1]
+
+    result = {"method": method[starts], "depth_from": depth_from, "depth_to": depth_to}
+    if not len(starts):
+        result |= {f"{name}_{statistic}": np.empty(0) for name in fields for statistic in statistics}
+        return result
+
+    sizes = np.diff(np.append(starts, len(group)))
+    for name in fields:
+        # Sort the values within each group, with the missing values last
+        field_values = values[name][order]
+        sorted_values = field_values[np.lexsort((field_values, group))]
+        valid = ~np.isnan(sorted_values)
+        count = np.add.reduceat(valid, starts)
+        has_values = count > 0
+        last = starts + np.maximum(count - 1, 0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(has_values, np.add.reduceat(np.where(valid, sorted_values, 0.0), starts) / count, np.nan)
+            for statistic in statistics:
+                if statistic == "count":
+                    value = count
+                elif statistic == "mean":
+                    value = mean
+                elif statistic == "std":
+                    deviation = np.where(valid, sorted_values - np.repeat(mean, sizes), 0.0)
+                    value = np.where(has_values, np.sqrt(np.add.reduceat(deviation**2, starts) / count), np.nan)
+                elif statistic == "min":
+                    value = np.where(has_values, sorted_values[starts], np.nan)
+                elif statistic == "max":
+                    value = np.where(has_values, sorted_values[last], np.nan)
+                else:
+                    rank = starts + float(statistic[1:]) / 100 * np.maximum(count - 1, 0)
+                    lower = np.floor(rank).astype(np.int64)
+                    fraction = rank - lower
+                    interpolated = (
+                        sorted_values[lower] * (1 - fraction) + sorted_values[np.minimum(lower + 1, last)] * fraction
+                    )
+                    value = np.where(has_values, interpolated, np.nan)
+                result[f"{name}_{statistic}"] = value
+
+    return result
@@ -0,0 +1,111 @@
+"""
+Column-wise CPT application class (quality class) computation for many methods at once
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.columns import concat_method_arrays
+from sgf_parser.models.application_class import (
+    DEFAULT_APPLICATION_CLASS_THRESHOLDS,
+    ApplicationClassThresholds,
+    ZeroValueLimit,
+)
+from sgf_parser.models.types import ApplicationClass
+
+if TYPE_CHECKING:
+    from sgf_parser.models import MethodCPT
+
+# Relative tolerance when comparing with the limits, since the values are compared as float64 and not as Decimal.
+# The SGF values have far fewer significant digits than this.
+_RELATIVE_TOLERANCE = 1e-9
+
+_FIELDS = ("depth", "qc", "fs", "u2", "zero_value_resistance", "zero_value_friction", "zero_value_pressure")
+
+
+def _first_satisfied(values: np.ndarray, limits: np.ndarray, classes: np.ndarray) -> np.ndarray:
+    """
+    Return the class of the first limit (per row in limits) that values are within, or OUT_OF_BOUNDS
+    """
+    within = values[:, None] <= limits + np.abs(limits) * _RELATIVE_TOLERANCE
+    return np.where(within.any(axis=1), classes[within.argmax(axis=1)], ApplicationClass.OUT_OF_BOUNDS)
+
+
+def _zero_value_class(
+    last_value: np.ndarray, max_value: np.ndarray, limits: tuple[ZeroValueLimit, ...], valid: np.ndarray
+) -> np.ndarray:
+    absolute = np.array([float(limit.absolute) for limit in limits])
+    relative = np.array([float(limit.relative) for limit in limits])
+    classes = np.array([limit.application_class for limit in limits], dtype=np.int64)
+
+    thresholds = np.maximum(absolute, max_value[:, None] * relative)
+    result = _first_satisfied(np.abs(last_value), thresholds, classes)
+    return np.where(valid & ~np.isnan(last_value), result, ApplicationClass.UNKNOWN)
+
+
+def application_classes(
+    methods: Sequence["MethodCPT"],
+    thresholds: ApplicationClassThresholds = DEFAULT_APPLICATION_CLASS_THRESHOLDS,
+    assign: bool = False,
+) -> dict[str, np.ndarray]:
+    """
+    Compute the application classes of many CPT methods at once, with the given thresholds.
+
+    Gives the same result as `MethodCPT.classify()`. Returns arrays (one value per method) of ApplicationClass values
+    for the keys "depth", "resistance", "friction" and "pressure", and the combined "application_class" (the worst of
+    the four). If assign is True, the classes are also stored on the methods.
+    """
+    arrays, offsets = concat_method_arrays(methods, _FIELDS)
+    starts, stops = offsets[:-1], offsets[1:]
+    lengths = stops - starts
+    # Like MethodCPT, the classes need at least two data rows
+    valid = lengths >= 2
+
+    non_empty = np.flatnonzero(lengths > 0)
+
+    def max_value(name: str) -> np.ndarray:
+        """Max value per method, missing values counted as 0"""
+        result = np.zeros(len(methods))
+        if len(non_empty):
+            result[non_empty] = np.maximum.reduceat(np.nan_to_num(arrays[name], nan=0.0), starts[non_empty])
+        return result
+
+    def last_value(name: str) -> np.ndarray:
+        result = np.full(len(methods), np.nan)
+        result[valid] = arrays[name][stops[valid] - 1]
+        return result
+
+    delta_depth = np.full(len(methods), np.nan)
+    delta_depth[valid] = arrays["depth"][starts[valid] + 1] - arrays["depth"][starts[valid]]
+    depth_limits = np.array([float(limit.max_delta_depth) for limit in thresholds.depth])
+    depth_classes = np.array([limit.application_class for limit in thresholds.depth], dtype=np.int64)
+    depth_class = np.where(
+        np.isnan(delta_depth) | (delta_depth == 0),
+        ApplicationClass.UNKNOWN,
+        _first_satisfied(delta_depth, np.broadcast_to(depth_limits, (len(methods), len(depth_limits))), depth_classes),
+    )
+
+    result = {
+        "depth": depth_class,
+        "resistance": _zero_value_class(
+            last_value("zero_value_resistance"), max_value("qc"), thresholds.resistance, valid
+        ),
+        "friction": _zero_value_class(last_value("zero_value_friction"), max_value("fs"), thresholds.friction, valid),
+        "pressure": _zero_value_class(last_value("zero_value_pressure"), max_value("u2"), thresholds.pressure, valid),
+    }
+    result["application_class"] = np.maximum.reduce(list(result.values()))
+
+    if assign:
+        for method, depth, resistance, friction, pressure in zip(
+            methods, result["depth"], result["resistance"], result["friction"], result["pressure"]
+        ):
+            if not method.method_data:
+                continue
+            method.application_class_depth = ApplicationClass(depth)
+            method.application_class_resistance = ApplicationClass(resistance)
+            method.application_class_friction = ApplicationClass(friction)
+            method.application_class_pressure = ApplicationClass(pressure)
+
+    return result
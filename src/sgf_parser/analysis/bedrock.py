@@ -0,0 +1,227 @@
+"""
+Bedrock surface interpolation from the bedrock elevations of many soundings (TOT and SRS)
+"""
+
+import math
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.analysis.spatial import SpatialIndex
+from sgf_parser.models import MethodType, StopCode
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method
+
+# Method types of soundings that detect rock
+_ROCK_METHOD_TYPES = (MethodType.TOT, MethodType.SRS)
+
+# Stop codes of soundings ended before reaching rock, where bedrock is below the end of the sounding
+_NOT_REACHED_CODES = (StopCode.INTERRUPTED_WITHOUT_STOP_90, StopCode.CANNOT_DRIVE_FURTHER_91)
+
+# Max number of elements of the (grid nodes x data points) distance matrices of one chunk
+_MAX_CHUNK_ELEMENTS = 1 << 22
+
+
+def _bedrock_point(method: "Method") -> tuple[float, bool] | None:
+    """
+    Return the bedrock elevation of a method, and if it is an upper bound (rock not reached), or None
+    """
+    if method.method_type not in _ROCK_METHOD_TYPES or method.point_x is None or method.point_y is None:
+        return None
+
+    elevation = getattr(method, "bedrock_elevation", None)
+    if elevation is not None:
+        return float(elevation), False
+
+    if method.stopcode in _NOT_REACHED_CODES and method.point_z is not None and method.depth_base is not None:
+        return float(method.point_z) - float(method.depth_base), True
+
+    return None
+
+
+def bedrock_points(methods: Sequence["Method"]) -> tuple[list["Method"], dict[str, np.ndarray]]:
+    """
+    Collect the bedrock observations of the TOT and SRS soundings with coordinates, other methods are skipped.
+
+    Returns the methods used, and arrays (one value per method used) of "x", "y", "elevation" and "upper_bound". For
+    soundings that reached rock, elevation is the bedrock elevation. For soundings that did not reach rock (stop codes
+    90 and 91), the depth to rock is at least the depth of the sounding, so elevation is the elevation of the end of the
+    sounding, an upper bound of the bedrock elevation, and upper_bound is True.
+    """
+    used, elevations, upper_bounds = [], [], []
+    for method in methods:
+        point = _bedrock_point(method)
+        if point is not None:
+            used.append(method)
+            elevations.append(point[0])
+            upper_bounds.append(point[1])
+
+    return used, {
+        "x": np.array([method.point_x for method in used], dtype=np.float64),
+        "y": np.array([method.point_y for method in used], dtype=np.float64),
+        "elevation": np.array(elevations, dtype=np.float64),
+        "upper_bound": np.array(upper_bounds, dtype=np.bool_),
+    }
+
+
+def _idw_candidates(
+    index: SpatialIndex,
+    values: np.ndarray,
+    candidates: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    power: float,
+    max_neighbours: int,
+    max_distance: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Inverse distance weighting of values at the points (x, y), using the max_neighbours nearest of the candidate
+    methods within max_distance. Returns the values and the distance of the farthest neighbour of each point (inf with
+    fewer than max_neighbours candidates). The points are evaluated in chunks, limiting the memory used.
+    """
+    result = np.full(len(x), np.nan)
+    farthest = np.full(len(x), np.inf)
+    if not len(candidates):
+        return result, farthest
+
+    chunk_size = max(1, _MAX_CHUNK_ELEMENTS // len(candidates))
+    for start in range(0, len(x), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        distance = np.hypot(x[chunk, None] - index.x[candidates], y[chunk, None] - index.y[candidates])
+        neighbours = np.broadcast_to(candidates, distance.shape)
+        if max_neighbours < len(candidates):
+            nearest = np.argpartition(distance, max_neighbours - 1, axis=1)[:, :max_neighbours]
+            distance = np.take_along_axis(distance, nearest, axis=1)
+            neighbours = candidates[nearest]
+        if max_neighbours <= len(candidates):
+            farthest[chunk] = distance.max(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(distance <= max_distance, distance ** (-power), 0.0)
+            # Points at a data point get its value
+            exact = distance == 0
+            weight = np.where(exact.any(axis=1, keepdims=True), exact.astype(np.float64), weight)
+            total = weight.sum(axis=1)
+            result[chunk] = np.where(total > 0, (weight * values[neighbours]).sum(axis=1) / total, np.nan)
+
+    return result, farthest
+
+
+def _idw(
+    index: SpatialIndex,
+    values: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    power: float,
+    max_neighbours: int,
+    max_distance: float,
+) -> np.ndarray:
+    """
+    Inverse distance weighting of values (at the methods of index) at the points (x, y), using the max_neighbours
+    nearest methods within max_distance.
+
+    The points are grouped in square tiles of the cell size of the index. The candidate methods of a tile are the
+    methods of the index within a margin around it, and the margin is doubled until it holds the max_neighbours nearest
+    methods of every point of the tile (or all methods within max_distance). So each point is only compared
+    with the methods near it, not with all methods.
+    """
+    result = np.full(len(x), np.nan)
+    if not len(x) or not len(index):
+        return result
+
+    tile_size = index.cell_size
+    column = np.floor((x - x.min()) / tile_size).astype(np.int64)
+    row = np.floor((y - y.min()) / tile_size).astype(np.int64)
+    order = np.argsort(column * (row.max() + 1) + row, kind="stable")
+    keys = (column * (row.max() + 1) + row)[order]
+    tiles = np.split(order, np.flatnonzero(np.diff(keys)) + 1)
+
+    for tile in tiles:
+        tile_x, tile_y = x[tile], y[tile]
+        margin = index.cell_size * math.sqrt(max_neighbours) / 2
+        while True:
+            search = min(margin, max_distance)
+            candidates = index.query_bbox(
+                float(tile_x.min()) - search,
+                float(tile_y.min()) - search,
+                float(tile_x.max()) + search,
+                float(tile_y.max()) + search,
+            )
+            complete = search >= max_distance or len(candidates) == len(index)
+            if complete or len(candidates) >= max_neighbours:
+                tile_values, farthest = _idw_candidates(
+                    index, values, candidates, tile_x, tile_y, power, max_neighbours, max_distance
+                )
+                # Methods outside the candidates are farther than search from all points of the tile
+                if complete or (farthest <= search).all():
+                    result[tile] = tile_values
+                    break
+            margin *= 2
+
+    return result
+
+
+def bedrock_grid(
+    methods: Sequence["Method"],
+    cell_size: float,
+    bounds: tuple[float, float, float, float] | None = None,
+    power: float = 2.0,
+    max_neighbours: int = 12,
+    max_distance: float = math.inf,
+) -> dict[str, np.ndarray]:
+    """
+    Interpolate the bedrock elevation of many soundings onto a regular grid, by inverse distance weighting.
+
+    The observations are given by `bedrock_points`. The surface is interpolated from the soundings that reached rock,
+    using the max_neighbours nearest soundings within max_distance (m) of each grid node, found with a spatial index,
+    with weights 1 / distance ** power. Soundings that did not reach rock are upper bounds: where the interpolated
+    surface is above such a bound, the bound is added as an observation, pulling the surface down below the sounding.
+
+    The grid nodes are every cell_size (m) from the minimum x and y of bounds (min_x, min_y, max_x, max_y), by default
+    the extent of the soundings. The grid is evaluated in chunks, so the memory use is bounded for large grids.
+
+    Returns "x" and "y", the coordinates of the grid columns and rows, and "elevation", the (rows x columns) grid.
+    Nodes without soundings within max_distance are NaN.
+    """
+    if cell_size <= 0:
+        raise ValueError(f"The cell size must be positive, got {cell_size!r}")
+    if max_neighbours < 1:
+        raise ValueError(f"max_neighbours must be at least 1, got {max_neighbours!r}")
+
+    used, points = bedrock_points(methods)
+    if bounds is None:
+        if not used:
+            raise ValueError("No soundings with bedrock observations and coordinates, and no bounds given")
+        bounds = (points["x"].min(), points["y"].min(), points["x"].max(), points["y"].max())
+
+    min_x, min_y, max_x, max_y = bounds
+    grid_x = min_x + cell_size * np.arange(math.floor((max_x - min_x) / cell_size + 1e-9) + 1)
+    grid_y = min_y + cell_size * np.arange(math.floor((max_y - min_y) / cell_size + 1e-9) + 1)
+
+    observed = ~points["upper_bound"]
+    observed_index = SpatialIndex([method for method, keep in zip(used, observed) if keep])
+    elevation = points["elevation"][observed]
+
+    # Add the upper bounds that the surface from the observations does not honour
+    bound = np.flatnonzero(points["upper_bound"])
+    estimate = _idw(
+        observed_index, elevation, points["x"][bound], points["y"][bound], power, max_neighbours, max_distance
+    )
+    violated = bound[estimate > points["elevation"][bound]]
+    if len(violated):
+        observed[violated] = True
+        observed_index = SpatialIndex([method for method, keep in zip(used, observed) if keep])
+        elevation = points["elevation"][observed]
+
+    # Evaluate the grid in bands of rows, so the node coordinates of each band are limited in size
+    grid = np.full((len(grid_y), len(grid_x)), np.nan)
+    band_rows = max(1, _MAX_CHUNK_ELEMENTS // max(len(grid_x) * 64, 1))
+    for start in range(0, len(grid_y), band_rows):
+        band_y = grid_y[start : start + band_rows]
+        node_x, node_y = np.meshgrid(grid_x, band_y)
+        values = _idw(observed_index, elevation, node_x.ravel(), node_y.ravel(), power, max_neighbours, max_distance)
+        grid[start : start + len(band_y)] = values.reshape(len(band_y), len(grid_x))
+
+    return {"x": grid_x, "y": grid_y, "elevation": grid}
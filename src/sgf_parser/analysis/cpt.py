@@ -0,0 +1,182 @@
+"""
+Derived CPT parameters (corrected cone resistance, friction ratio, pore pressure ratio and soil behaviour type index)
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.columns import concat_method_arrays, header_column, split_arrays
+
+if TYPE_CHECKING:
+    from sgf_parser.models import MethodCPT
+
+# Atmospheric pressure (kPa)
+ATMOSPHERIC_PRESSURE = 101.325
+
+# Unit weight of water (kN/m3)
+WATER_UNIT_WEIGHT = 9.81
+
+_INPUT_FIELDS = ("depth", "qc", "fs", "u2")
+
+
+def _soil_behaviour_type_index(
+    qt: np.ndarray,
+    fs: np.ndarray,
+    sigma_v0: np.ndarray,
+    sigma_v0_eff: np.ndarray,
+    max_iterations: int,
+    tolerance: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Robertson (2009) soil behaviour type index Ic, with the stress exponent n found by iteration.
+
+    qt in kPa, fs in kPa, sigma_v0 and sigma_v0_eff in kPa.
+    Return the arrays (Qtn, Fr, n, Ic).
+    """
+    pa = ATMOSPHERIC_PRESSURE
+    with np.errstate(divide="ignore", invalid="ignore"):
+        net = qt - sigma_v0
+        fr = np.where(net > 0, fs / net * 100, np.nan)
+        log_fr = np.log10(np.where(fr > 0, fr, np.nan))
+
+        def normalize(n: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            qtn = np.where((net > 0) & (sigma_v0_eff > 0), net / pa * (pa / sigma_v0_eff) ** n, np.nan)
+            ic = np.sqrt((3.47 - np.log10(np.where(qtn > 0, qtn, np.nan))) ** 2 + (log_fr + 1.22) ** 2)
+            return qtn, ic
+
+        # Iterate each row until its stress exponent converges, so the result of a row does not depend on the
+        # other rows in a batch
+        n = np.ones_like(qt)
+        active = np.ones(qt.shape, dtype=np.bool_)
+        for _ in range(max_iterations):
+            _, ic = normalize(n)
+            n_new = np.clip(0.381 * ic + 0.05 * (sigma_v0_eff / pa) - 0.15, None, 1.0)
+            n_new = np.where(active & ~np.isnan(n_new), n_new, n)
+            active &= np.abs(n_new - n) >= tolerance
+            n = n_new
+            if not active.any():
+                break
+
+        qtn, ic = normalize(n)
+
+    return qtn, fr, n, ic
+
+
+def _compute(
+    depth: np.ndarray,
+    qc: np.ndarray,
+    fs: np.ndarray,
+    u2: np.ndarray,
+    cone_area_ratio: np.ndarray,
+    water_level: np.ndarray,
+    predrilling_depth: np.ndarray,
+    unit_weight: float,
+    max_iterations: int,
+    tolerance: float,
+) -> dict[str, np.ndarray]:
+    """
+    The computations on flat arrays, shared by one method and batches. The header values are given per row.
+    """
+    qc_kpa = qc * 1000
+    qt = qc_kpa + u2 * (1 - cone_area_ratio)
+    # Without a pore pressure reading, use the uncorrected cone resistance
+    qt = np.where(np.isnan(u2), qc_kpa, qt)
+
+    u0 = WATER_UNIT_WEIGHT * np.clip(depth - water_level, 0, None)
+    sigma_v0 = unit_weight * depth
+    sigma_v0_eff = sigma_v0 - u0
+    qn = qt - sigma_v0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rf = np.where(qt > 0, fs / qt * 100, np.nan)
+        bq = np.where(qn > 0, (u2 - u0) / qn, np.nan)
+
+    qtn, fr, n, ic = _soil_behaviour_type_index(qt, fs, sigma_v0, sigma_v0_eff, max_iterations, tolerance)
+
+    result = {
+        "depth": depth,
+        "qt": qt / 1000,
+        "qn": qn / 1000,
+        "rf": rf,
+        "bq": bq,
+        "u0": u0,
+        "sigma_v0": sigma_v0,
+        "sigma_v0_eff": sigma_v0_eff,
+        "qtn": qtn,
+        "fr": fr,
+        "n": n,
+        "ic": ic,
+    }
+
+    # No valid penetration data in the predrilled part of the hole
+    predrilled = depth < predrilling_depth
+    for name, array in result.items():
+        if name not in ("depth", "u0", "sigma_v0", "sigma_v0_eff"):
+            array[predrilled] = np.nan
+
+    return result
+
+
+def cpt_parameters_batch(
+    methods: Sequence["MethodCPT"],
+    unit_weight: float = 19.0,
+    default_water_level: float = 0.0,
+    max_iterations: int = 20,
+    tolerance: float = 1e-3,
+) -> list[dict[str, np.ndarray]]:
+    """
+    Compute the derived CPT parameters for many methods at once, see `cpt_parameters`.
+
+    The data of all methods are concatenated into flat arrays, and the computations are done once over all rows.
+    Returns one dict of arrays per method, in the same order as the methods.
+    """
+    arrays, offsets = concat_method_arrays(methods, _INPUT_FIELDS)
+    lengths = np.diff(offsets)
+
+    result = _compute(
+        depth=arrays["depth"],
+        qc=arrays["qc"],
+        fs=arrays["fs"],
+        u2=arrays["u2"],
+        # Without a cone area ratio, qt is equal to qc
+        cone_area_ratio=np.repeat(header_column(methods, "cone_area_ratio", 1.0), lengths),
+        water_level=np.repeat(header_column(methods, "water_level", default_water_level), lengths),
+        predrilling_depth=np.repeat(header_column(methods, "predrilling_depth", 0.0), lengths),
+        unit_weight=unit_weight,
+        max_iterations=max_iterations,
+        tolerance=tolerance,
+    )
+
+    return split_arrays(result, offsets)
+
+
+def cpt_parameters(
+    method: "MethodCPT",
+    unit_weight: float = 19.0,
+    default_water_level: float = 0.0,
+    max_iterations: int = 20,
+    tolerance: float = 1e-3,
+) -> dict[str, np.ndarray]:
+    """
+    Compute derived CPT parameters, as arrays aligned with the depth column of the method data.
+
+    - qt: Corrected cone resistance (MPa), qt = qc + u2 * (1 - a), where a is the cone area ratio (MA/IE).
+      If the cone area ratio is not given, qt = qc.
+    - qn: Net cone resistance (MPa), qn = qt - sigma_v0
+    - rf: Friction ratio (%), Rf = fs / qt
+    - bq: Pore pressure ratio, Bq = (u2 - u0) / qn
+    - u0: Hydrostatic pore pressure (kPa), from the water level (HG). If the water level is not given,
+      default_water_level (m below the ground surface) is used.
+    - sigma_v0: Total vertical stress (kPa), from the unit_weight (kN/m3) of the soil
+    - sigma_v0_eff: Effective vertical stress (kPa)
+    - qtn: Normalized cone resistance, Qtn = ((qt - sigma_v0) / pa) * (pa / sigma_v0_eff) ** n
+    - fr: Normalized friction ratio (%), Fr = fs / (qt - sigma_v0)
+    - n: Stress exponent
+    - ic: Soil behaviour type index (Robertson 2009), Ic = ((3.47 - log Qtn) ** 2 + (log Fr + 1.22) ** 2) ** 0.5
+
+    The values are NaN where they are undefined, and above the predrilling depth (HO).
+    """
+    [result] = cpt_parameters_batch([method], unit_weight, default_water_level, max_iterations, tolerance)
+    return result
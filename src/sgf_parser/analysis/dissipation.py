@@ -0,0 +1,192 @@
+"""
+Pore pressure dissipation test (DT) analysis: t50/t90 and the equilibrium pore pressure
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.columns import concat_method_arrays, header_column
+
+if TYPE_CHECKING:
+    from sgf_parser.models import MethodDT
+
+# Unit weight of water (kN/m3)
+WATER_UNIT_WEIGHT = 9.81
+
+_FIELDS = ("time", "u2", "depth")
+
+
+def _per_method(value: float | Sequence[float] | None, count: int) -> np.ndarray:
+    """Broadcast a scalar or sequence (None as NaN) to one float per method"""
+    if value is None:
+        return np.full(count, np.nan)
+    if np.isscalar(value):
+        return np.full(count, float(value))  # type: ignore[arg-type]
+    return np.array([np.nan if item is None else item for item in value], dtype=np.float64)
+
+
+def _group_sums(group: np.ndarray, count: int, *values: np.ndarray) -> list[np.ndarray]:
+    return [np.bincount(group, weights=value, minlength=count) for value in values]
+
+
+def _linear_fit(
+    x: np.ndarray, y: np.ndarray, group: np.ndarray, mask: np.ndarray, count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Least squares fit y = a + b x per method, of the rows in mask. Returns (a, b), NaN for less than two rows.
+    """
+    x, y, group = x[mask], y[mask], group[mask]
+    n, sx, sy = _group_sums(group, count, np.ones(len(x)), x, y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x, mean_y = sx / n, sy / n
+        dx, dy = x - mean_x[group], y - mean_y[group]
+        sxx, sxy = _group_sums(group, count, dx * dx, dx * dy)
+        slope = np.where((n >= 2) & (sxx > 0), sxy / sxx, np.nan)
+    return mean_y - slope * mean_x, slope
+
+
+def _crossing_time(
+    time: np.ndarray,
+    ratio: np.ndarray,
+    group: np.ndarray,
+    after: np.ndarray,
+    offsets: np.ndarray,
+    target: float,
+) -> np.ndarray:
+    """
+    Time of the first row after the peak with a degree of dissipation ratio at or below target, interpolated against
+    the previous row with both a time and a pore pressure, linearly in log time (linearly in time if the previous time
+    is zero).
+    """
+    count = len(offsets) - 1
+    index = np.arange(len(time))
+    crossed = after & (ratio <= target)
+    first = np.full(count, len(time))
+    np.minimum.at(first, group[crossed], index[crossed])
+
+    result = np.full(count, np.nan)
+    found = first < len(time)
+    row = first[found]
+    # Rows after the peak have finite values, so skip back over missing values to the last of those. At the peak row
+    # itself there is nothing to interpolate against.
+    last_after = np.maximum.accumulate(np.where(after, index, -1))
+    previous = last_after[np.maximum(row - 1, 0)]
+    previous = np.where((previous >= 0) & (group[np.maximum(previous, 0)] == group[row]), previous, row)
+    t0, t1 = time[previous], time[row]
+    r0, r1 = ratio[previous], ratio[row]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(r0 != r1, (r0 - target) / (r0 - r1), 1.0)
+        result[found] = np.where((t0 > 0) & (t1 > 0), t0 * (t1 / t0) ** fraction, t0 + fraction * (t1 - t0))
+    return result
+
+
+def dissipation_parameters_batch(
+    methods: Sequence["MethodDT"],
+    u0: float | Sequence[float | None] | None = None,
+    water_level: float | Sequence[float | None] | None = None,
+    tail_fraction: float = 0.25,
+    root_time: bool = False,
+    root_time_range: tuple[float, float] = (0.3, 0.7),
+) -> dict[str, np.ndarray]:
+    """
+    Analyse many dissipation tests at once, see `dissipation_parameters`.
+
+    Returns arrays with one value per method, in the same order as the methods.
+    """
+    count = len(methods)
+    arrays, offsets = concat_method_arrays(methods, _FIELDS)
+    lengths = np.diff(offsets)
+    group = np.repeat(np.arange(count), lengths)
+    time, u2 = arrays["time"], arrays["u2"]
+    valid = ~np.isnan(time) & ~np.isnan(u2)
+
+    # Test depth from the IC header, else the depth of the data rows
+    depth = header_column(methods, "depth")
+    row_depth = np.full(count, np.nan)
+    has_depth = valid & ~np.isnan(arrays["depth"])
+    np.fmax.at(row_depth, group[has_depth], arrays["depth"][has_depth])
+    depth = np.where(np.isnan(depth), row_depth, depth)
+
+    # Initial (peak) pore pressure. Dissipation is measured from the peak, which also handles dilatory responses.
+    index = np.arange(len(time))
+    ui = np.full(count, -np.inf)
+    np.maximum.at(ui, group[valid], u2[valid])
+    ui[np.isinf(ui)] = np.nan
+    peak = np.full(count, len(time))
+    at_peak = valid & (u2 == ui[group])
+    np.minimum.at(peak, group[at_peak], index[at_peak])
+    after = valid & (index >= peak[group])
+
+    # Equilibrium pore pressure: given, else hydrostatic from the water level (given, else from the HG header), else
+    # extrapolated from the tail of the curve to infinite time, as the intercept of u2 against 1 / sqrt(time)
+    u0 = _per_method(u0, count)
+    water_level = _per_method(water_level, count)
+    water_level = np.where(np.isnan(water_level), header_column(methods, "water_level"), water_level)
+    hydrostatic = WATER_UNIT_WEIGHT * np.clip(depth - water_level, 0, None)
+    u0 = np.where(np.isnan(u0), hydrostatic, u0)
+
+    end_time = np.full(count, np.nan)
+    np.fmax.at(end_time, group[valid], time[valid])
+    start_time = np.full(count, np.nan)
+    has_peak = peak < len(time)
+    start_time[has_peak] = time[peak[has_peak]]
+    tail = after & (time > 0) & (time >= (end_time - tail_fraction * (end_time - start_time))[group])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        extrapolated, _ = _linear_fit(1 / np.sqrt(time), u2, group, tail, count)
+    u0 = np.where(np.isnan(u0), extrapolated, u0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = (u2 - u0[group]) / (ui - u0)[group]
+
+    result = {
+        "depth": depth,
+        "ui": ui,
+        "u0": u0,
+        "t50": _crossing_time(time, ratio, group, after, offsets, 0.5),
+        "t90": _crossing_time(time, ratio, group, after, offsets, 0.1),
+    }
+
+    if root_time:
+        # Fit u2 = a + b sqrt(time) to the initial part of the curve, and solve it for 50 % dissipation from the
+        # corrected initial pore pressure a
+        low, high = root_time_range
+        fit = after & (ratio >= 1 - high) & (ratio <= 1 - low)
+        ui_root, slope = _linear_fit(np.sqrt(np.clip(time, 0, None)), u2, group, fit, count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sqrt_t50 = (u0 + 0.5 * (ui_root - u0) - ui_root) / slope
+        result["ui_root"] = ui_root
+        result["t50_root"] = np.where(sqrt_t50 >= 0, sqrt_t50**2, np.nan)
+
+    return result
+
+
+def dissipation_parameters(
+    method: "MethodDT",
+    u0: float | None = None,
+    water_level: float | None = None,
+    tail_fraction: float = 0.25,
+    root_time: bool = False,
+    root_time_range: tuple[float, float] = (0.3, 0.7),
+) -> dict[str, float]:
+    """
+    Analyse a pore pressure dissipation test.
+
+    - depth: Test depth (m), from the header or else the data rows
+    - ui: Initial pore pressure (kPa), the peak u2. The dissipation is measured from the peak, so dilatory tests are
+      handled as well.
+    - u0: Equilibrium pore pressure (kPa). If not given, the hydrostatic pressure from water_level (depth of the
+      ground water table, m) is used, by default the water level of the header (HG). If neither is known, u0 is
+      estimated by extrapolating the last tail_fraction of the test duration to infinite time, as the intercept of
+      the linear fit of u2 against 1 / sqrt(time).
+    - t50, t90: Time (s) to 50 % and 90 % dissipation of the excess pore pressure ui - u0, interpolated linearly in
+      log time.
+
+    If root_time is True, the root time method is used as well: u2 = a + b sqrt(time) is fitted to the rows with
+    a degree of dissipation within root_time_range, giving the corrected initial pore pressure ui_root = a and t50_root.
+
+    Values that can not be determined (e.g. the test ended before 90 % dissipation) are NaN.
+    """
+    result = dissipation_parameters_batch([method], u0, water_level, tail_fraction, root_time, root_time_range)
+    return {name: float(value[0]) for name, value in result.items()}
@@ -0,0 +1,123 @@
+"""
+Blow count normalization and dynamic point resistance for Dynamic Probing (DP), EN ISO 22476-2
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+from sgf_parser.columns import concat_method_arrays, split_arrays
+from sgf_parser.models.types import DPType
+
+if TYPE_CHECKING:
+    from sgf_parser.models import MethodDP
+
+# Acceleration of gravity (m/s2)
+GRAVITY = 9.81
+
+
+class DPEquipment(NamedTuple):
+    """
+    Dynamic probing equipment
+    """
+
+    hammer_mass: float  # kg
+    fall_height: float  # m
+    cone_area: float  # m2
+    rod_mass: float  # kg/m
+    anvil_mass: float  # kg, anvil and guiding rod
+
+
+# EN ISO 22476-2, table 1. The rod and anvil masses are the max values of the standard.
+DP_EQUIPMENT: dict[DPType, DPEquipment] = {
+    DPType.DPL: DPEquipment(10.0, 0.5, 10e-4, 3.0, 6.0),
+    DPType.DPM: DPEquipment(30.0, 0.5, 15e-4, 6.0, 18.0),
+    DPType.DPH: DPEquipment(50.0, 0.5, 15e-4, 6.0, 18.0),
+    DPType.DPSHA: DPEquipment(63.5, 0.5, 16e-4, 6.0, 18.0),
+    DPType.DPSHB: DPEquipment(63.5, 0.75, 20e-4, 8.0, 30.0),
+}
+
+_FIELDS = ("depth", "ramming", "torque")
+
+
+def dp_parameters_batch(
+    methods: Sequence["MethodDP"],
+    energy_ratio: float = 1.0,
+    reference_energy_ratio: float = 1.0,
+    subtract_rod_friction: bool = False,
+    rod_friction_factor: float = 0.04,
+    equipment: Mapping[DPType, DPEquipment] = DP_EQUIPMENT,
+) -> list[dict[str, np.ndarray]]:
+    """
+    Compute the DP parameters for many methods at once, see `dp_parameters`.
+
+    Returns one dict of arrays per method, in the same order as the methods.
+    """
+    arrays, offsets = concat_method_arrays(methods, _FIELDS)
+    lengths = np.diff(offsets)
+
+    def per_row(attribute: str) -> np.ndarray:
+        values = [getattr(equipment[method.dynamic_probing_type], attribute) for method in methods]
+        return np.repeat(np.array(values, dtype=np.float64), lengths)
+
+    hammer_mass = per_row("hammer_mass")
+    fall_height = per_row("fall_height")
+    cone_area = per_row("cone_area")
+    depth = arrays["depth"]
+
+    # The ramming is stored as blows per 0.2 m, see MethodData.ramming_validator
+    n_20 = arrays["ramming"]
+    if subtract_rod_friction:
+        # Torque is stored in kNm, the factor is in blows per Nm
+        rod_friction = rod_friction_factor * np.nan_to_num(arrays["torque"], nan=0.0) * 1000
+        n_20 = np.clip(n_20 - rod_friction, 0, None)
+
+    n_10 = n_20 / 2
+    n_energy = n_20 * energy_ratio / reference_energy_ratio
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Mean penetration per blow (m)
+        penetration_per_blow = np.where(n_20 > 0, 0.2 / n_20, np.nan)
+        # Dynamic point resistance rd = E / (A e), in MPa
+        energy = energy_ratio * hammer_mass * GRAVITY * fall_height
+        rd = energy / (cone_area * penetration_per_blow) / 1e6
+        # Dynamic point resistance corrected for the mass of the rods, anvil and guiding rod
+        driven_mass = per_row("anvil_mass") + per_row("rod_mass") * np.nan_to_num(depth, nan=0.0)
+        qd = rd * hammer_mass / (hammer_mass + driven_mass)
+
+    result = {"depth": depth, "n_10": n_10, "n_20": n_20, "n_energy": n_energy, "rd": rd, "qd": qd}
+    return split_arrays(result, offsets)
+
+
+def dp_parameters(
+    method: "MethodDP",
+    energy_ratio: float = 1.0,
+    reference_energy_ratio: float = 1.0,
+    subtract_rod_friction: bool = False,
+    rod_friction_factor: float = 0.04,
+    equipment: Mapping[DPType, DPEquipment] = DP_EQUIPMENT,
+) -> dict[str, np.ndarray]:
+    """
+    Compute normalized blow counts and the dynamic point resistance, as arrays aligned with the depth column.
+
+    - n_10: Blows per 0.1 m
+    - n_20: Blows per 0.2 m
+    - n_energy: Blows per 0.2 m, energy corrected N = n_20 * energy_ratio / reference_energy_ratio. The energy_ratio is
+      the measured ratio of the delivered to the theoretical energy of the equipment, and e.g. a
+      reference_energy_ratio of 0.6 gives N60.
+    - rd: Dynamic point resistance (MPa), rd = Er * M * g * h / (A * e), EN ISO 22476-2
+    - qd: Dynamic point resistance (MPa), corrected for the mass M' of the rods, anvil and guiding rod,
+      qd = rd * M / (M + M')
+
+    The hammer mass M, fall height h, cone area A and rod/anvil masses are given by the dynamic probing type of the
+    method, see `DP_EQUIPMENT`. The rod length is taken to be the depth.
+
+    If subtract_rod_friction is True, the rod friction is subtracted from the blow counts as
+    N' = N - rod_friction_factor * torque (torque in Nm), before computing the other parameters. The default factor
+    0.04 blows/Nm is the correction used in Swedish practice for DPSH-B.
+    """
+    [result] = dp_parameters_batch(
+        [method], energy_ratio, reference_energy_ratio, subtract_rod_friction, rod_friction_factor, equipment
+    )
+    return result
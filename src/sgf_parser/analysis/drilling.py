@@ -0,0 +1,93 @@
+"""
+Drilling parameter analytics for Total sounding (TOT), Soil Rock Sounding (SRS) and Rotary Pressure sounding (RP)
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.analysis.rolling import DepthWindows
+from sgf_parser.columns import concat_method_arrays, split_arrays
+from sgf_parser.models.sounding import DEFAULT_ROLLING_FIELDS
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method
+
+_FIELDS = ("depth", "penetration_force", "penetration_rate", "rotation_rate", "torque")
+_PARAMETERS = (
+    "specific_energy",
+    "penetration_per_revolution",
+    "penetration_resistance",
+    "normalized_penetration_resistance",
+)
+
+
+def drilling_parameters_batch(
+    methods: Sequence["Method"],
+    bit_diameter: float = 0.057,
+    window: float = 0.5,
+    rolling_fields: Sequence[str] = DEFAULT_ROLLING_FIELDS,
+) -> list[dict[str, np.ndarray]]:
+    """
+    Compute the drilling parameters for many methods at once, see `drilling_parameters`.
+
+    Returns one dict of arrays per method, in the same order as the methods.
+    """
+    data_fields = _FIELDS + tuple(name for name in rolling_fields if name not in _PARAMETERS + _FIELDS)
+    arrays, offsets = concat_method_arrays(methods, data_fields)
+    force = arrays["penetration_force"]  # kN
+    rate = arrays["penetration_rate"]  # mm/s
+    rotation = arrays["rotation_rate"]  # rpm
+    torque = np.nan_to_num(arrays["torque"], nan=0.0)  # kNm
+
+    area = np.pi * bit_diameter**2 / 4
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate_m_s = np.where(rate > 0, rate / 1000, np.nan)
+        # Teale (1965): e = F / A + 2 pi N T / (A v), here in kJ/m3 (kPa), converted to MJ/m3
+        rotary = np.where(rotation > 0, 2 * np.pi * (rotation / 60) * torque / (area * rate_m_s), 0.0)
+        specific_energy = (force / area + rotary) / 1000
+        penetration_per_revolution = np.where(rotation > 0, rate * 60 / rotation, np.nan)
+        penetration_resistance = force / np.where(rate > 0, rate, np.nan)
+        normalized_penetration_resistance = force / penetration_per_revolution
+
+    result = {
+        "depth": arrays["depth"],
+        "specific_energy": specific_energy,
+        "penetration_per_revolution": penetration_per_revolution,
+        "penetration_resistance": penetration_resistance,
+        "normalized_penetration_resistance": normalized_penetration_resistance,
+    }
+
+    windows = DepthWindows(arrays["depth"], offsets, window)
+    for name in rolling_fields:
+        values = result[name] if name in result else arrays[name]
+        result[f"{name}_mean"] = windows.mean(values)
+        result[f"{name}_std"] = windows.std(values)
+
+    return split_arrays(result, offsets)
+
+
+def drilling_parameters(
+    method: "Method",
+    bit_diameter: float = 0.057,
+    window: float = 0.5,
+    rolling_fields: Sequence[str] = DEFAULT_ROLLING_FIELDS,
+) -> dict[str, np.ndarray]:
+    """
+    Compute drilling parameters per data row, as arrays aligned with the depth column.
+
+    - specific_energy: Drilling specific energy (MJ/m3), Teale (1965): e = F / A + 2 pi N T / (A v), from the
+      penetration force F, rotation rate N, torque T, penetration rate v and the bit area A (from bit_diameter, m).
+    - penetration_per_revolution: Penetration per revolution (mm/rev), v / N
+    - penetration_resistance: Penetration resistance (kN s/mm), F / v
+    - normalized_penetration_resistance: Penetration resistance normalized by the rotation rate (kN rev/mm),
+      F / (v / N)
+
+    For each of the rolling_fields (the parameters above, or numeric data fields), the mean and standard deviation
+    over a centered depth window (m) are given as "<name>_mean" and "<name>_std".
+
+    Values are NaN where they are undefined, e.g. when the penetration rate is zero.
+    """
+    [result] = drilling_parameters_batch([method], bit_diameter, window, rolling_fields)
+    return result
@@ -0,0 +1,107 @@
+"""
+Moving window filters and spike (outlier) detection for data channels, e.g. the CPT channels qc, fs, u2 and tilt
+
+The windows are centered depth windows given in metres, see `sgf_parser.analysis.rolling.DepthWindows`.
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+
+from sgf_parser.analysis.rolling import DepthWindows
+from sgf_parser.columns import concat_method_arrays, split_arrays
+from sgf_parser.models.method_cpt import CPT_CHANNELS
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method
+
+# Scale factor from the median absolute deviation to the standard deviation, for normally distributed values
+_MAD_SCALE = 1.4826
+
+Statistic = Literal["mean", "median"]
+
+
+def rolling_filter_batch(
+    methods: Sequence["Method"],
+    window: float = 0.2,
+    statistic: Statistic = "median",
+    fields: Sequence[str] = CPT_CHANNELS,
+) -> list[dict[str, np.ndarray]]:
+    """
+    Smooth the fields of many methods at once, see `rolling_filter`.
+
+    Returns one dict of arrays per method, in the same order as the methods.
+    """
+    if statistic not in ("mean", "median"):
+        raise ValueError(f"Unknown statistic {statistic!r}, must be 'mean' or 'median'")
+
+    arrays, offsets = concat_method_arrays(methods, ("depth", *fields))
+    windows = DepthWindows(arrays["depth"], offsets, window)
+    result = {"depth": arrays["depth"]}
+    for name in fields:
+        filtered = windows.mean(arrays[name]) if statistic == "mean" else windows.median(arrays[name])
+        # Keep missing values missing
+        result[name] = np.where(np.isnan(arrays[name]), np.nan, filtered)
+
+    return split_arrays(result, offsets)
+
+
+def rolling_filter(
+    method: "Method",
+    window: float = 0.2,
+    statistic: Statistic = "median",
+    fields: Sequence[str] = CPT_CHANNELS,
+) -> dict[str, np.ndarray]:
+    """
+    Smooth the given numeric data fields with the moving mean or median over a centered depth window (m).
+
+    Returns the filtered arrays by field name, aligned with the "depth" array. Missing values stay NaN.
+    """
+    [result] = rolling_filter_batch([method], window, statistic, fields)
+    return result
+
+
+def hampel_filter_batch(
+    methods: Sequence["Method"],
+    window: float = 0.2,
+    n_sigmas: float = 3.0,
+    fields: Sequence[str] = CPT_CHANNELS,
+) -> list[dict[str, np.ndarray]]:
+    """
+    Detect and replace spikes in the fields of many methods at once, see `hampel_filter`.
+
+    Returns one dict of arrays per method, in the same order as the methods.
+    """
+    arrays, offsets = concat_method_arrays(methods, ("depth", *fields))
+    windows = DepthWindows(arrays["depth"], offsets, window)
+    result = {"depth": arrays["depth"]}
+    for name in fields:
+        values = arrays[name]
+        median, deviation = windows.median_absolute_deviation(values)
+        with np.errstate(invalid="ignore"):
+            outlier = np.abs(values - median) > n_sigmas * _MAD_SCALE * deviation
+        result[name] = np.where(outlier, median, values)
+        result[f"{name}_outlier"] = outlier
+
+    return split_arrays(result, offsets)
+
+
+def hampel_filter(
+    method: "Method",
+    window: float = 0.2,
+    n_sigmas: float = 3.0,
+    fields: Sequence[str] = CPT_CHANNELS,
+) -> dict[str, np.ndarray]:
+    """
+    Detect spikes in the given numeric data fields with the Hampel filter, over a centered depth window (m).
+
+    A value is an outlier if it differs from the median of its window by more than n_sigmas times the scaled median
+    absolute deviation (1.4826 * MAD, an estimate of the standard deviation) of the window. Outliers are replaced by
+    the window median.
+
+    Returns the filtered arrays by field name and the outlier masks as "<field>_outlier", aligned with the "depth"
+    array.
+    """
+    [result] = hampel_filter_batch([method], window, n_sigmas, fields)
+    return result
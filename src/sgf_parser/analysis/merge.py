@@ -0,0 +1,138 @@
+"""
+Depth-aligned merge of the methods of a borehole (e.g. a TOT, a CPT and an SVT) into one table
+"""
+
+from collections.abc import Hashable, Mapping, Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method
+
+# Tolerance (m) when comparing depth distances, since depths like 0.3 - 0.2 are not exact in float64.
+# The SGF depths have a resolution of millimetres or coarser.
+_DEPTH_TOLERANCE = 1e-6
+
+
+def borehole_key(method: "Method", coordinate_tolerance: float = 1.0) -> Hashable:
+    """
+    Return the key identifying the borehole of a method: the project number and the borehole name, or if the method
+    has no borehole name, the project number and the coordinates rounded to coordinate_tolerance (m). Methods without
+    name and coordinates get a key of their own.
+
+    Borehole names like "1" or "BH1" are reused across projects, so boreholes with the same name in different projects
+    are kept apart.
+    """
+    if method.borehole_name:
+        return method.project_number, method.borehole_name
+    if method.point_x is not None and method.point_y is not None:
+        return (
+            method.project_number,
+            round(method.point_x / coordinate_tolerance),
+            round(method.point_y / coordinate_tolerance),
+        )
+    return id(method)
+
+
+def group_by_borehole(methods: Sequence["Method"], coordinate_tolerance: float = 1.0) -> dict[Hashable, list["Method"]]:
+    """
+    Group methods by borehole, see `borehole_key`. The groups and the methods in them keep the order of methods.
+    """
+    groups: dict[Hashable, list[Method]] = {}
+    for method in methods:
+        groups.setdefault(borehole_key(method, coordinate_tolerance), []).append(method)
+    return groups
+
+
+def _nearest_rows(source: np.ndarray, target: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Return the position in source (sorted) of the value nearest each target value, or -1 if none is within tolerance.
+    Equal source values are resolved to the last one, and a target halfway between two values to the smaller value.
+    """
+    result = np.full(len(target), -1, dtype=np.int64)
+    if not len(source):
+        return result
+
+    # Last value <= target, and the last of the equal values of the first value > target
+    below = np.searchsorted(source, target, side="right") - 1
+    above = np.searchsorted(source, source[np.minimum(below + 1, len(source) - 1)], side="right") - 1
+    with np.errstate(invalid="ignore"):
+        distance_below = np.where(below >= 0, target - source[np.maximum(below, 0)], np.inf)
+        distance_above = np.where(below + 1 < len(source), source[above] - target, np.inf)
+        nearest = np.where(distance_below <= distance_above + _DEPTH_TOLERANCE, below, above)
+        distance = np.minimum(distance_below, distance_above)
+        return np.where(distance <= tolerance + _DEPTH_TOLERANCE, nearest, result)
+
+
+def merge_methods(
+    methods: Sequence["Method"],
+    tolerance: float = 0.05,
+    on: int | None = None,
+    fields: Mapping[str, Sequence[str]] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Merge the data rows of methods (e.g. of one borehole) into one table on depth.
+
+    The depths of the table are the depths of the method at position on in methods, or by default the sorted distinct
+    depths of all the methods. For each depth and method, the data row with the nearest depth within tolerance (m) is
+    used (a merge-as-of in both directions).
+
+    The columns are named "<prefix>_<field>", where the prefix is the method name (e.g. "CPT" or "TOT"), with a
+    number added if several methods have the same name ("CPT", "CPT_2", ...). The columns of each method are its
+    numeric and boolean data fields and comment codes, or the fields given in fields by method name, and
+    "<prefix>_depth" with the depth of the matched row. Unmatched values are NaN (numeric), False (boolean) or -1
+    (comment codes), as in `Method.as_arrays()`.
+    """
+    method_arrays = [method.as_arrays() for method in methods]
+    sorted_depths = []
+    orders = []
+    for arrays in method_arrays:
+        depth = arrays["depth"]
+        order = np.flatnonzero(~np.isnan(depth))
+        order = order[np.argsort(depth[order], kind="stable")]
+        orders.append(order)
+        sorted_depths.append(depth[order])
+
+    if on is not None:
+        depth = sorted_depths[on]
+    elif sorted_depths:
+        depth = np.unique(np.concatenate(sorted_depths))
+    else:
+        depth = np.empty(0)
+
+    result = {"depth": depth}
+    prefix_counts: dict[str, int] = {}
+    for method, arrays, order, source in zip(methods, method_arrays, orders, sorted_depths):
+        prefix_counts[method.name] = prefix_counts.get(method.name, 0) + 1
+        prefix = method.name if prefix_counts[method.name] == 1 else f"{method.name}_{prefix_counts[method.name]}"
+
+        nearest = _nearest_rows(source, depth, tolerance)
+        matched = nearest >= 0
+        rows = order[np.where(matched, nearest, 0)] if len(order) else np.zeros(len(depth), dtype=np.int64)
+
+        names = fields[method.name] if fields is not None and method.name in fields else list(arrays)
+        for name in ("depth", *(name for name in names if name != "depth")):
+            values = arrays[name]
+            fill = False if values.dtype == np.bool_ else -1 if name == "comment_code" else np.nan
+            column = np.full(len(depth), fill, dtype=values.dtype)
+            column[matched] = values[rows[matched]]
+            result[f"{prefix}_{name}"] = column
+
+    return result
+
+
+def merge_boreholes(
+    methods: Sequence["Method"],
+    tolerance: float = 0.05,
+    fields: Mapping[str, Sequence[str]] | None = None,
+    coordinate_tolerance: float = 1.0,
+) -> dict[Hashable, dict[str, np.ndarray]]:
+    """
+    Group the methods by borehole (see `group_by_borehole`) and merge the methods of each borehole on depth (see
+    `merge_methods`). Returns the merged table of each borehole by borehole key.
+    """
+    return {
+        key: merge_methods(group, tolerance, fields=fields)
+        for key, group in group_by_borehole(methods, coordinate_tolerance).items()
+    }
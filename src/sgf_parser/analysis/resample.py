@@ -0,0 +1,171 @@
+"""
+Resampling of method data onto a regular depth grid
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+
+from sgf_parser.columns import STATE_FIELDS
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method
+
+Aggregation = Literal["linear", "nearest", "mean", "max", "ffill"]
+
+AGGREGATIONS: tuple[str, ...] = ("linear", "nearest", "mean", "max", "ffill")
+
+
+def depth_grid(depth_top: float, depth_base: float, step: float) -> np.ndarray:
+    """
+    Return the multiples of step from depth_top to depth_base (both inclusive, if on the grid)
+    """
+    if step <= 0:
+        raise ValueError(f"The resampling step must be positive, got {step!r}")
+
+    # The small tolerance keeps e.g. 0.3 / 0.1 = 2.9999999999999996 on the grid
+    first = int(np.ceil(depth_top / step - 1e-9))
+    last = int(np.floor(depth_base / step + 1e-9))
+    return np.round(np.arange(first, last + 1) * step, 9)
+
+
+def _linear(depth: np.ndarray, values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return np.full(grid.shape, np.nan)
+
+    return np.interp(grid, depth[valid], values[valid], left=np.nan, right=np.nan)
+
+
+def _nearest_positions(depth: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    upper = np.clip(np.searchsorted(depth, grid, side="left"), 1, len(depth) - 1)
+    lower = upper - 1
+    # Pick the shallower sample when halfway
+    return np.where(depth[upper] - grid < grid - depth[lower], upper, lower)
+
+
+def _ffill(depth: np.ndarray, values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    positions = np.searchsorted(depth, grid, side="right") - 1
+    result = values[np.clip(positions, 0, None)]
+    if values.dtype == np.bool_:
+        return np.where(positions >= 0, result, False)
+
+    return np.where(positions >= 0, result, np.nan)
+
+
+def _interval_reduce(values: np.ndarray, bins: np.ndarray, size: int, agg: str) -> np.ndarray:
+    """
+    Reduce values into size bins. The bins must be sorted, and be in the range [0, size).
+    """
+    result = np.full(size, np.nan)
+    if not len(values):
+        return result
+
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    if agg == "max":
+        # fmax ignores NaN, unless all values in the bin are NaN
+        result[bins[starts]] = np.fmax.reduceat(values, starts)
+    else:
+        valid = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        counts = np.add.reduceat(valid.astype(np.int64), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[bins[starts]] = np.where(counts > 0, sums / counts, np.nan)
+
+    return result
+
+
+def resample_arrays(
+    arrays: Mapping[str, np.ndarray],
+    step: float,
+    agg: Aggregation | Mapping[str, Aggregation] = "linear",
+    fields: Sequence[str] | None = None,
+    depth_from: float | None = None,
+    depth_to: float | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Resample depth-aligned columns onto a regular depth grid, see `resample`.
+
+    The arrays must contain a "depth" column.
+    """
+    if fields is None:
+        fields = [name for name in arrays if name not in ("depth", "comment_code")]
+
+    if isinstance(agg, Mapping):
+        aggregations = {name: agg.get(name, "ffill" if name in STATE_FIELDS else "linear") for name in fields}
+    else:
+        aggregations = {name: "ffill" if name in STATE_FIELDS else agg for name in fields}
+
+    for name, aggregation in aggregations.items():
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation {aggregation!r} for {name!r}")
+
+    depth = np.asarray(arrays["depth"], dtype=np.float64)
+    keep = np.flatnonzero(~np.isnan(depth))
+    keep = keep[np.argsort(depth[keep], kind="stable")]
+    depth = depth[keep]
+
+    if len(depth):
+        grid = depth_grid(
+            depth[0] if depth_from is None else depth_from,
+            depth[-1] if depth_to is None else depth_to,
+            step,
+        )
+    else:
+        grid = np.empty(0)
+
+    result: dict[str, np.ndarray] = {"depth": grid}
+    if not len(grid):
+        return result | {name: np.empty(0, dtype=np.asarray(arrays[name]).dtype) for name in fields}
+
+    # Each grid depth represents the interval [depth - step / 2, depth + step / 2)
+    bins = np.floor((depth - grid[0]) / step + 0.5 + 1e-9).astype(np.int64)
+    in_grid = (bins >= 0) & (bins < len(grid))
+    nearest = _nearest_positions(depth, grid) if len(depth) > 1 else np.zeros(len(grid), dtype=np.int64)
+
+    for name, aggregation in aggregations.items():
+        values = np.asarray(arrays[name])[keep]
+        match aggregation:
+            case "linear":
+                result[name] = _linear(depth, values.astype(np.float64), grid)
+            case "nearest":
+                result[name] = values[nearest]
+            case "ffill":
+                result[name] = _ffill(depth, values, grid)
+            case "mean" | "max":
+                result[name] = _interval_reduce(
+                    values.astype(np.float64)[in_grid], bins[in_grid], len(grid), aggregation
+                )
+
+    return result
+
+
+def resample(
+    method: "Method",
+    step: float,
+    agg: Aggregation | Mapping[str, Aggregation] = "linear",
+    fields: Sequence[str] | None = None,
+    depth_from: float | None = None,
+    depth_to: float | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Resample the data of a method onto a regular depth grid with the given step (m).
+
+    The grid consists of the multiples of step from the top to the base of the method (or depth_from/depth_to).
+    Returns the grid as the "depth" column, and one column per field. By default, all numeric and boolean fields are
+    resampled.
+
+    Aggregations:
+
+    - "linear": Linear interpolation between the samples (NaN outside the sampled depth range)
+    - "nearest": The value of the nearest sample
+    - "mean": The mean of the samples in the interval [depth - step / 2, depth + step / 2)
+    - "max": The max of the samples in the interval [depth - step / 2, depth + step / 2)
+    - "ffill": The value of the deepest sample at or above the grid depth
+
+    agg is either one aggregation used for all numeric fields, or a mapping from field name to aggregation. The
+    boolean state fields (flushing, hammering, increased_rotation_rate) are forward filled, unless given explicitly in
+    the mapping. "linear", "mean" and "max" ignore missing values (NaN). Rows without depth are skipped.
+    """
+    return resample_arrays(method.as_arrays(), step, agg, fields, depth_from, depth_to)
@@ -0,0 +1,139 @@
+"""
+Moving window statistics over depth windows given in metres.
+
+All functions work on flat arrays holding the rows of one or more methods (see
+`sgf_parser.columns.concat_method_arrays`). Windows never extend across methods.
+"""
+
+import numpy as np
+
+# Tolerance (m) when comparing depths with the window bounds, since depths like 1.1 - 1.0 are not exact in float64.
+# The SGF depths have a resolution of millimetres or coarser.
+_DEPTH_TOLERANCE = 1e-6
+
+# Max number of elements of the padded window matrices used for the medians
+_MAX_BLOCK_ELEMENTS = 1 << 20
+
+
+class DepthWindows:
+    """
+    Centered depth windows [depth - window / 2, depth + window / 2] for each row of one or more methods.
+
+    The rows of each method should be ordered by depth, as in the SGF files. Rows without depth get empty windows.
+    """
+
+    def __init__(self, depth: np.ndarray, offsets: np.ndarray, window: float):
+        if window <= 0:
+            raise ValueError(f"The window must be positive, got {window!r}")
+
+        depth = np.asarray(depth, dtype=np.float64)
+        group = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        valid = ~np.isnan(depth)
+
+        # Turn the per-method depths into one sorted key, by shifting each method by more than any depth span
+        finite = depth[valid]
+        span = (finite.max() - finite.min() if len(finite) else 0.0) + 2 * window + 1
+        base = finite.min() if len(finite) else 0.0
+        key = np.where(valid, group * span + (depth - base), np.inf)
+
+        self.order = np.argsort(key, kind="stable")
+        sorted_key = key[self.order]
+        start = np.searchsorted(sorted_key, sorted_key - window / 2 - _DEPTH_TOLERANCE, side="left")
+        stop = np.searchsorted(sorted_key, sorted_key + window / 2 + _DEPTH_TOLERANCE, side="right")
+        # Empty windows for rows without depth
+        stop = np.where(np.isfinite(sorted_key), stop, start)
+
+        self.start = start
+        self.stop = stop
+        self.inverse = np.empty_like(self.order)
+        self.inverse[self.order] = np.arange(len(self.order))
+
+    def sort(self, values: np.ndarray) -> np.ndarray:
+        """Return values in window order"""
+        return np.asarray(values, dtype=np.float64)[self.order]
+
+    def unsort(self, values: np.ndarray) -> np.ndarray:
+        """Return values from window order back in the original row order"""
+        return values[self.inverse]
+
+    def _window_reduce(self, values: np.ndarray, center: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the count and sum of the values (in window order) in each window, ignoring NaN. If center is given, the
+        sum is of the squared deviations from center.
+
+        The sums are taken one window position at a time instead of from cumulative sums, so that the result of a
+        window does not depend on the other rows (or methods), and the deviations do not lose precision.
+        """
+        width = self.stop - self.start
+        count = np.zeros(len(values), dtype=np.int64)
+        total = np.zeros(len(values))
+        for position in range(int(width.max()) if len(width) else 0):
+            rows = np.flatnonzero(width > position)
+            window_values = values[self.start[rows] + position]
+            if center is not None:
+                window_values = (window_values - center[rows]) ** 2
+            valid = ~np.isnan(window_values)
+            count[rows] += valid
+            total[rows] += np.where(valid, window_values, 0.0)
+        return count, total
+
+    def _window_mean(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        count, total = self._window_reduce(values)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return count, np.where(count > 0, total / count, np.nan)
+
+    def count(self, values: np.ndarray) -> np.ndarray:
+        """Number of values (not NaN) in the window of each row"""
+        count, _ = self._window_reduce(self.sort(values))
+        return self.unsort(count)
+
+    def mean(self, values: np.ndarray) -> np.ndarray:
+        """Mean of the values in the window of each row, ignoring NaN"""
+        _, mean = self._window_mean(self.sort(values))
+        return self.unsort(mean)
+
+    def std(self, values: np.ndarray) -> np.ndarray:
+        """Population standard deviation of the values in the window of each row, ignoring NaN"""
+        values = self.sort(values)
+        count, mean = self._window_mean(values)
+        _, square = self._window_reduce(values, center=mean)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.unsort(np.where(count > 0, np.sqrt(square / count), np.nan))
+
+    def _window_median(self, values: np.ndarray, center: np.ndarray | None = None) -> np.ndarray:
+        """
+        Median of the values (in window order) in each window, ignoring NaN. If center is given, the median is of the
+        absolute deviations from center.
+
+        The windows are gathered into a padded (rows x max window width) matrix, in blocks of rows to limit the memory.
+        """
+        width = self.stop - self.start
+        result = np.full(len(values), np.nan)
+        max_width = int(width.max()) if len(width) else 0
+        if max_width == 0:
+            return result
+
+        offsets = np.arange(max_width)
+        block_size = max(1, _MAX_BLOCK_ELEMENTS // max_width)
+        for block_start in range(0, len(values), block_size):
+            rows = np.arange(block_start, min(block_start + block_size, len(values)))
+            inside = offsets < width[rows, None]
+            positions = np.where(inside, self.start[rows, None] + offsets, 0)
+            window_values = np.where(inside, values[positions], np.nan)
+            if center is not None:
+                window_values = np.abs(window_values - center[rows, None])
+            has_values = ~np.isnan(window_values).all(axis=1)
+            result[rows[has_values]] = np.nanmedian(window_values[has_values], axis=1)
+        return result
+
+    def median(self, values: np.ndarray) -> np.ndarray:
+        """Median of the values in the window of each row, ignoring NaN"""
+        return self.unsort(self._window_median(self.sort(values)))
+
+    def median_absolute_deviation(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Median, and median absolute deviation from the median, of the values in the window of each row, ignoring NaN
+        """
+        values = self.sort(values)
+        median = self._window_median(values)
+        return self.unsort(median), self.unsort(self._window_median(values, center=median))
@@ -0,0 +1,165 @@
+"""
+Layer boundary (change-point) detection on the channels of a sounding, e.g. Total sounding (TOT) and Soil Rock
+Sounding (SRS)
+
+The profile is split into segments with a constant mean of the (standardized) channels, by minimizing the total within
+segment sum of squares plus a penalty per segment. The optimal segmentation is found with the PELT algorithm (Killick
+et al. 2012), which prunes candidate boundaries that can never be optimal, giving close to linear time.
+"""
+
+import itertools
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.columns import concat_method_arrays
+from sgf_parser.models.sounding import DEFAULT_LAYER_FIELDS
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method
+
+DEFAULT_FIELDS = DEFAULT_LAYER_FIELDS
+
+
+def _fill_missing(values: np.ndarray) -> np.ndarray:
+    """Fill NaN with the previous value, and leading NaN with the first value. All NaN gives zeros."""
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return np.zeros_like(values)
+    index = np.where(valid, np.arange(len(values)), 0)
+    np.maximum.accumulate(index, out=index)
+    filled = values[index]
+    filled[: np.argmax(valid)] = values[np.argmax(valid)]
+    return filled
+
+
+def _noise_scale(values: np.ndarray) -> float:
+    """
+    Robust estimate of the noise standard deviation, from the median absolute first difference. This is not inflated
+    by the level shifts between layers, as the standard deviation would be.
+    """
+    if len(values) < 2:
+        return 1.0
+    scale = float(np.median(np.abs(np.diff(values)))) / (np.sqrt(2) * 0.6745)
+    if scale > 0:
+        return scale
+    scale = float(np.std(values))
+    return scale if scale > 0 else 1.0
+
+
+def _pelt(signal: np.ndarray, penalty: float, min_size: int) -> list[int]:
+    """
+    Return the end positions (exclusive) of the optimal segments of signal (rows x channels)
+    """
+    n = len(signal)
+    cumulative = np.vstack((np.zeros(signal.shape[1]), np.cumsum(signal, axis=0)))
+    cumulative_square = np.concatenate(([0.0], np.cumsum((signal**2).sum(axis=1))))
+
+    def cost(starts: np.ndarray, stop: int) -> np.ndarray:
+        """Sum of squares around the segment means, of the segments starts:stop"""
+        length = stop - starts
+        total = cumulative[stop] - cumulative[starts]
+        return cumulative_square[stop] - cumulative_square[starts] - (total**2).sum(axis=1) / length
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.array([0], dtype=np.int64)
+
+    for stop in range(min_size, n + 1):
+        segment_cost = best[candidates] + cost(candidates, stop)
+        position = int(np.argmin(segment_cost))
+        best[stop] = segment_cost[position] + penalty
+        previous[stop] = candidates[position]
+
+        # Pruning: a start that is already worse than the optimum (without a new penalty) can never be optimal later
+        candidates = candidates[segment_cost <= best[stop]]
+        new_start = stop - min_size + 1
+        if np.isfinite(best[new_start]):
+            candidates = np.append(candidates, new_start)
+
+    ends = []
+    stop = n
+    while stop > 0:
+        ends.append(stop)
+        stop = int(previous[stop])
+    return ends[::-1]
+
+
+def detect_layers_batch(
+    methods: Sequence["Method"],
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    penalty: float | None = None,
+    min_size: int = 3,
+) -> list[dict[str, np.ndarray]]:
+    """
+    Detect the layers of many methods, see `detect_layers`.
+
+    Returns one dict of arrays (one value per layer) per method, in the same order as the methods.
+    """
+    if min_size < 1:
+        raise ValueError(f"min_size must be at least 1, got {min_size!r}")
+
+    arrays, offsets = concat_method_arrays(methods, ("depth", *fields))
+    results = []
+    for start, stop in itertools.pairwise(offsets):
+        depth = arrays["depth"][start:stop]
+        rows = np.flatnonzero(~np.isnan(depth))
+        channels = [arrays[name][start:stop][rows] for name in fields]
+
+        if len(rows):
+            signal = np.column_stack([_fill_missing(values) for values in channels] or [np.zeros(len(rows))])
+            signal = signal / np.array([_noise_scale(column) for column in signal.T])
+            # BIC: a new segment costs a mean per channel and the boundary, with unit noise variance
+            layer_penalty = (signal.shape[1] + 1) * np.log(len(rows)) if penalty is None else penalty
+            ends = np.array(_pelt(signal, layer_penalty, min(min_size, len(rows))), dtype=np.int64)
+        else:
+            ends = np.empty(0, dtype=np.int64)
+        starts = np.concatenate(([0], ends[:-1])) if len(ends) else ends
+
+        result = {
+            "start": rows[starts],
+            "stop": rows[ends - 1] + 1,
+            "depth_from": depth[rows[starts]],
+            # A layer ends at the top of the next layer, and the last layer at the last row
+            "depth_to": depth[rows[np.minimum(ends, len(rows) - 1)]],
+        }
+        for name, values in zip(fields, channels):
+            valid = ~np.isnan(values)
+            count = np.add.reduceat(valid, starts) if len(starts) else np.empty(0)
+            total = np.add.reduceat(np.where(valid, values, 0.0), starts) if len(starts) else np.empty(0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = total / count
+                square = np.where(valid, values - np.repeat(mean, ends - starts), 0.0) ** 2
+                std = np.sqrt(np.add.reduceat(square, starts) / count) if len(starts) else np.empty(0)
+            result[f"{name}_mean"] = np.where(count > 0, mean, np.nan)
+            result[f"{name}_std"] = np.where(count > 0, std, np.nan)
+
+        results.append(result)
+
+    return results
+
+
+def detect_layers(
+    method: "Method",
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    penalty: float | None = None,
+    min_size: int = 3,
+) -> dict[str, np.ndarray]:
+    """
+    Split the profile into layers at the changes in the given numeric data fields.
+
+    Each channel is standardized by a robust estimate of its noise level, and missing values are filled with the
+    previous value. The segmentation minimizes the sum of squares around the layer means plus penalty per layer,
+    by default (channels + 1) * log(rows), the Bayesian information criterion. A larger penalty gives fewer layers.
+    A layer has at least min_size rows. Rows without depth are ignored.
+
+    Returns arrays with one value per layer:
+    - start, stop: The rows of the layer are method_data[start:stop]
+    - depth_from, depth_to: Depth (m) of the top of the layer, and of the top of the next layer (the last row for the
+      last layer)
+    - "<field>_mean", "<field>_std": Mean and standard deviation of each field in the layer, ignoring missing values
+    """
+    [result] = detect_layers_batch([method], fields, penalty, min_size)
+    return result
@@ -0,0 +1,207 @@
+"""
+Spatial index over methods by their coordinates (point_x, point_y)
+
+The methods may come from `Parser.scan_headers`, since only the headers are used.
+"""
+
+import math
+from collections.abc import Collection, Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.models import MethodType
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method
+
+# Average number of methods per grid cell, when the cell size is not given
+_POINTS_PER_CELL = 4
+
+
+class SpatialIndex:
+    """
+    Uniform grid index over the coordinates of methods, for radius, bounding box and nearest neighbour queries.
+
+    The methods are sorted by grid cell, column by column, so the cells of a column within a bounding box are a
+    contiguous range found by binary search. Methods without coordinates are not indexed.
+
+    The query methods return positions in `methods` (and distances), the methods with the same names without "query_"
+    return the methods.
+    """
+
+    def __init__(self, methods: Sequence["Method"], cell_size: float | None = None):
+        self.methods = list(methods)
+        self.x = np.array([np.nan if method.point_x is None else method.point_x for method in self.methods])
+        self.y = np.array([np.nan if method.point_y is None else method.point_y for method in self.methods])
+        self.method_types = np.array([method.method_type.value for method in self.methods], dtype=object)
+
+        indexed = np.flatnonzero(~np.isnan(self.x) & ~np.isnan(self.y))
+        if len(indexed):
+            self.min_x, self.min_y = float(self.x[indexed].min()), float(self.y[indexed].min())
+            width = float(self.x[indexed].max()) - self.min_x
+            height = float(self.y[indexed].max()) - self.min_y
+        else:
+            self.min_x = self.min_y = width = height = 0.0
+
+        if cell_size is None:
+            area = max(width, 1.0) * max(height, 1.0)
+            cell_size = max(math.sqrt(area * _POINTS_PER_CELL / max(len(indexed), 1)), 1e-3)
+        elif cell_size <= 0:
+            raise ValueError(f"The cell size must be positive, got {cell_size!r}")
+
+        self.cell_size = cell_size
+        self.rows = int(height // cell_size) + 1
+        self.columns = int(width // cell_size) + 1
+
+        keys = self._cell_column(self.x[indexed]) * self.rows + self._cell_row(self.y[indexed])
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._positions = indexed[order]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _cell_column(self, x: np.ndarray | float) -> np.ndarray:
+        return np.clip(np.floor((np.asarray(x) - self.min_x) / self.cell_size), 0, self.columns - 1).astype(np.int64)
+
+    def _cell_row(self, y: np.ndarray | float) -> np.ndarray:
+        return np.clip(np.floor((np.asarray(y) - self.min_y) / self.cell_size), 0, self.rows - 1).astype(np.int64)
+
+    def _type_mask(
+        self, positions: np.ndarray, method_type: MethodType | Collection[MethodType] | None
+    ) -> np.ndarray | None:
+        if method_type is None:
+            return None
+        wanted = [method_type] if isinstance(method_type, str) else list(method_type)
+        return np.isin(self.method_types[positions], [MethodType(value).value for value in wanted])
+
+    def query_bbox(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float,
+        method_type: MethodType | Collection[MethodType] | None = None,
+    ) -> np.ndarray:
+        """
+        Return the sorted positions of the methods within the bounding box (including the edges)
+        """
+        if not len(self._positions) or min_x > max_x or min_y > max_y:
+            return np.empty(0, dtype=np.int64)
+
+        columns = np.arange(self._cell_column(min_x), self._cell_column(max_x) + 1)
+        starts = np.searchsorted(self._keys, columns * self.rows + self._cell_row(min_y), side="left")
+        stops = np.searchsorted(self._keys, columns * self.rows + self._cell_row(max_y), side="right")
+        lengths = stops - starts
+        ranges = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        candidates = self._positions[ranges]
+
+        x, y = self.x[candidates], self.y[candidates]
+        inside = (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+        type_mask = self._type_mask(candidates, method_type)
+        if type_mask is not None:
+            inside &= type_mask
+        return np.sort(candidates[inside])
+
+    def query_radius(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        method_type: MethodType | Collection[MethodType] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the positions and distances of the methods within radius of (x, y), ordered by distance
+        """
+        candidates = self.query_bbox(x - radius, y - radius, x + radius, y + radius, method_type)
+        distances = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+        inside = distances <= radius
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    def query_nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        method_type: MethodType | Collection[MethodType] | None = None,
+        max_distance: float = math.inf,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the positions and distances of the k methods nearest (x, y), ordered by distance. Fewer are returned if
+        there are fewer than k methods within max_distance.
+        """
+        if k < 1 or not len(self._positions):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Distance from (x, y) to the farthest corner of the indexed extent, beyond which there are no methods
+        max_x, max_y = self.min_x + self.columns * self.cell_size, self.min_y + self.rows * self.cell_size
+        extent = math.hypot(max(abs(x - self.min_x), abs(x - max_x)), max(abs(y - self.min_y), abs(y - max_y)))
+        # Search squares of growing size, until the k nearest within the square are within its inscribed circle
+        radius = self.cell_size
+        while True:
+            search_radius = min(radius, max_distance)
+            positions, distances = self.query_radius(x, y, search_radius, method_type)
+            if len(positions) >= k or search_radius >= extent or radius >= max_distance:
+                return positions[:k], distances[:k]
+            radius *= 2
+
+    def nearest_many(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        k: int = 1,
+        method_type: MethodType | Collection[MethodType] | None = None,
+        max_distance: float = math.inf,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the positions and distances of the k nearest methods of each point, as (points x k) arrays ordered by
+        distance. Missing neighbours have position -1 and distance inf.
+        """
+        positions = np.full((len(x), k), -1, dtype=np.int64)
+        distances = np.full((len(x), k), np.inf)
+        for point, (point_x, point_y) in enumerate(zip(x, y)):
+            if np.isnan(point_x) or np.isnan(point_y):
+                continue
+            found, found_distances = self.query_nearest(point_x, point_y, k, method_type, max_distance)
+            positions[point, : len(found)] = found
+            distances[point, : len(found)] = found_distances
+        return positions, distances
+
+    def within_bbox(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float,
+        method_type: MethodType | Collection[MethodType] | None = None,
+    ) -> list["Method"]:
+        """
+        Return the methods within the bounding box, see `query_bbox`
+        """
+        return [self.methods[position] for position in self.query_bbox(min_x, min_y, max_x, max_y, method_type)]
+
+    def within_radius(
+        self, x: float, y: float, radius: float, method_type: MethodType | Collection[MethodType] | None = None
+    ) -> list["Method"]:
+        """
+        Return the methods within radius of (x, y), ordered by distance, see `query_radius`
+        """
+        positions, _ = self.query_radius(x, y, radius, method_type)
+        return [self.methods[position] for position in positions]
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        method_type: MethodType | Collection[MethodType] | None = None,
+        max_distance: float = math.inf,
+    ) -> list["Method"]:
+        """
+        Return the k methods nearest (x, y), ordered by distance, see `query_nearest`
+        """
+        positions, _ = self.query_nearest(x, y, k, method_type, max_distance)
+        return [self.methods[position] for position in positions]
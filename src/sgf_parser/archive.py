@@ -0,0 +1,432 @@
+"""
+Compact, versioned binary archive format for parsed methods.
+
+An archive is a magic string and a format version, followed by one frame per method: the length of the block and the
+zlib compressed block. A block has the method type, the header fields as a record of tagged values, the number of data
+rows and one typed column per data field, with a null bitmap:
+
+- Decimal columns are stored as the exponent of each value and the coefficients scaled to the smallest exponent, as
+  64-bit integers. The depth column is delta encoded, so regular depth steps are compressed to almost nothing.
+- Integer, float and boolean columns are stored as arrays, and other columns as tagged values, as in the header.
+
+Loading an archive is much faster than parsing the SGF files, and restores all fields exactly (including the exponents
+of Decimal values), so the computed fields (e.g. depth_base and stopcode) are also the same.
+"""
+
+import datetime
+import enum
+import functools
+import io
+import struct
+import sys
+import types
+import typing
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+from typing import Any, BinaryIO
+
+from sgf_parser.models import Method, MethodData, MethodType
+from sgf_parser.parser import Parser
+
+MAGIC = b"SGFARC\r\n"
+VERSION = 1
+
+# Method class of each method type
+_METHOD_CLASSES: dict[MethodType, type[Method]] = {
+    method_class.model_fields["method_type"].default: method_class
+    for method_class in set(Parser.method_code_class_mapping.values())
+}
+
+_FRAME = struct.Struct("<I")
+
+# Value tags of the header record
+_NONE, _STR, _INT, _FLOAT, _DECIMAL, _TRUE, _FALSE, _DATETIME, _DATE, _TIME = range(10)
+
+# Column encodings of the data fields
+_EMPTY, _DECIMAL_COLUMN, _FLOAT_COLUMN, _INT_COLUMN, _BOOL_COLUMN, _TEXT_COLUMN = range(6)
+
+# Delta encoded columns
+_DELTA_COLUMNS = ("depth",)
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+class _Writer:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def pack(self, fmt: str, *values: Any):
+        self.buffer += struct.pack(fmt, *values)
+
+    def bytes(self, value: bytes):
+        self.pack("<I", len(value))
+        self.buffer += value
+
+    def str(self, value: str):
+        self.bytes(value.encode("utf-8"))
+
+    def array(self, values: array):
+        if sys.byteorder != "little":
+            values = array(values.typecode, values)
+            values.byteswap()
+        self.bytes(values.tobytes())
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: str) -> tuple[Any, ...]:
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def bytes(self) -> bytes:
+        (length,) = self.unpack("<I")
+        value = bytes(self.data[self.offset : self.offset + length])
+        self.offset += length
+        return value
+
+    def str(self) -> str:
+        return self.bytes().decode("utf-8")
+
+    def array(self, typecode: str) -> array:
+        values = array(typecode, self.bytes())
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+
+def _write_value(writer: _Writer, value: Any):
+    if isinstance(value, enum.Enum):
+        value = value.value
+
+    if value is None:
+        writer.pack("<B", _NONE)
+    elif isinstance(value, bool):
+        writer.pack("<B", _TRUE if value else _FALSE)
+    elif isinstance(value, str):
+        writer.pack("<B", _STR)
+        writer.str(value)
+    elif isinstance(value, int):
+        writer.pack("<B", _INT)
+        writer.str(str(value))
+    elif isinstance(value, float):
+        writer.pack("<Bd", _FLOAT, value)
+    elif isinstance(value, Decimal):
+        writer.pack("<B", _DECIMAL)
+        writer.str(str(value))
+    elif isinstance(value, datetime.datetime):
+        writer.pack("<B", _DATETIME)
+        writer.str(value.isoformat())
+    elif isinstance(value, datetime.date):
+        writer.pack("<B", _DATE)
+        writer.str(value.isoformat())
+    elif isinstance(value, datetime.time):
+        writer.pack("<B", _TIME)
+        writer.str(value.isoformat())
+    else:
+        raise TypeError(f"Unsupported header value {value!r}")
+
+
+_VALUE_READERS = {
+    _STR: _Reader.str,
+    _INT: lambda reader: int(reader.str()),
+    _FLOAT: lambda reader: reader.unpack("<d")[0],
+    _DECIMAL: lambda reader: Decimal(reader.str()),
+    _DATETIME: lambda reader: datetime.datetime.fromisoformat(reader.str()),
+    _DATE: lambda reader: datetime.date.fromisoformat(reader.str()),
+    _TIME: lambda reader: datetime.time.fromisoformat(reader.str()),
+}
+
+
+def _read_value(reader: _Reader) -> Any:
+    (tag,) = reader.unpack("<B")
+    if tag == _NONE:
+        return None
+    if tag in (_TRUE, _FALSE):
+        return tag == _TRUE
+    return _VALUE_READERS[tag](reader)
+
+
+def _enum_type(annotation: Any) -> type[enum.Enum] | None:
+    """Return the enum class of a field annotation (e.g. `ApplicationClass | None`), or None"""
+    if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+        args: tuple[Any, ...] = typing.get_args(annotation)
+    elif typing.get_origin(annotation) is typing.Literal:
+        args = tuple(type(arg) for arg in typing.get_args(annotation))
+    else:
+        args = (annotation,)
+
+    return next((arg for arg in args if isinstance(arg, type) and issubclass(arg, enum.Enum)), None)
+
+
+@functools.cache
+def _enum_fields(model: type[Method] | type[MethodData]) -> dict[str, type[enum.Enum]]:
+    """Return the enum class of each enum field of a model"""
+    return {
+        name: enum_type
+        for name, field in model.model_fields.items()
+        if (enum_type := _enum_type(field.annotation)) is not None
+    }
+
+
+def _null_bitmap(values: list[Any]) -> bytes:
+    """Bit i is set if value i is not None"""
+    bitmap = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is not None:
+            bitmap[i >> 3] |= 1 << (i & 7)
+    return bytes(bitmap)
+
+
+def _scaled_decimals(values: list[Decimal]) -> tuple[int, array, array] | None:
+    """
+    Return the smallest exponent, the exponents and the coefficients scaled to the smallest exponent of the values, or
+    None if the values cannot be stored this way (special values, or out of range)
+    """
+    exponents = []
+    for value in values:
+        sign, _, exponent = value.as_tuple()
+        if not isinstance(exponent, int) or not -128 <= exponent <= 127 or (sign and value.is_zero()):
+            return None
+        exponents.append(exponent)
+
+    min_exponent = min(exponents)
+    scaled = [int(value.scaleb(-min_exponent)) for value in values]
+    if any(not _INT64_MIN <= value <= _INT64_MAX for value in scaled):
+        return None
+
+    return min_exponent, array("b", exponents), array("q", scaled)
+
+
+def _delta_encode(values: array) -> array | None:
+    deltas = array("q", values)
+    for i in range(len(deltas) - 1, 0, -1):
+        delta = deltas[i] - deltas[i - 1]
+        if not _INT64_MIN <= delta <= _INT64_MAX:
+            return None
+        deltas[i] = delta
+    return deltas
+
+
+def _delta_decode(deltas: array) -> array:
+    values = array("q", deltas)
+    for i in range(1, len(values)):
+        values[i] += values[i - 1]
+    return values
+
+
+def _write_column(writer: _Writer, name: str, values: list[Any]):
+    writer.str(name)
+    present = [value.value if isinstance(value, enum.Enum) else value for value in values if value is not None]
+    types_present = {type(value) for value in present}
+    if not present:
+        writer.pack("<B", _EMPTY)
+        return
+
+    bitmap = _null_bitmap(values)
+    if types_present == {Decimal}:
+        scaled = _scaled_decimals(present)
+        if scaled is not None:
+            min_exponent, exponents, coefficients = scaled
+            deltas = _delta_encode(coefficients) if name in _DELTA_COLUMNS else None
+            writer.pack("<B", _DECIMAL_COLUMN)
+            writer.bytes(bitmap)
+            writer.pack("<bB", min_exponent, deltas is not None)
+            writer.array(exponents)
+            writer.array(coefficients if deltas is None else deltas)
+            return
+    elif types_present == {bool}:
+        writer.pack("<B", _BOOL_COLUMN)
+        writer.bytes(bitmap)
+        writer.bytes(bytes(present))
+        return
+    elif types_present == {int} and all(_INT64_MIN <= value <= _INT64_MAX for value in present):
+        writer.pack("<B", _INT_COLUMN)
+        writer.bytes(bitmap)
+        writer.array(array("q", present))
+        return
+    elif types_present == {float}:
+        writer.pack("<B", _FLOAT_COLUMN)
+        writer.bytes(bitmap)
+        writer.array(array("d", present))
+        return
+
+    # Other values are stored as tagged values, one by one
+    writer.pack("<B", _TEXT_COLUMN)
+    writer.bytes(bitmap)
+    for value in present:
+        _write_value(writer, value)
+
+
+def _read_column(reader: _Reader, count: int) -> tuple[str, list[Any]]:
+    name = reader.str()
+    (encoding,) = reader.unpack("<B")
+    if encoding == _EMPTY:
+        return name, [None] * count
+
+    bitmap = reader.bytes()
+    present: Iterable[Any]
+    if encoding == _DECIMAL_COLUMN:
+        min_exponent, delta = reader.unpack("<bB")
+        exponents = reader.array("b")
+        coefficients = reader.array("q")
+        if delta:
+            coefficients = _delta_decode(coefficients)
+        # The coefficients of values with larger exponents are divisible by the scale
+        scales = {exponent: 10 ** (exponent - min_exponent) for exponent in set(exponents)}
+        present = [
+            Decimal(coefficient // scales[exponent]).scaleb(exponent)
+            for coefficient, exponent in zip(coefficients, exponents)
+        ]
+    elif encoding == _BOOL_COLUMN:
+        present = [bool(value) for value in reader.bytes()]
+    elif encoding == _INT_COLUMN:
+        present = reader.array("q").tolist()
+    elif encoding == _FLOAT_COLUMN:
+        present = reader.array("d").tolist()
+    elif encoding == _TEXT_COLUMN:
+        present = [_read_value(reader) for _ in range(sum(byte.bit_count() for byte in bitmap))]
+    else:
+        raise ValueError(f"Unsupported column encoding {encoding!r}")
+
+    values = iter(present)
+    return name, [next(values) if bitmap[i >> 3] & (1 << (i & 7)) else None for i in range(count)]
+
+
+def _encode_method(method: Method) -> bytes:
+    writer = _Writer()
+    writer.str(method.method_type.value)
+
+    header = {
+        name: getattr(method, name)
+        for name in type(method).model_fields
+        if name not in ("method_data", "method_data_type")
+    }
+    writer.pack("<I", len(header))
+    for name, value in header.items():
+        writer.str(name)
+        _write_value(writer, value)
+
+    rows = [row.__dict__ for row in method.method_data]
+    names = list(method.method_data_type.model_fields)
+    writer.pack("<II", len(rows), len(names))
+    for name in names:
+        _write_column(writer, name, [row.get(name) for row in rows])
+
+    return bytes(writer.buffer)
+
+
+def _construct_rows(model: type[MethodData], columns: dict[str, list[Any]], count: int) -> list[MethodData]:
+    """
+    Create data rows from validated values without validating them again, as `model_construct` but faster. The fields
+    set of a row are the fields with a value, as when the row is parsed.
+    """
+    for name, enum_type in _enum_fields(model).items():
+        if name in columns:
+            columns[name] = [None if value is None else enum_type(value) for value in columns[name]]
+
+    names = [name for name in model.model_fields if name in columns]
+    if model.__private_attributes__ or len(names) < len(model.model_fields):
+        rows = []
+        for values in zip(*(columns[name] for name in names)) if names else ((),) * count:
+            present = {name: value for name, value in zip(names, values) if value is not None}
+            rows.append(model.model_construct(_fields_set=set(present), **present))
+        return rows
+
+    # All fields are in the columns, so the values are the complete __dict__ of each row
+    rows = []
+    new = model.__new__
+    set_attribute = object.__setattr__
+    for values in zip(*(columns[name] for name in names)):
+        row = new(model)
+        set_attribute(row, "__dict__", dict(zip(names, values)))
+        set_attribute(row, "__pydantic_fields_set__", {name for name, value in zip(names, values) if value is not None})
+        set_attribute(row, "__pydantic_extra__", None)
+        set_attribute(row, "__pydantic_private__", None)
+        rows.append(row)
+    return rows
+
+
+def _decode_method(data: bytes) -> Method:
+    reader = _Reader(data)
+    method_class = _METHOD_CLASSES[MethodType(reader.str())]
+
+    (field_count,) = reader.unpack("<I")
+    header = {}
+    for _ in range(field_count):
+        name = reader.str()
+        header[name] = _read_value(reader)
+    for name, enum_type in _enum_fields(method_class).items():
+        if header.get(name) is not None:
+            header[name] = enum_type(header[name])
+
+    row_count, column_count = reader.unpack("<II")
+    columns = dict(_read_column(reader, row_count) for _ in range(column_count))
+    method_data_type = method_class.model_fields["method_data_type"].default
+
+    return method_class.model_construct(**header, method_data=_construct_rows(method_data_type, columns, row_count))
+
+
+def dump(methods: Iterable[Method], file: BinaryIO, level: int = 6) -> int:
+    """
+    Write methods to an archive file opened in binary mode, with the given zlib compression level. Returns the number
+    of methods written.
+    """
+    file.write(MAGIC)
+    file.write(struct.pack("<H", VERSION))
+    count = 0
+    for method in methods:
+        block = zlib.compress(_encode_method(method), level)
+        file.write(_FRAME.pack(len(block)))
+        file.write(block)
+        count += 1
+    return count
+
+
+def iter_load(file: BinaryIO) -> Iterator[Method]:
+    """
+    Read the methods of an archive file opened in binary mode, one at a time.
+
+    Raises ValueError if the file is not an archive, or the format version is not supported.
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not an SGF archive")
+    (version,) = struct.unpack("<H", file.read(2))
+    if version != VERSION:
+        raise ValueError(f"Unsupported SGF archive version {version}, expected {VERSION}")
+
+    while frame := file.read(_FRAME.size):
+        (length,) = _FRAME.unpack(frame)
+        block = file.read(length)
+        if len(block) != length:
+            raise ValueError("Truncated SGF archive")
+        yield _decode_method(zlib.decompress(block))
+
+
+def load(file: BinaryIO) -> list[Method]:
+    """
+    Read all methods of an archive file opened in binary mode, see `iter_load`
+    """
+    return list(iter_load(file))
+
+
+def dumps(methods: Iterable[Method], level: int = 6) -> bytes:
+    """
+    Return an archive of the methods as bytes, see `dump`
+    """
+    with io.BytesIO() as file:
+        dump(methods, file, level)
+        return file.getvalue()
+
+
+def loads(data: bytes) -> list[Method]:
+    """
+    Read all methods of an archive from bytes, see `load`
+    """
+    with io.BytesIO(data) as file:
+        return load(file)
@@ -0,0 +1,598 @@
+"""
+SQLite catalog of SGF files and their methods, with header fields and summaries, and optionally the data rows.
+
+The catalog is updated incrementally: files are only parsed again if their size, modification time or content hash
+changed since the last update.
+"""
+
+import codecs
+import enum
+import hashlib
+import itertools
+import os
+import sqlite3
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, NamedTuple, Self
+
+from sgf_parser.fields import FieldKind, data_fields
+from sgf_parser.models import Method, MethodData, MethodType, StopCode
+from sgf_parser.models.types import ApplicationClass
+from sgf_parser.parser import Parser
+
+# Version of the catalog schema, stored in PRAGMA user_version. Catalogs of older versions are rebuilt when opened.
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    hash TEXT NOT NULL,
+    error TEXT,
+    data INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS methods (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    method_code TEXT,
+    method_type TEXT NOT NULL,
+    borehole_name TEXT,
+    project_number TEXT,
+    location_name TEXT,
+    point_x REAL,
+    point_y REAL,
+    point_z REAL,
+    conducted_at TEXT,
+    depth_top REAL,
+    depth_base REAL,
+    stopcode INTEGER,
+    application_class INTEGER,
+    bedrock_elevation REAL,
+    row_count INTEGER NOT NULL,
+    UNIQUE (file_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS methods_method_type ON methods (method_type, method_code);
+CREATE INDEX IF NOT EXISTS methods_borehole_name ON methods (borehole_name);
+CREATE INDEX IF NOT EXISTS methods_point ON methods (point_x, point_y);
+CREATE INDEX IF NOT EXISTS methods_conducted_at ON methods (conducted_at);
+CREATE INDEX IF NOT EXISTS methods_depth_base ON methods (depth_base);
+CREATE INDEX IF NOT EXISTS methods_stopcode ON methods (stopcode);
+CREATE INDEX IF NOT EXISTS methods_application_class ON methods (application_class);
+"""
+
+_METHOD_COLUMNS = (
+    "file_id",
+    "position",
+    "method_code",
+    "method_type",
+    "borehole_name",
+    "project_number",
+    "location_name",
+    "point_x",
+    "point_y",
+    "point_z",
+    "conducted_at",
+    "depth_top",
+    "depth_base",
+    "stopcode",
+    "application_class",
+    "bedrock_elevation",
+    "row_count",
+)
+
+# Method data class of each method type, with one data table each
+DATA_TYPES: dict[MethodType, type[MethodData]] = dict(
+    sorted(
+        (method_class.model_fields["method_type"].default, method_class.model_fields["method_data_type"].default)
+        for method_class in set(Parser.method_code_class_mapping.values())
+    )
+)
+
+# File name suffixes of SGF files, compared case-insensitively: the generic .sgf and the suffixes of the method types,
+# e.g. CPT (.cpt, .std), DP (.hfa), DT (.dpt), TOT (.tot), SRS (.jb1, .jb2, .jb3, .jbt), SLB (.slb), TR (.trt) and
+# WST (.vim)
+SGF_SUFFIXES = frozenset(
+    (".sgf", ".cpt", ".std", ".hfa", ".dpt", ".tot", ".jb1", ".jb2", ".jb3", ".jbt", ".slb", ".trt", ".vim")
+)
+
+# Number of rows (of all tables) written to SQLite at once by `Catalog.update`, by default
+DEFAULT_BATCH_SIZE = 10000
+
+# Size of the chunks read when hashing a file
+_CHUNK_SIZE = 1 << 16
+
+# Encodings tried in order when decoding a file, SGF files are often written with Windows code pages
+_ENCODINGS = ("utf-8", "windows-1252")
+
+
+class CatalogUpdate(NamedTuple):
+    """
+    Number of files added, updated (parsed again), unchanged and removed by `Catalog.update`, and the number of
+    (added or updated) files that could not be parsed
+    """
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+
+
+def to_sql_value(value: Any) -> Any:
+    """
+    Convert a field value to a value SQLite can store: Decimal to float, datetime to ISO 8601 text and enums to their
+    values
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+# SQLite column types of the field kinds, other kinds are TEXT
+_SQL_TYPES = {"float": "REAL", "int": "INTEGER", "bool": "INTEGER"}
+
+# Conversion of field values to the SQLite column types
+_TO_SQL: dict[str, Callable[[Any], Any]] = {"REAL": float, "INTEGER": int, "TEXT": to_sql_value}
+
+
+def _sql_type(kind: FieldKind) -> str:
+    return _SQL_TYPES.get(kind, "TEXT")
+
+
+def data_table(method_type: MethodType) -> str:
+    """
+    Return the name of the table with the data rows of methods of the method type
+    """
+    return f"{MethodType(method_type).value.lower()}_data"
+
+
+def _data_schema(method_type: MethodType, data_type: type[MethodData]) -> str:
+    """
+    Return the schema of the data table of a method type, with one column per field of the method data class
+    """
+    columns = "".join(f"    {name} {_sql_type(kind)},\n" for name, kind in data_fields(data_type).items())
+    return (
+        f"CREATE TABLE IF NOT EXISTS {data_table(method_type)} (\n"
+        "    method_id INTEGER NOT NULL REFERENCES methods (id) ON DELETE CASCADE,\n"
+        "    position INTEGER NOT NULL,\n"
+        f"{columns}"
+        "    PRIMARY KEY (method_id, position)\n"
+        ");\n"
+    )
+
+
+def _data_values(method_id: int, method: Method) -> Iterator[tuple[Any, ...]]:
+    """
+    Yield the values of the data table columns of each data row of a method
+    """
+    converters = [(name, _TO_SQL[_sql_type(kind)]) for name, kind in data_fields(method.method_data_type).items()]
+    for position, row in enumerate(method.method_data):
+        values = row.__dict__
+        yield (
+            method_id,
+            position,
+            *(None if (value := values.get(name)) is None else convert(value) for name, convert in converters),
+        )
+
+
+def _method_values(file_id: int, position: int, method: Method) -> tuple[Any, ...]:
+    return tuple(
+        to_sql_value(value)
+        for value in (
+            file_id,
+            position,
+            method.method_type_string,
+            method.method_type,
+            method.borehole_name,
+            method.project_number,
+            method.location_name,
+            method.point_x,
+            method.point_y,
+            method.point_z,
+            method.conducted_at,
+            method.depth_top,
+            method.depth_base,
+            method.stopcode,
+            getattr(method, "application_class", None),
+            getattr(method, "bedrock_elevation", None),
+            len(method.method_data),
+        )
+    )
+
+
+# Conversion of the stored values of the methods table back to the types of the method fields
+_FROM_SQL = {
+    "method_type": MethodType,
+    "conducted_at": datetime.fromisoformat,
+    "application_class": ApplicationClass,
+}
+
+
+class MethodHandle:
+    """
+    Header fields and summaries of a method in the catalog, with the path of its file and its position in the file.
+
+    The method (with method_data) is only parsed from the file by `load`.
+    """
+
+    __slots__ = ("id", "path", "hash", "_method", *_METHOD_COLUMNS[1:])
+
+    def __init__(self, id: int, path: str, hash: str, **columns: Any):
+        self.id = id
+        self.path = path
+        self.hash = hash
+        self._method: Method | None = None
+        for name in _METHOD_COLUMNS[1:]:
+            value = columns[name]
+            if value is not None and name in _FROM_SQL:
+                value = _FROM_SQL[name](value)
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.method_type} {self.borehole_name} {self.path}:{self.position}>"
+
+    def load(self, encoding: str | None = None) -> Method:
+        """
+        Parse the file and return the method. The method is kept, so the file is only parsed once.
+
+        Raises ValueError if the file changed since it was cataloged.
+        """
+        if self._method is None:
+            [self._method] = load_methods([self], encoding)
+        return self._method
+
+
+def load_methods(handles: Sequence[MethodHandle], encoding: str | None = None) -> list[Method]:
+    """
+    Return the methods of the handles, parsing each file once, up to the last method of the handles in the file.
+    Methods already loaded are not parsed again.
+
+    Raises ValueError if a file changed since it was cataloged.
+    """
+    files: dict[str, list[MethodHandle]] = {}
+    for handle in handles:
+        if handle._method is None:
+            files.setdefault(handle.path, []).append(handle)
+
+    for path, file_handles in files.items():
+        digest, file_encoding = hash_file(path, encoding)
+        if digest != file_handles[0].hash:
+            raise ValueError(f"The file {path} changed since it was cataloged, update the catalog")
+        positions: dict[int, list[MethodHandle]] = {}
+        for handle in file_handles:
+            positions.setdefault(handle.position, []).append(handle)
+
+        # The methods are parsed one at a time, up to the last method of the handles
+        with open(path, encoding=file_encoding) as file:
+            for position, method in enumerate(Parser().iter_parse(file)):
+                for handle in positions.pop(position, ()):
+                    handle._method = method
+                if not positions:
+                    break
+
+    return [handle._method for handle in handles]  # type: ignore[misc]
+
+
+def _in_values(column: str, values: Any, single_type: type) -> tuple[str, list[Any]]:
+    """Return a condition and parameters for column in values, or equal to a single value"""
+    if isinstance(values, single_type):
+        values = [values]
+    values = [to_sql_value(value) for value in values]
+    return f"{column} IN ({', '.join('?' for _ in values)})", values
+
+
+def hash_file(path: str | os.PathLike, encoding: str | None = None) -> tuple[str, str]:
+    """
+    Read a file in chunks, returning the SHA-256 hash of the content and the encoding of the file. If encoding is None,
+    the first of the encodings of `_ENCODINGS` that decodes the whole file is returned.
+    """
+    digest = hashlib.sha256()
+    # The last encoding decodes any content, the others are checked with incremental decoders
+    decoders = {} if encoding is not None else {name: codecs.getincrementaldecoder(name)() for name in _ENCODINGS[:-1]}
+    with open(path, "rb") as file:
+        while chunk := file.read(_CHUNK_SIZE):
+            digest.update(chunk)
+            decoders = {name: decoder for name, decoder in decoders.items() if _decodes(decoder, chunk)}
+    decoders = {name: decoder for name, decoder in decoders.items() if _decodes(decoder, b"", final=True)}
+
+    return digest.hexdigest(), encoding or next(iter(decoders), _ENCODINGS[-1])
+
+
+def _decodes(decoder: codecs.IncrementalDecoder, chunk: bytes, final: bool = False) -> bool:
+    try:
+        decoder.decode(chunk, final)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _iter_files(paths: Iterable[str | os.PathLike], suffixes: Collection[str]) -> Iterator[Path]:
+    """Resolve the paths, and the files with one of the suffixes in directories (recursively)"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(
+                child.resolve() for child in path.rglob("*") if child.suffix.lower() in suffixes and child.is_file()
+            )
+        else:
+            yield path.resolve()
+
+
+def _insert_sql(table: str, columns: Sequence[str]) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+
+_INSERT_FILE = _insert_sql("files", ("id", "path", "size", "mtime", "hash", "error", "data"))
+_INSERT_METHOD = _insert_sql("methods", ("id", *_METHOD_COLUMNS))
+_INSERT_DATA = {
+    method_type: _insert_sql(data_table(method_type), ("method_id", "position", *data_fields(data_type)))
+    for method_type, data_type in DATA_TYPES.items()
+}
+_UPDATE_FILE = "UPDATE files SET size = ?, mtime = ? WHERE id = ?"
+
+
+class _Inserts:
+    """
+    Rows of the catalog tables, buffered across files and written in bulk by `flush` (one executemany per table).
+
+    The ids of the files and methods are assigned here, and the tables are written in the order files, methods and
+    data rows, so the foreign keys always refer to rows already written.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        [(file_id, method_id)] = connection.execute(
+            "SELECT (SELECT coalesce(max(id), 0) FROM files), (SELECT coalesce(max(id), 0) FROM methods)"
+        )
+        self.file_ids = itertools.count(file_id + 1)
+        self.method_ids = itertools.count(method_id + 1)
+        self.rows: dict[str, list[tuple[Any, ...]]] = {_INSERT_FILE: [], _INSERT_METHOD: [], _UPDATE_FILE: []}
+        self.count = 0
+        self.marks: dict[str, int] = {}
+
+    def add(self, sql: str, *rows: tuple[Any, ...]):
+        self.rows.setdefault(sql, []).extend(rows)
+        self.count += len(rows)
+
+    def add_method(self, file_id: int, position: int, method: Method, load_data: bool):
+        method_id = next(self.method_ids)
+        self.add(_INSERT_METHOD, (method_id, *_method_values(file_id, position, method)))
+        if load_data:
+            self.add(_INSERT_DATA[method.method_type], *_data_values(method_id, method))
+
+    def mark(self):
+        """Mark the rows added so far, see `discard`"""
+        self.marks = {sql: len(rows) for sql, rows in self.rows.items()}
+
+    def discard(self, file_id: int):
+        """
+        Discard the rows added since `mark`, the file with file_id and its methods and data rows, also if they were
+        already written by a flush
+        """
+        for sql, rows in self.rows.items():
+            del rows[self.marks.get(sql, 0) :]
+        self.count = sum(map(len, self.rows.values()))
+        # Also deletes the methods and data rows of the file
+        self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def flush(self):
+        for sql, rows in self.rows.items():
+            if rows:
+                self.connection.executemany(sql, rows)
+                rows.clear()
+        self.count = 0
+        self.marks = {}
+
+
+class Catalog:
+    """
+    SQLite catalog of SGF files and methods.
+
+    The "files" table has the path, size, modification time and content hash of each file, the parse error of files
+    that could not be parsed and if the data rows are loaded. The "methods" table has the header fields and summaries
+    (depth_top, depth_base, stopcode, application class and bedrock elevation) of each method, and the position of the
+    method in its file.
+
+    If data rows are loaded, they are in one table per method type (see `data_table`), with a column per field of the
+    method data class, the id of the method (method_id) and the position of the row in the method.
+    """
+
+    def __init__(self, database: str | os.PathLike = ":memory:"):
+        self.connection = sqlite3.connect(database)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        [(version,)] = self.connection.execute("PRAGMA user_version")
+        if version > SCHEMA_VERSION:
+            self.connection.close()
+            raise ValueError(
+                f"The catalog {database} has schema version {version}, this version of sgf_parser supports version "
+                f"{SCHEMA_VERSION}"
+            )
+
+        script = _SCHEMA + "".join(
+            _data_schema(method_type, data_type) for method_type, data_type in DATA_TYPES.items()
+        )
+        if version < SCHEMA_VERSION:
+            # The catalog only has rows derived from the files, so the tables of older versions are dropped and the
+            # catalog is rebuilt by the next update
+            tables = (*map(data_table, DATA_TYPES), "methods", "files")
+            script = "".join(f"DROP TABLE IF EXISTS {table};\n" for table in tables) + script
+        self.connection.executescript(f"BEGIN;\n{script}PRAGMA user_version = {SCHEMA_VERSION};\nCOMMIT;\n")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def update(
+        self,
+        paths: Iterable[str | os.PathLike],
+        encoding: str | None = None,
+        prune: bool = False,
+        load_data: bool = False,
+        suffixes: Collection[str] = SGF_SUFFIXES,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> CatalogUpdate:
+        """
+        Add or update the given files, and the SGF files in the given directories (recursively), in the catalog. Files
+        in directories are SGF files if their suffix is one of suffixes (lower case), by default `SGF_SUFFIXES`, while
+        files given directly are always added. Files given more than once are added once.
+
+        Files already in the catalog are skipped if their size and modification time are unchanged, and are not parsed
+        again if their content hash is unchanged. If prune is True, files in the catalog that are not among the given
+        files are removed. If load_data is True, the data rows are also loaded, and files cataloged without data rows
+        are parsed again.
+
+        The rows of the files, methods and data rows are buffered across files and written in bulk (executemany)
+        once there are batch_size buffered rows, committing the files written so far. Files are hashed in chunks (see
+        `hash_file`) and their methods are parsed one at a time from the open file (see `Parser.iter_parse`), so the
+        memory use is bounded by batch_size and the largest method, not by the size of the files. Files that
+        cannot be parsed (ValueError, ArithmeticError or OSError) are stored with the error and without methods, any
+        other error rolls back the files not yet committed.
+        """
+        counts = dict.fromkeys(CatalogUpdate._fields, 0)
+        known = {
+            path: (file_id, size, mtime, digest, bool(data))
+            for file_id, path, size, mtime, digest, data in self.connection.execute(
+                "SELECT id, path, size, mtime, hash, data FROM files"
+            )
+        }
+        seen = set()
+        inserts = _Inserts(self.connection)
+
+        try:
+            for path in _iter_files(paths, suffixes):
+                key = str(path)
+                if key in seen:
+                    # Given more than once, e.g. directly and in a given directory
+                    continue
+                seen.add(key)
+                stat = path.stat()
+                existing = known.get(key)
+                current = existing is not None and (existing[4] or not load_data)
+                if current and existing[1:3] == (stat.st_size, stat.st_mtime):
+                    counts["unchanged"] += 1
+                    continue
+
+                digest, file_encoding = hash_file(path, encoding)
+                if current and existing[3] == digest:
+                    inserts.add(_UPDATE_FILE, (stat.st_size, stat.st_mtime, existing[0]))
+                    counts["unchanged"] += 1
+                    continue
+
+                counts["added" if existing is None else "updated"] += 1
+                if existing is not None:
+                    # Also deletes the methods and data rows of the file
+                    self.connection.execute("DELETE FROM files WHERE id = ?", (existing[0],))
+                file_id = next(inserts.file_ids)
+                file_values = (file_id, key, stat.st_size, stat.st_mtime, digest)
+                inserts.mark()
+                inserts.add(_INSERT_FILE, (*file_values, None, load_data))
+                try:
+                    with open(path, encoding=file_encoding) as file:
+                        for position, method in enumerate(Parser().iter_parse(file)):
+                            inserts.add_method(file_id, position, method, load_data)
+                            if inserts.count >= batch_size:
+                                inserts.flush()
+                except (ValueError, ArithmeticError, OSError) as exception:
+                    # The file is stored without methods
+                    counts["failed"] += 1
+                    inserts.discard(file_id)
+                    inserts.add(_INSERT_FILE, (*file_values, f"{exception.__class__.__name__}: {exception}", load_data))
+
+                if inserts.count >= batch_size:
+                    inserts.flush()
+                    self.connection.commit()
+
+            inserts.flush()
+            if prune:
+                removed = [(file_id,) for path, (file_id, *_) in known.items() if path not in seen]
+                self.connection.executemany("DELETE FROM files WHERE id = ?", removed)
+                counts["removed"] = len(removed)
+            self.connection.commit()
+        except BaseException:
+            self.connection.rollback()
+            raise
+
+        return CatalogUpdate(**counts)
+
+    def query(
+        self,
+        method_type: MethodType | Collection[MethodType] | None = None,
+        method_code: str | Collection[str] | None = None,
+        borehole_name: str | None = None,
+        conducted_from: datetime | None = None,
+        conducted_to: datetime | None = None,
+        min_depth: float | None = None,
+        max_depth: float | None = None,
+        stopcode: StopCode | int | Collection[int] | None = None,
+        application_class: ApplicationClass | int | Collection[int] | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+        limit: int | None = None,
+    ) -> list[MethodHandle]:
+        """
+        Return handles of the methods matching all the given filters, ordered by file path and position.
+
+        method_type, method_code (HM), stopcode and application_class match one value or any of a collection of values.
+        Methods are conducted from conducted_from (inclusive) to conducted_to (exclusive), the depth range is on
+        depth_base (min_depth <= depth_base <= max_depth) and bbox is (min_x, min_y, max_x, max_y), including the edges.
+        The filters are evaluated by SQLite, using the indexes of the methods table.
+        """
+        conditions: list[str] = []
+        parameters: list[Any] = []
+
+        for column, values, single_type in (
+            ("method_type", method_type, str),
+            ("method_code", method_code, str),
+            ("stopcode", stopcode, int),
+            ("application_class", application_class, int),
+        ):
+            if values is not None:
+                condition, values = _in_values(column, values, single_type)
+                conditions.append(condition)
+                parameters.extend(values)
+
+        for condition, value in (
+            ("borehole_name = ?", borehole_name),
+            ("conducted_at >= ?", conducted_from),
+            ("conducted_at < ?", conducted_to),
+            ("depth_base >= ?", min_depth),
+            ("depth_base <= ?", max_depth),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(to_sql_value(value))
+
+        if bbox is not None:
+            conditions.append("point_x BETWEEN ? AND ? AND point_y BETWEEN ? AND ?")
+            min_x, min_y, max_x, max_y = bbox
+            parameters.extend((min_x, max_x, min_y, max_y))
+
+        sql = (
+            f"SELECT methods.id, files.path, files.hash, {', '.join(_METHOD_COLUMNS[1:])} "
+            "FROM methods JOIN files ON files.id = methods.file_id"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY files.path, methods.position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+
+        return [
+            MethodHandle(id, path, digest, **dict(zip(_METHOD_COLUMNS[1:], columns)))
+            for id, path, digest, *columns in self.connection.execute(sql, parameters)
+        ]
@@ -0,0 +1,113 @@
+"""
+Column-wise (NumPy) access to method data.
+
+Requires the optional `numpy` dependency (`pip install sgf-parser[numpy]`).
+"""
+
+import itertools
+import typing
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sgf_parser.fields import data_fields
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method, MethodData
+
+# State columns set by the parser on each data row, see `Parser.parse_data`
+STATE_FIELDS = ("flushing", "hammering", "increased_rotation_rate")
+
+
+def numeric_fields(method_data_type: type["MethodData"]) -> tuple[str, ...]:
+    """
+    Return the names of the numeric (Decimal and float) fields of a method data class, in definition order
+    """
+    return tuple(name for name, kind in data_fields(method_data_type).items() if kind == "float")
+
+
+def bool_fields(method_data_type: type["MethodData"]) -> tuple[str, ...]:
+    """
+    Return the names of the boolean fields of a method data class, in definition order
+    """
+    return tuple(name for name, kind in data_fields(method_data_type).items() if kind == "bool")
+
+
+def rows_to_arrays(rows: typing.Sequence["MethodData"], method_data_type: type["MethodData"]) -> dict[str, np.ndarray]:
+    """
+    Convert data rows to one array per numeric and boolean field.
+
+    Numeric fields are converted to float64, with NaN for missing values.
+    Boolean fields are converted to bool, with False for missing values.
+    Comment codes are converted to int64, with -1 for missing codes.
+    """
+    row_dicts = [row.__dict__ for row in rows]
+    result: dict[str, np.ndarray] = {}
+
+    for name in numeric_fields(method_data_type):
+        values = [row.get(name) for row in row_dicts]
+        result[name] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+    for name in bool_fields(method_data_type):
+        result[name] = np.array([bool(row.get(name)) for row in row_dicts], dtype=np.bool_)
+
+    codes = [row.get("comment_code") for row in row_dicts]
+    result["comment_code"] = np.array([-1 if code is None else code for code in codes], dtype=np.int64)
+
+    return result
+
+
+def method_to_arrays(method: "Method") -> dict[str, np.ndarray]:
+    """
+    Convert the data rows of a method to arrays, see `rows_to_arrays`.
+
+    The arrays are read-only, since `Method.as_arrays()` caches them on the method.
+    """
+    arrays = rows_to_arrays(method.method_data, method.method_data_type)
+    for array in arrays.values():
+        array.flags.writeable = False
+
+    return arrays
+
+
+def concat_method_arrays(
+    methods: typing.Sequence["Method"], fields: typing.Iterable[str]
+) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """
+    Concatenate the given fields of many methods into flat arrays, for batch computations.
+
+    Fields not present in a method are filled with NaN (numeric) or False (boolean).
+    Returns the arrays and the row offsets of the methods (length len(methods) + 1), such that the rows of method i
+    are at offsets[i]:offsets[i + 1].
+    """
+    method_arrays = [method.as_arrays() for method in methods]
+    lengths = [len(method.method_data) for method in methods]
+    offsets = np.zeros(len(methods) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    result: dict[str, np.ndarray] = {}
+    for name in fields:
+        dtype = next((arrays[name].dtype for arrays in method_arrays if name in arrays), np.dtype(np.float64))
+        fill = False if dtype == np.bool_ else -1 if name == "comment_code" else np.nan
+        parts = [
+            arrays[name] if name in arrays else np.full(length, fill, dtype=dtype)
+            for arrays, length in zip(method_arrays, lengths)
+        ]
+        result[name] = np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    return result, offsets
+
+
+def split_arrays(arrays: typing.Mapping[str, np.ndarray], offsets: np.ndarray) -> list[dict[str, np.ndarray]]:
+    """
+    Split flat arrays from `concat_method_arrays` back into one dict of arrays per method
+    """
+    return [{name: array[start:stop] for name, array in arrays.items()} for start, stop in itertools.pairwise(offsets)]
+
+
+def header_column(methods: typing.Sequence["Method"], name: str, default: float = np.nan) -> np.ndarray:
+    """
+    Return a header field of each method as a float64 array, with default for missing values
+    """
+    values = [getattr(method, name, None) for method in methods]
+    return np.array([default if value is None else value for value in values], dtype=np.float64)
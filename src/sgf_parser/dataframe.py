@@ -0,0 +1,102 @@
+"""
+Conversion of methods to pandas DataFrames, built column by column from the data rows.
+
+The columns have the dtypes of the field kinds (see `sgf_parser.fields`), with missing values: float64 (NaN) for
+numbers, nullable Int64 for integers (e.g. comment_code), nullable boolean for booleans (e.g. the state columns
+flushing, hammering and increased_rotation_rate), string for text and datetime64 for datetimes.
+
+Requires the optional `pandas` dependency (`pip install sgf-parser[pandas]`).
+"""
+
+import enum
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from sgf_parser.fields import FieldKind, data_fields, header_fields
+from sgf_parser.models import Method
+
+# Header columns of `methods_to_dataframe`, by default
+DEFAULT_HEADER_FIELDS = ("method_type", "borehole_name", "point_x", "point_y", "point_z")
+
+_DTYPES: dict[FieldKind, str] = {
+    "int": "Int64",
+    "bool": "boolean",
+    "str": "string",
+    "datetime": "datetime64[us]",
+    "date": "object",
+    "time": "object",
+}
+
+
+def _column(values: list[Any], kind: FieldKind) -> Any:
+    """
+    Return an array of the values, with the dtype of the field kind
+    """
+    if kind == "float":
+        return np.fromiter(
+            (np.nan if value is None else float(value) for value in values), dtype=np.float64, count=len(values)
+        )
+    if kind in ("int", "str"):
+        values = [value.value if isinstance(value, enum.Enum) else value for value in values]
+    return pd.array(values, dtype=_DTYPES[kind])
+
+
+def _header_kinds(method_class: type[Method], names: Sequence[str]) -> dict[str, FieldKind]:
+    """Return the kinds of the given header fields that the method class has"""
+    fields = header_fields(method_class)
+    return {name: fields[name] for name in names if name in fields}
+
+
+def method_to_dataframe(method: Method, header_fields: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    Return the data rows of a method as a DataFrame, with a column per field of the method data class, in definition
+    order, and the given header fields repeated on each row, before the data columns.
+    """
+    return methods_to_dataframe([method], header_fields, method_column=False)
+
+
+def methods_to_dataframe(
+    methods: Sequence[Method],
+    header_fields: Sequence[str] = DEFAULT_HEADER_FIELDS,
+    method_column: bool = True,
+) -> pd.DataFrame:
+    """
+    Return the data rows of many methods as one DataFrame.
+
+    Each column is built once over all methods, without concatenating a DataFrame per method. The columns are
+    "method" (the position of the method in methods, if method_column is True), the given header fields (repeated on
+    each row), "position" (the position of the row in its method) and the union of the fields of the method data
+    classes, in order of appearance. Fields that a method does not have are missing in its rows.
+    """
+    kinds: dict[str, FieldKind] = {}
+    for method in methods:
+        for name, kind in _header_kinds(type(method), header_fields).items():
+            kinds.setdefault(name, kind)
+    data_kinds: dict[str, FieldKind] = {}
+    for method in methods:
+        for name, kind in data_fields(method.method_data_type).items():
+            data_kinds.setdefault(name, kind)
+
+    lengths = [len(method.method_data) for method in methods]
+    columns: dict[str, Any] = {}
+    if method_column:
+        columns["method"] = np.repeat(np.arange(len(methods), dtype=np.int64), lengths)
+
+    for name in header_fields:
+        values = []
+        for method, length in zip(methods, lengths):
+            values.extend([getattr(method, name, None)] * length)
+        columns[name] = _column(values, kinds.get(name, "str"))
+
+    columns["position"] = np.concatenate(
+        [np.arange(length, dtype=np.int64) for length in lengths] or [np.empty(0, dtype=np.int64)]
+    )
+
+    row_dicts = [row.__dict__ for method in methods for row in method.method_data]
+    for name, kind in data_kinds.items():
+        columns[name] = _column([row.get(name) for row in row_dicts], kind)
+
+    return pd.DataFrame(columns)
@@ -0,0 +1,6 @@
+"""
+Export of parsed methods to other file formats.
+
+The exporters are in submodules, since some of them require optional dependencies, e.g. `sgf_parser.export.parquet`
+requires `pyarrow` (`pip install sgf-parser[parquet]`).
+"""
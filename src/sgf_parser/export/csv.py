@@ -0,0 +1,156 @@
+"""
+Streaming CSV export of methods, with one file per method type.
+
+Each file has the chosen header fields (repeated on each row), the position of the row in the method and the fields
+of the method data class of the method type, in definition order:
+
+    directory/cpt.csv: borehole_name,point_x,point_y,point_z,position,comment_code,remarks,...,depth,...
+    directory/tot.csv: borehole_name,point_x,point_y,point_z,position,comment_code,remarks,...
+
+Decimals are written exactly (e.g. "1.020"), datetimes in ISO 8601 format, enums as their values and missing values
+as empty strings.
+"""
+
+import contextlib
+import csv
+import datetime
+import enum
+import os
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, Self, TextIO
+
+from sgf_parser.fields import FieldKind, data_fields
+from sgf_parser.models import Method, MethodType
+
+# Header fields repeated on each row, by default
+DEFAULT_HEADER_FIELDS = ("borehole_name", "point_x", "point_y", "point_z")
+
+# Number of rows written at a time to each file
+DEFAULT_BATCH_SIZE = 10000
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+# Kinds of data fields with values that are converted by `_csv_value`, the csv module writes other values with str()
+_CONVERTED_KINDS: set[FieldKind] = {"datetime", "date", "time"}
+
+
+class _CsvFile:
+    def __init__(self, file: TextIO, columns: Sequence[str], delimiter: str):
+        self.file = file
+        self.writer = csv.writer(self.file, delimiter=delimiter)
+        self.writer.writerow(columns)
+        self.rows: list[tuple[Any, ...]] = []
+
+    def flush(self):
+        self.writer.writerows(self.rows)
+        self.file.flush()
+        self.rows = []
+
+
+class CsvWriter:
+    """
+    Streaming writer of methods to one CSV file per method type in a directory, see the module documentation for the
+    columns.
+
+    The rows are buffered per file and written in batches of batch_size rows, so the memory use is constant regardless
+    of the number and size of the methods written. Header fields that a method type does not have are left empty.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        header_fields: Sequence[str] = DEFAULT_HEADER_FIELDS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        delimiter: str = ",",
+    ):
+        if batch_size < 1:
+            raise ValueError(f"The batch size must be at least 1, got {batch_size!r}")
+
+        self.directory = Path(directory)
+        self.header_fields = tuple(header_fields)
+        self.batch_size = batch_size
+        self.delimiter = delimiter
+        self.methods_written = 0
+        self._files: dict[MethodType, _CsvFile] = {}
+        self._stack = contextlib.ExitStack()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def path(self, method_type: MethodType) -> Path:
+        """
+        Return the path of the file of a method type
+        """
+        return self.directory / f"{MethodType(method_type).value.lower()}.csv"
+
+    def _file(self, method: Method) -> _CsvFile:
+        csv_file = self._files.get(method.method_type)
+        if csv_file is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            columns = (*self.header_fields, "position", *data_fields(method.method_data_type))
+            file = self._stack.enter_context(self.path(method.method_type).open("w", encoding="utf-8", newline=""))
+            csv_file = self._files[method.method_type] = _CsvFile(file, columns, self.delimiter)
+        return csv_file
+
+    def write(self, method: Method):
+        """
+        Write the data rows of a method
+        """
+        csv_file = self._file(method)
+        header = tuple(_csv_value(getattr(method, name, None)) for name in self.header_fields)
+
+        fields = data_fields(method.method_data_type)
+        converted = [i for i, kind in enumerate(fields.values()) if kind in _CONVERTED_KINDS]
+        for position, row in enumerate(method.method_data):
+            values = row.__dict__
+            row_values = [values.get(name) for name in fields]
+            for i in converted:
+                if row_values[i] is not None:
+                    row_values[i] = _csv_value(row_values[i])
+            csv_file.rows.append((*header, position, *row_values))
+            if len(csv_file.rows) >= self.batch_size:
+                csv_file.flush()
+
+        self.methods_written += 1
+
+    def close(self):
+        """
+        Write the buffered rows and close the files
+        """
+        try:
+            for csv_file in self._files.values():
+                csv_file.flush()
+        finally:
+            self._files = {}
+            self._stack.close()
+
+
+def export_csv(
+    methods: Iterable[Method],
+    directory: str | os.PathLike,
+    header_fields: Sequence[str] = DEFAULT_HEADER_FIELDS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    delimiter: str = ",",
+) -> int:
+    """
+    Write methods to one CSV file per method type in a directory, see `CsvWriter`. Returns the number of methods
+    written.
+
+    The methods are consumed one at a time, so for constant memory use, pass a generator, e.g. of `Parser.iter_parse`.
+    """
+    with CsvWriter(directory, header_fields, batch_size, delimiter) as writer:
+        for method in methods:
+            writer.write(method)
+
+    return writer.methods_written
@@ -0,0 +1,94 @@
+"""
+Streaming JSON Lines export of methods and data rows.
+
+Each method is written as a header line, followed by its data rows, one row per line or batches of rows per line:
+
+    {"method_id": 0, "method": {"method_type": "CPT", ..., "depth_base": "24.980", "stopcode": 90}}
+    {"method_id": 0, "position": 0, "row": {"comment_code": null, ..., "depth": "1.000", ...}}
+    {"method_id": 0, "position": 0, "rows": [{...}, {...}, ...]}  (with batches of rows)
+
+The header (with the computed fields) and the rows are serialized like `model_dump_json()`, e.g. Decimals as strings
+to keep their exact values. The serializers of the method classes, and of lists of rows of each method data class,
+are compiled once, and write JSON bytes directly, without building dicts of the rows.
+"""
+
+import functools
+import os
+from collections.abc import Iterable
+from typing import BinaryIO
+
+from pydantic import TypeAdapter
+
+from sgf_parser.models import Method, MethodData
+
+# Method fields that are not written in the header line
+_EXCLUDE_HEADER = {"method_data", "method_data_type"}
+
+
+@functools.cache
+def _rows_serializer(method_data_type: type[MethodData]) -> TypeAdapter:
+    """Return the (compiled) serializer of lists of rows of a method data class"""
+    return TypeAdapter(list[method_data_type])  # type: ignore[valid-type]
+
+
+class JsonLinesWriter:
+    """
+    Streaming writer of methods to a JSON Lines file opened in binary mode, see the module documentation for the
+    format.
+
+    If batch_size is 1, each data row is written on its own line ("row"), otherwise batches of up to batch_size rows
+    are written per line ("rows"). Only one line is built in memory at a time.
+    """
+
+    def __init__(self, file: BinaryIO, batch_size: int = 1):
+        if batch_size < 1:
+            raise ValueError(f"The batch size must be at least 1, got {batch_size!r}")
+
+        self.file = file
+        self.batch_size = batch_size
+        self.methods_written = 0
+
+    def write(self, method: Method):
+        """
+        Write the header line and the data rows of a method
+        """
+        method_id = self.methods_written
+        write = self.file.write
+
+        write(b'{"method_id":%d,"method":' % method_id)
+        write(method.__pydantic_serializer__.to_json(method, exclude=_EXCLUDE_HEADER))
+        write(b"}\n")
+
+        rows = method.method_data
+        if self.batch_size == 1:
+            to_json = method.method_data_type.__pydantic_serializer__.to_json
+            for position, row in enumerate(rows):
+                write(b'{"method_id":%d,"position":%d,"row":' % (method_id, position))
+                write(to_json(row))
+                write(b"}\n")
+        else:
+            dump_json = _rows_serializer(method.method_data_type).dump_json
+            for start in range(0, len(rows), self.batch_size):
+                write(b'{"method_id":%d,"position":%d,"rows":' % (method_id, start))
+                write(dump_json(rows[start : start + self.batch_size]))
+                write(b"}\n")
+
+        self.methods_written += 1
+
+
+def export_jsonl(methods: Iterable[Method], path: str | os.PathLike | BinaryIO, batch_size: int = 1) -> int:
+    """
+    Write methods to a JSON Lines file (a path, or a file opened in binary mode), see `JsonLinesWriter`. Returns the
+    number of methods written.
+
+    The methods are consumed one at a time, so for bounded memory use, pass a generator, e.g. of `Parser.iter_parse`.
+    """
+    if isinstance(path, (str, os.PathLike)):
+        with open(path, "wb") as file:
+            return export_jsonl(methods, file, batch_size)
+
+    writer = JsonLinesWriter(path, batch_size)
+    for method in methods:
+        writer.write(method)
+
+    return writer.methods_written
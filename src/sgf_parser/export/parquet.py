@@ -0,0 +1,286 @@
+"""
+Export of methods to a Parquet dataset, partitioned by method type and project number.
+
+The dataset has a "methods" table with the header fields of each method, and a "data" table with the data rows, with
+the columns of the method data class of the method type. Both tables are partitioned (Hive style) by method type and
+project number:
+
+    root/methods/method_type=CPT/project_number=1234/part-0.parquet
+    root/data/method_type=CPT/project_number=1234/part-0.parquet
+
+A partition has more files (part-1.parquet, ...) if its file was closed to limit the number of open files, while
+writing many partitions. The rows of the data table refer to the methods by the method_id column, unique within the
+dataset, and are ordered by position within each method. Since the columns of each method type are different, each
+method type is read separately, with `PARTITION_SCHEMA` as the partitioning so the project numbers are read as strings
+(inferred, "0123" would be read as 123, and all missing project numbers fail). With pyarrow.parquet as pq and
+pyarrow.dataset as ds:
+
+    pq.read_table(root / "data" / "method_type=CPT", partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"))
+
+Requires the optional `pyarrow` dependency (`pip install sgf-parser[parquet]`).
+"""
+
+import enum
+import functools
+import os
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Self
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from sgf_parser.fields import FieldKind, data_fields, header_fields
+from sgf_parser.models import Method, MethodData
+
+# Number of rows per record batch (and Parquet row group) of each partition
+DEFAULT_BATCH_SIZE = 65536
+
+# Max number of rows buffered in all partitions, before the largest buffers are written
+DEFAULT_MAX_BUFFERED_ROWS = 1 << 20
+
+# Max number of Parquet files open at a time
+DEFAULT_MAX_OPEN_FILES = 64
+
+PARTITION_COLUMNS = ("method_type", "project_number")
+
+# Schema of the partition column within the directory of a method type, for reading the dataset
+PARTITION_SCHEMA = pa.schema([("project_number", pa.string())])
+
+# Partition directory name of missing values, as used by Hive and pyarrow
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+_ARROW_TYPES: dict[FieldKind, pa.DataType] = {
+    "float": pa.float64(),
+    "int": pa.int64(),
+    "bool": pa.bool_(),
+    "datetime": pa.timestamp("us"),
+    "date": pa.date32(),
+    "time": pa.time64("us"),
+    "str": pa.string(),
+}
+
+
+def _to_str(value: Any) -> str:
+    return value.value if isinstance(value, enum.Enum) else str(value)
+
+
+# Conversion of field values to the Python types of the Arrow types
+_CONVERTERS: dict[FieldKind, Callable[[Any], Any]] = {"float": float, "int": int, "str": _to_str}
+
+
+def _convert(values: list[Any], kind: FieldKind) -> list[Any]:
+    convert = _CONVERTERS.get(kind)
+    if convert is None:
+        return values
+    return [None if value is None else convert(value) for value in values]
+
+
+@functools.cache
+def _methods_fields(method_class: type[Method]) -> dict[str, FieldKind]:
+    """Columns of the methods table of a method class, without the partition columns"""
+    fields = header_fields(method_class)
+    return {"method_id": "int", **{name: fields[name] for name in fields if name not in PARTITION_COLUMNS}}
+
+
+@functools.cache
+def _data_fields(method_data_type: type[MethodData]) -> dict[str, FieldKind]:
+    """Columns of the data table of a method data class"""
+    return {"method_id": "int", "position": "int", **data_fields(method_data_type)}
+
+
+def _partition(method: Method) -> tuple[str, str]:
+    return tuple(  # type: ignore[return-value]
+        NULL_PARTITION if value is None else quote(_to_str(value), safe="")
+        for value in (method.method_type, method.project_number)
+    )
+
+
+class _PartitionBuffer:
+    """
+    Rows of one table and partition, buffered column by column until written as a record batch to the open file of the
+    partition
+    """
+
+    def __init__(self, directory: Path, fields: dict[str, FieldKind], part: int):
+        self.directory = directory
+        self.fields = fields
+        self.part = part
+        self.schema = pa.schema([(name, _ARROW_TYPES[kind]) for name, kind in fields.items()])
+        self.columns: dict[str, list[Any]] = {name: [] for name in fields}
+        self.rows = 0
+        self.writer: pq.ParquetWriter | None = None
+
+    def open(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.writer = pq.ParquetWriter(self.directory / f"part-{self.part}.parquet", self.schema)
+
+    def write(self):
+        """
+        Write the buffered rows to the open file
+        """
+        arrays = [
+            pa.array(_convert(self.columns[name], kind), type=_ARROW_TYPES[kind]) for name, kind in self.fields.items()
+        ]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))  # type: ignore[union-attr]
+        self.columns = {name: [] for name in self.fields}
+        self.rows = 0
+
+    def close(self):
+        """
+        Close the file, later rows of the partition are written to the next part file
+        """
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            self.part += 1
+
+
+class ParquetDatasetWriter:
+    """
+    Streaming writer of methods to a Parquet dataset, see the module documentation for the layout.
+
+    The rows are buffered per table and partition, and written as record batches of batch_size rows. When more than
+    max_buffered_rows rows are buffered, the largest buffers are written until half of that is left, keeping the row
+    groups large. At most max_open_files files are open: the least recently written file is closed to open another,
+    and the partition continues in a new part file. So the memory use and the number of open files are bounded
+    regardless of the number of methods and partitions written. The dataset is complete when the writer is closed.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS,
+        max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"The batch size must be at least 1, got {batch_size!r}")
+        if max_open_files < 1:
+            raise ValueError(f"The max number of open files must be at least 1, got {max_open_files!r}")
+
+        self.root = Path(root)
+        if self.root.exists() and any(self.root.iterdir()):
+            raise FileExistsError(f"The dataset directory {self.root} is not empty")
+
+        self.batch_size = batch_size
+        self.max_buffered_rows = max_buffered_rows
+        self.max_open_files = max_open_files
+        self.methods_written = 0
+        # Partitions with buffered rows or an open file
+        self._buffers: dict[tuple[str, str, str], _PartitionBuffer] = {}
+        # Partitions with an open file, the least recently written first
+        self._open: dict[tuple[str, str, str], _PartitionBuffer] = {}
+        # Next part number of the partitions without a buffer
+        self._parts: dict[tuple[str, str, str], int] = {}
+        self._buffered_rows = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _buffer(self, table: str, partition: tuple[str, str], fields: dict[str, FieldKind]) -> _PartitionBuffer:
+        key = (table, *partition)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            directory = self.root / table
+            for name, value in zip(PARTITION_COLUMNS, partition):
+                directory /= f"{name}={value}"
+            buffer = self._buffers[key] = _PartitionBuffer(directory, fields, self._parts.pop(key, 0))
+        return buffer
+
+    def write(self, method: Method):
+        """
+        Write the header and the data rows of a method
+        """
+        method_id = self.methods_written
+        partition = _partition(method)
+
+        buffer = self._buffer("methods", partition, _methods_fields(type(method)))
+        buffer.columns["method_id"].append(method_id)
+        for name in header_fields(type(method)):
+            if name not in PARTITION_COLUMNS:
+                buffer.columns[name].append(getattr(method, name))
+        self._added(("methods", *partition), buffer, 1)
+
+        buffer = self._buffer("data", partition, _data_fields(method.method_data_type))
+        rows = [row.__dict__ for row in method.method_data]
+        buffer.columns["method_id"].extend([method_id] * len(rows))
+        buffer.columns["position"].extend(range(len(rows)))
+        for name in data_fields(method.method_data_type):
+            buffer.columns[name].extend([row.get(name) for row in rows])
+        self._added(("data", *partition), buffer, len(rows))
+
+        self.methods_written += 1
+
+    def _added(self, key: tuple[str, str, str], buffer: _PartitionBuffer, rows: int):
+        buffer.rows += rows
+        self._buffered_rows += rows
+        if buffer.rows >= self.batch_size:
+            self._flush(key, buffer)
+        if self._buffered_rows > self.max_buffered_rows:
+            largest = sorted(self._buffers.items(), key=lambda item: item[1].rows, reverse=True)
+            for other_key, other in largest:
+                if self._buffered_rows <= self.max_buffered_rows // 2:
+                    break
+                self._flush(other_key, other)
+
+    def _flush(self, key: tuple[str, str, str], buffer: _PartitionBuffer):
+        """
+        Write the buffered rows of a partition, opening its file if needed
+        """
+        if not buffer.rows:
+            return
+
+        if buffer.writer is None:
+            while len(self._open) >= self.max_open_files:
+                self._close(next(iter(self._open)))
+            buffer.open()
+        else:
+            del self._open[key]
+        self._open[key] = buffer
+
+        self._buffered_rows -= buffer.rows
+        buffer.write()
+
+    def _close(self, key: tuple[str, str, str]):
+        """
+        Close the file of a partition, and drop its buffer if it is empty
+        """
+        buffer = self._open.pop(key)
+        buffer.close()
+        if not buffer.rows:
+            del self._buffers[key]
+            self._parts[key] = buffer.part
+
+    def close(self):
+        """
+        Write the buffered rows and close the files
+        """
+        for key, buffer in list(self._buffers.items()):
+            self._flush(key, buffer)
+        for key in list(self._open):
+            self._close(key)
+        self._buffered_rows = 0
+
+
+def export_parquet(
+    methods: Iterable[Method],
+    root: str | os.PathLike,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS,
+    max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+) -> int:
+    """
+    Write methods to a new Parquet dataset, see `ParquetDatasetWriter`. Returns the number of methods written.
+
+    The methods are consumed one at a time, so for bounded memory use, pass a generator, e.g. of `Parser.iter_parse`.
+    """
+    with ParquetDatasetWriter(root, batch_size, max_buffered_rows, max_open_files) as writer:
+        for method in methods:
+            writer.write(method)
+
+    return writer.methods_written
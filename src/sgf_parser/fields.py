@@ -0,0 +1,102 @@
+"""
+Field kinds of the method and method data models, for exporting fields as typed columns.
+
+The kind of a field is given by its annotation (or the return type of a computed field), ignoring None:
+"float" (Decimal and float), "int" (int and integer enums), "bool", "datetime", "date", "time" and "str" (str, string
+enums and other types).
+"""
+
+import datetime
+import enum
+import functools
+import types
+import typing
+from collections.abc import Sequence
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from sgf_parser.models import Method, MethodData
+
+FieldKind = Literal["float", "int", "bool", "datetime", "date", "time", "str"]
+
+# Method fields that are not header fields
+NON_HEADER_FIELDS = frozenset(("method_data", "method_data_type"))
+
+
+def _kind_of_type(value_type: Any) -> FieldKind:
+    if not isinstance(value_type, type):
+        return "str"
+    if issubclass(value_type, enum.Enum):
+        return "int" if issubclass(value_type, int) else "str"
+    if issubclass(value_type, bool):
+        return "bool"
+    if issubclass(value_type, (Decimal, float)):
+        return "float"
+    if issubclass(value_type, int):
+        return "int"
+    if issubclass(value_type, datetime.datetime):
+        return "datetime"
+    if issubclass(value_type, datetime.date):
+        return "date"
+    if issubclass(value_type, datetime.time):
+        return "time"
+    return "str"
+
+
+def field_kind(annotation: Any) -> FieldKind:
+    """
+    Return the kind of a field annotation. Unions of different kinds (other than float and int) are "str".
+    """
+    if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+        args = set(typing.get_args(annotation)) - {type(None)}
+    elif typing.get_origin(annotation) is Literal:
+        args = {type(arg) for arg in typing.get_args(annotation)}
+    else:
+        args = {annotation}
+
+    kinds = {_kind_of_type(arg) for arg in args}
+    if kinds == {"float", "int"}:
+        return "float"
+    if len(kinds) == 1:
+        return kinds.pop()
+    return "str"
+
+
+@functools.cache
+def header_fields(method_class: type["Method"]) -> dict[str, FieldKind]:
+    """
+    Return the header fields (model fields and computed fields, without the data rows) of a method class and their
+    kinds, in definition order. The result is cached, and must not be modified.
+    """
+    result = {
+        name: field_kind(field.annotation)
+        for name, field in method_class.model_fields.items()
+        if name not in NON_HEADER_FIELDS
+    }
+    result |= {name: field_kind(field.return_type) for name, field in method_class.model_computed_fields.items()}
+    return result
+
+
+@functools.cache
+def data_fields(method_data_type: type["MethodData"]) -> dict[str, FieldKind]:
+    """
+    Return the fields of a method data class and their kinds, in definition order. The result is cached, and must not
+    be modified.
+    """
+    return {name: field_kind(field.annotation) for name, field in method_data_type.model_fields.items()}
+
+
+def header_values(method: "Method") -> dict[str, Any]:
+    """
+    Return the values of the header fields of a method, see `header_fields`
+    """
+    return {name: getattr(method, name) for name in header_fields(type(method))}
+
+
+def data_columns(rows: Sequence["MethodData"], method_data_type: type["MethodData"]) -> dict[str, list[Any]]:
+    """
+    Return the values of the data rows as one list per field of the method data class, in definition order
+    """
+    row_dicts = [row.__dict__ for row in rows]
+    return {name: [row.get(name) for row in row_dicts] for name in data_fields(method_data_type)}
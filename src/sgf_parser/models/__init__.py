@@ -1,6 +1,7 @@
 from sgf_parser.models.method_type import MethodType
 
 from sgf_parser.models.types import StopCode, ParseState
+from sgf_parser.models.application_class import ApplicationClassThresholds, DepthLimit, ZeroValueLimit
 from sgf_parser.models.method import Method, MethodData
 from sgf_parser.models.method_cpt import MethodCPT, MethodCPTData
 from sgf_parser.models.method_dp import MethodDP, MethodDPData
@@ -0,0 +1,73 @@
+from decimal import Decimal
+from typing import NamedTuple
+
+from pydantic import BaseModel, ConfigDict
+
+from sgf_parser.models.types import ApplicationClass
+
+
+class DepthLimit(NamedTuple):
+    """
+    Max delta depth (m) between data rows for an application class
+    """
+
+    max_delta_depth: Decimal
+    application_class: ApplicationClass
+
+
+class ZeroValueLimit(NamedTuple):
+    """
+    Max absolute zero value drift for an application class.
+
+    The limit is the largest of the absolute limit, and the relative limit times the max measured value.
+    """
+
+    absolute: Decimal
+    relative: Decimal
+    application_class: ApplicationClass
+
+
+class ApplicationClassThresholds(BaseModel):
+    """
+    Thresholds for the CPT application classes (also called quality classes).
+
+    The limits of each table are checked in order, and the first limit that is satisfied gives the class. If no limits
+    are satisfied, the class is OUT_OF_BOUNDS.
+
+    +-----------------------------------------------|-- Class 1 ---|- Class 2 -----|-- Class 3 ----|-- Class 4 ----+
+    | delta Depth (delta D)                      <= | 20 mm        | 20 mm         | 50mm          | 50mm          |
+    | NA = delta QC [MPa] - Zero value resistance<= | 35 kPa or 5% | 100 kPa or 5% | 200 kPa or 5% | 500 kPa or 5% |
+    | NB = delta fs [kPa] - Zero value friction  <= | 5 kPa or 10% | 15 kPa or 15% | 25 kPa or 15% | 50 kPa or 20% |
+    | NC = delta u2 [kPa] - Zero value pressure  <= | 10 kPa or 2% | 25 kPa or 3%  | 50 kPa or 5%  |               |
+    +--------------------------------------------------------------------------------------------------------------+
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    depth: tuple[DepthLimit, ...] = (
+        DepthLimit(Decimal("0.02"), ApplicationClass.ONE),
+        DepthLimit(Decimal("0.05"), ApplicationClass.THREE),
+    )
+    # Limits in MPa, like the zero value resistance (NA)
+    resistance: tuple[ZeroValueLimit, ...] = (
+        ZeroValueLimit(Decimal("0.035"), Decimal("0.05"), ApplicationClass.ONE),
+        ZeroValueLimit(Decimal("0.100"), Decimal("0.05"), ApplicationClass.TWO),
+        ZeroValueLimit(Decimal("0.200"), Decimal("0.05"), ApplicationClass.THREE),
+        ZeroValueLimit(Decimal("0.500"), Decimal("0.05"), ApplicationClass.FOUR),
+    )
+    # Limits in kPa, like the zero value friction (NB)
+    friction: tuple[ZeroValueLimit, ...] = (
+        ZeroValueLimit(Decimal(5), Decimal("0.1"), ApplicationClass.ONE),
+        ZeroValueLimit(Decimal(15), Decimal("0.15"), ApplicationClass.TWO),
+        ZeroValueLimit(Decimal(25), Decimal("0.15"), ApplicationClass.THREE),
+        ZeroValueLimit(Decimal(50), Decimal("0.2"), ApplicationClass.FOUR),
+    )
+    # Limits in kPa, like the zero value pressure (NC)
+    pressure: tuple[ZeroValueLimit, ...] = (
+        ZeroValueLimit(Decimal(10), Decimal("0.02"), ApplicationClass.ONE),
+        ZeroValueLimit(Decimal(25), Decimal("0.03"), ApplicationClass.TWO),
+        ZeroValueLimit(Decimal(50), Decimal("0.05"), ApplicationClass.THREE),
+    )
+
+
+DEFAULT_APPLICATION_CLASS_THRESHOLDS = ApplicationClassThresholds()
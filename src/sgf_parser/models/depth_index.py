@@ -0,0 +1,153 @@
+"""
+Sorted depth index over the data rows of a method
+"""
+
+import bisect
+import itertools
+from collections.abc import Iterator, Sequence
+from decimal import Decimal
+from typing import Any, Literal, overload
+
+
+def to_decimal(value: Decimal | float | str) -> Decimal:
+    """
+    Convert a depth given as a number or string to Decimal, without binary floating point noise
+    """
+    if isinstance(value, Decimal):
+        return value
+
+    return Decimal(str(value))
+
+
+class MethodDataView(Sequence):
+    """
+    Read-only view of a subset of a method's data rows, ordered by depth.
+
+    The view refers to the method data list and the depth index, so no rows or positions are copied. Slicing a view
+    returns a new view.
+    """
+
+    __slots__ = ("_order", "_rows", "_start", "_stop")
+
+    def __init__(self, rows: Sequence[Any], order: Sequence[int], start: int, stop: int):
+        self._rows = rows
+        self._order = order
+        self._start = start
+        self._stop = max(start, stop)
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "MethodDataView": ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Method data views do not support slicing with a step")
+            return MethodDataView(self._rows, self._order, self._start + start, self._start + stop)
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Method data view index out of range")
+
+        return self._rows[self._order[self._start + index]]
+
+    def __iter__(self) -> Iterator[Any]:
+        rows = self._rows
+        for position in self.positions:
+            yield rows[position]
+
+    @property
+    def positions(self) -> Sequence[int]:
+        """
+        The positions (in method_data) of the rows in the view
+        """
+        return self._order[self._start : self._stop]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {list(self)!r}>"
+
+
+class DepthIndex:
+    """
+    Sorted depth index over a list of data rows.
+
+    Rows without a depth (e.g. in TR, SLB, STI and DT methods) are not indexed. Rows that are not sorted by depth in the
+    file are ordered by depth, and rows with the same depth are kept in file order.
+    """
+
+    def __init__(self, rows: Sequence[Any]):
+        self._rows = rows
+
+        positions = [position for position, row in enumerate(rows) if getattr(row, "depth", None) is not None]
+        depths = [rows[position].depth for position in positions]
+
+        self.is_monotonic = all(a <= b for a, b in itertools.pairwise(depths))
+        if self.is_monotonic and len(positions) == len(rows):
+            # The common case, avoid storing a positions list
+            self.order: Sequence[int] = range(len(rows))
+        elif self.is_monotonic:
+            self.order = positions
+        else:
+            self.order = sorted(positions, key=lambda position: rows[position].depth)
+            depths = [rows[position].depth for position in self.order]
+
+        self.depths: list[Decimal] = depths
+
+    def __len__(self) -> int:
+        return len(self.depths)
+
+    def floor(self, depth: Decimal | float | str) -> int | None:
+        """
+        Return the position of the deepest row at or above the given depth, or None.
+
+        If several rows have that depth, the last one in file order is returned.
+        """
+        index = bisect.bisect_right(self.depths, to_decimal(depth)) - 1
+        if index < 0:
+            return None
+
+        return self.order[index]
+
+    def nearest(self, depth: Decimal | float | str) -> int | None:
+        """
+        Return the position of the row nearest to the given depth, or None if no rows are indexed.
+
+        If the depth is halfway between two rows, the shallower row is returned.
+        """
+        if not self.depths:
+            return None
+
+        depth = to_decimal(depth)
+        index = bisect.bisect_right(self.depths, depth) - 1
+        if index < 0:
+            index = bisect.bisect_right(self.depths, self.depths[0]) - 1
+
+        if index + 1 < len(self.depths) and self.depths[index + 1] - depth < depth - self.depths[index]:
+            # Resolve rows with equal depth to the last one
+            index = bisect.bisect_right(self.depths, self.depths[index + 1]) - 1
+
+        return self.order[index]
+
+    def window(self, depth_from: Decimal | float | str, depth_to: Decimal | float | str) -> MethodDataView:
+        """
+        Return a view of the rows with depth_from <= depth <= depth_to, ordered by depth
+        """
+        start = bisect.bisect_left(self.depths, to_decimal(depth_from))
+        stop = bisect.bisect_right(self.depths, to_decimal(depth_to))
+        return MethodDataView(self._rows, self.order, start, stop)
+
+    def lookup(self, depth: Decimal | float | str, mode: Literal["nearest", "floor"] = "nearest") -> int | None:
+        match mode:
+            case "nearest":
+                return self.nearest(depth)
+            case "floor":
+                return self.floor(depth)
+            case _:
+                raise ValueError(f"Unsupported depth lookup mode {mode!r}")
@@ -1,13 +1,26 @@
 import abc
+import functools
 import re
+from collections.abc import Callable, Sequence
 from datetime import datetime, time
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal, Self, TypeVar
 
+import pydantic_core
 from pydantic import BaseModel, Field, AliasChoices, model_validator, computed_field
 
 from sgf_parser.datetime_parser import convert_str_to_datetime, convert_str_to_time
+from sgf_parser.fields import NON_HEADER_FIELDS, data_columns
 from sgf_parser.models import MethodType
+from sgf_parser.models.depth_index import DepthIndex, MethodDataView
+from sgf_parser.models.state_intervals import STATE_NAMES, StateIntervals, StateName, build_state_intervals
+from sgf_parser.models.types import CommentCode
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from sgf_parser.analysis.resample import Aggregation
 
 
 _MINUS_SIGN_TRANSLATION = str.maketrans(
@@ -23,6 +36,24 @@ _MINUS_SIGN_TRANSLATION = str.maketrans(
 )
 
 
+_T = TypeVar("_T")
+
+
+def cached_summary(func: Callable[[Any], _T]) -> Callable[[Any], _T]:
+    """
+    Cache the return value of a method summary (e.g. a computed field) on the method instance.
+
+    The cached value is dropped whenever a field is assigned, `method_data` changes length, or
+    `Method.invalidate_cache()` is called.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self: "Method") -> _T:
+        return self._get_cached(func.__name__, lambda: func(self))
+
+    return wrapper
+
+
 def _normalize_minus_signs(value: Any) -> Any:
     if isinstance(value, str):
         return value.translate(_MINUS_SIGN_TRANSLATION)
@@ -174,11 +205,66 @@ class Method(BaseModel):
     _current_hammer_active_state: bool = False
     _current_increased_rotation_state: bool = False
 
+    # Cache of summaries derived from method_data, see `cached_summary`.
+    # The key is the identity and length of the method_data list the cache was built from.
+    _cache: dict[str, Any] = {}
+    _cache_key: tuple[int, int] | None = None
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+    def __setattr__(self, name: str, value: Any):
+        if name in self.__private_attributes__:
+            # Fast path for the private attributes, e.g. the row states assigned for every row while parsing
+            self.__pydantic_private__[name] = value  # type: ignore[index]
+            return
+        super().__setattr__(name, value)
+        # Summaries may depend on header fields as well (e.g. point_z), not only on method_data
+        self.invalidate_cache()
+
+    def __copy__(self) -> Self:
+        copy = super().__copy__()
+        # model_copy(update=...) sets the updated fields of the copy without assigning them, so the copy gets its own
+        # (empty) cache
+        copy.invalidate_cache()
+        return copy
+
+    def invalidate_cache(self):
+        """
+        Drop all cached summaries.
+
+        Assigning a field (e.g. replacing `method_data`) or adding/removing rows invalidates the cache automatically.
+        Call this method after changing the values of existing data rows in place.
+        """
+        # Always bind a new dict, since shallow copies of the method share the old one
+        self._cache = {}
+        self._cache_key = None
+
+    def _get_cached(self, name: str, compute: Callable[[], _T]) -> _T:
+        key = (id(self.method_data), len(self.method_data))
+        if self._cache_key != key:
+            self._cache = {}
+            self._cache_key = key
+        elif name in self._cache:
+            return self._cache[name]
+
+        value = self._cache[name] = compute()
+        return value
+
+    def refresh_cache(self):
+        """
+        Recompute all cached computed fields
+        """
+        self.invalidate_cache()
+        for name in self.__class__.model_computed_fields:
+            getattr(self, name)
+
     def post_processing(self):
-        pass
+        """
+        Post-processing, run when all data rows are added to the method
+        """
+        self.refresh_cache()
+        self._state_intervals()
 
     @classmethod
     def extract_codes(cls, remarks: str | None) -> tuple[int, ...]:
@@ -193,6 +279,182 @@ class Method(BaseModel):
         result = re.findall(r"(?:^| )(\d\d)(?:,|$)", remarks)
         return tuple(int(r) for r in result)
 
+    @cached_summary
+    def _code_indexes(self) -> tuple[dict[int, tuple[int, ...]], dict[int, tuple[int, ...]]]:
+        """
+        Build the comment code indexes in one pass over method_data.
+
+        Return a tuple of (comment code column only, comment code column and codes extracted from the remarks).
+        """
+        primary: dict[int, list[int]] = {}
+        combined: dict[int, list[int]] = {}
+        for position, row in enumerate(self.method_data):
+            codes = self.extract_codes(row.remarks)
+            if row.comment_code is not None:
+                primary.setdefault(row.comment_code, []).append(position)
+                codes = (row.comment_code, *codes)
+
+            for code in dict.fromkeys(codes):
+                combined.setdefault(code, []).append(position)
+
+        return (
+            {code: tuple(positions) for code, positions in primary.items()},
+            {code: tuple(positions) for code, positions in combined.items()},
+        )
+
+    @property
+    def code_index(self) -> dict[int, tuple[int, ...]]:
+        """
+        Map each comment code to the sorted positions (in method_data) of the rows having that code.
+
+        Codes found in the remarks column (see `extract_codes`) are included.
+        """
+        return self._code_indexes()[1]
+
+    def rows_with_code(self, *codes: int, include_remarks: bool = True) -> tuple[int, ...]:
+        """
+        Return the sorted positions (in method_data) of the rows having any of the given comment codes.
+
+        If include_remarks is False, only the comment code column ("K") is used.
+        """
+        index = self._code_indexes()[1 if include_remarks else 0]
+        if len(codes) == 1:
+            return index.get(codes[0], ())
+
+        return tuple(sorted({position for code in codes for position in index.get(code, ())}))
+
+    def last_row_with_code(self, *codes: int, include_remarks: bool = True) -> int | None:
+        """
+        Return the position (in method_data) of the last row having any of the given comment codes, or None.
+
+        If include_remarks is False, only the comment code column ("K") is used.
+        """
+        index = self._code_indexes()[1 if include_remarks else 0]
+        return max((index[code][-1] for code in codes if code in index), default=None)
+
+    @cached_summary
+    def depth_index(self) -> DepthIndex:
+        """
+        Return the sorted depth index over method_data
+        """
+        return DepthIndex(self.method_data)
+
+    def at_depth(
+        self, depth: Decimal | float | str, mode: Literal["nearest", "floor"] = "nearest"
+    ) -> "MethodData | None":
+        """
+        Return the data row at the given depth, or None if no rows have a depth.
+
+        mode "nearest": The row nearest to the depth. If halfway between two rows, the shallower row.
+        mode "floor": The deepest row at or above the depth, or None if all rows are deeper.
+
+        Rows with equal depth are resolved to the last row in file order.
+        """
+        position = self.depth_index().lookup(depth, mode)
+        if position is None:
+            return None
+
+        return self.method_data[position]
+
+    def depth_window(self, depth_from: Decimal | float | str, depth_to: Decimal | float | str) -> MethodDataView:
+        """
+        Return a view (not a copy) of the data rows with depth_from <= depth <= depth_to, ordered by depth.
+
+        Rows without a depth are never included.
+        """
+        return self.depth_index().window(depth_from, depth_to)
+
+    def to_columns(self, mode: Literal["python", "json"] = "python") -> dict[str, Any]:
+        """
+        Return the header fields and computed fields as `model_dump()`, with method_data as one list per field of the
+        method data class ("orient=columns") instead of one dict per row.
+
+        With mode "json", the values are JSON compatible, as with `model_dump(mode="json")`.
+        """
+        result = self.__pydantic_serializer__.to_python(self, mode=mode, exclude=set(NON_HEADER_FIELDS))
+        columns = data_columns(self.method_data, self.method_data_type)
+        result["method_data"] = pydantic_core.to_jsonable_python(columns) if mode == "json" else columns
+        return result
+
+    def to_columns_json(self, indent: int | None = None) -> str:
+        """
+        Return `to_columns()` as JSON, e.g. for API responses. Decimals are strings, as with `model_dump_json()`.
+        """
+        return pydantic_core.to_json(self.to_columns(), indent=indent).decode("utf-8")
+
+    def to_dataframe(self, header_fields: Sequence[str] = ()) -> "pd.DataFrame":
+        """
+        Return the data rows as a pandas DataFrame, built column by column, with the given header fields repeated on
+        each row, see `sgf_parser.dataframe.method_to_dataframe`.
+
+        Requires the optional pandas dependency.
+        """
+        from sgf_parser.dataframe import method_to_dataframe
+
+        return method_to_dataframe(self, header_fields)
+
+    @cached_summary
+    def as_arrays(self) -> dict[str, "np.ndarray"]:
+        """
+        Return the data rows as one read-only NumPy array per numeric and boolean field, and the comment codes.
+
+        Missing numeric values are NaN, missing booleans are False and missing comment codes are -1.
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.columns import method_to_arrays
+
+        return method_to_arrays(self)
+
+    def resample(
+        self,
+        step: float,
+        agg: "Aggregation | dict[str, Aggregation]" = "linear",
+        fields: list[str] | None = None,
+        depth_from: float | None = None,
+        depth_to: float | None = None,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Resample the data onto a regular depth grid, see `sgf_parser.analysis.resample`.
+
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.analysis.resample import resample
+
+        return resample(self, step, agg, fields, depth_from, depth_to)
+
+    def _rock_top_row(self, rock_codes: tuple[int, ...]) -> int | None:
+        """
+        Return the position of the last row marking the top of rock, or None.
+
+        A rock code followed by a "rock end" code (42) is a false positive, and is ignored.
+        """
+        rock_top = self.last_row_with_code(*rock_codes, include_remarks=False)
+        if rock_top is None:
+            return None
+
+        rock_end = self.last_row_with_code(CommentCode.ROCK_END_42, include_remarks=False)
+        if rock_end is not None and rock_end > rock_top:
+            return None
+
+        return rock_top
+
+    @cached_summary
+    def _state_intervals(self) -> dict[str, StateIntervals]:
+        names = [name for name in STATE_NAMES if name in self.method_data_type.model_fields]
+        return build_state_intervals(self.method_data, names)
+
+    def state_intervals(self, state: StateName) -> StateIntervals:
+        """
+        Return the depth intervals where the state ("flushing", "hammering" or "increased_rotation_rate") is on, as
+        run-length encoded intervals of the data rows.
+
+        Methods without the state in their data have no intervals.
+        """
+        if state not in STATE_NAMES:
+            raise ValueError(f"Unknown state {state!r}, must be one of {STATE_NAMES}")
+
+        return self._state_intervals().get(state, StateIntervals())
+
     def is_flushing_active(
         self,
         data_row,  #: "MethodCPTData" | "MethodTOTData" | "MethodRPData",
@@ -329,20 +591,17 @@ class Method(BaseModel):
         return _normalize_minus_signs(data)
 
     @computed_field
+    @cached_summary
     def depth_top(self) -> Decimal | None:
-        if not self.method_data:
-            return None
-
-        return min(method_data.depth for method_data in self.method_data)
+        return min((row.depth for row in self.method_data if row.depth is not None), default=None)
 
     @computed_field
+    @cached_summary
     def depth_base(self) -> Decimal | None:
-        if not self.method_data:
-            return None
-
-        return max(method_data.depth for method_data in self.method_data)
+        return max((row.depth for row in self.method_data if row.depth is not None), default=None)
 
     @computed_field
+    @cached_summary
     def stopcode(self) -> int | None:
         if not self.method_data:
             return None
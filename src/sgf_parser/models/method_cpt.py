@@ -1,11 +1,24 @@
+from collections.abc import Sequence
 from decimal import Decimal
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from pydantic import Field, AliasChoices
 
 from sgf_parser.models import MethodType, MethodData, Method
+from sgf_parser.models.application_class import (
+    DEFAULT_APPLICATION_CLASS_THRESHOLDS,
+    ApplicationClassThresholds,
+    DepthLimit,
+    ZeroValueLimit,
+)
 from sgf_parser.models.types import ApplicationClass
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Data channels of the CPT filters, by default
+CPT_CHANNELS = ("qc", "fs", "u2", "tilt")
+
 
 class MethodCPTData(MethodData):
     """
@@ -115,7 +128,7 @@ class MethodCPT(Method):
 
         return self.method_data[1].depth - self.method_data[0].depth
 
-    def _get_depth_class(self) -> ApplicationClass:
+    def _get_depth_class(self, limits: tuple[DepthLimit, ...]) -> ApplicationClass:
         """
         Return the method's application class depending on the delta depth (not looking at any other factors)
 
@@ -129,18 +142,17 @@ class MethodCPT(Method):
         if not delta_depth:
             return ApplicationClass.UNKNOWN
 
-        if delta_depth <= 0.02:
-            return ApplicationClass.ONE
-        elif delta_depth <= 0.05:
-            return ApplicationClass.THREE
+        for max_delta_depth, class_number in limits:
+            if delta_depth <= max_delta_depth:
+                return class_number
 
         return ApplicationClass.OUT_OF_BOUNDS
 
     def _get_zero_value_class(
-        self, field: str, pressure_class_map: list[tuple[Decimal, ApplicationClass]]
+        self, field: str, max_data_value: Decimal, limits: tuple[ZeroValueLimit, ...]
     ) -> ApplicationClass:
         """
-        Return the application class based on the absolute zero value from the last row of data form the pressure_class_map.
+        Return the application class based on the absolute zero value from the last row of data, and the limits.
 
         If value out of range, then return OUT_OF_BOUNDS (5) as a marker for error/not defined state
         """
@@ -154,82 +166,65 @@ class MethodCPT(Method):
 
         diff = abs(value_last)
 
-        for pressure, class_number in pressure_class_map:
-            if diff <= pressure:
+        for absolute, relative, class_number in limits:
+            if diff <= max(absolute, max_data_value * relative):
                 return class_number
 
         return ApplicationClass.OUT_OF_BOUNDS
 
     def _calculate_application_class(
-        self,
+        self, thresholds: ApplicationClassThresholds = DEFAULT_APPLICATION_CLASS_THRESHOLDS
     ) -> tuple[ApplicationClass, ApplicationClass, ApplicationClass, ApplicationClass]:
         """
-        Calculates the method's application class (also called quality class)
-
-        +-----------------------------------------------|-- Class 1 ---|- Class 2 -----|-- Class 3 ----|-- Class 4 ----+
-        | delta Depth (delta D)                      <= | 20 mm        | 20 mm         | 50mm          | 50mm          |
-        | NA = delta QC [MPa] - Zero value resistance<= | 35 kPa or 5% | 100 kPa or 5% | 200 kPa or 5% | 500 kPa or 5% |
-        | NB = delta fs [kPa] - Zero value friction  <= | 5 kPa or 10% | 15 kPa or 15% | 25 kPa or 15% | 50 kPa or 20% |
-        | NC = delta u2 [kPa] - Zero value pressure  <= | 10 kPa or 2% | 25 kPa or 3%  | 50 kPa or 5%  |               |
-        +--------------------------------------------------------------------------------------------------------------+
+        Calculates the method's application class (also called quality class), see `ApplicationClassThresholds`
         """
-        depth_class: ApplicationClass = self._get_depth_class()
-
-        qc_max_data_value = self._get_data_field_max_value(field="qc")  # MPa
-        # convert to kPa
-        # qc_max_data_value = (qc_max_data_value * unit.MPa).to(unit.kPa).magnitude
-        qc_max_data_value = qc_max_data_value * Decimal("1000")
+        depth_class: ApplicationClass = self._get_depth_class(thresholds.depth)
 
         NA_class = self._get_zero_value_class(
-            field="zero_value_resistance",
-            pressure_class_map=[
-                (max(Decimal("35"), qc_max_data_value * Decimal("0.05")) / Decimal("1000"), ApplicationClass.ONE),
-                (max(Decimal("100"), qc_max_data_value * Decimal("0.05")) / Decimal("1000"), ApplicationClass.TWO),
-                (max(Decimal("200"), qc_max_data_value * Decimal("0.05")) / Decimal("1000"), ApplicationClass.THREE),
-                (max(Decimal("500"), qc_max_data_value * Decimal("0.05")) / Decimal("1000"), ApplicationClass.FOUR),
-            ],
+            "zero_value_resistance",
+            self._get_data_field_max_value(field="qc"),
+            thresholds.resistance,  # MPa
         )
-
-        fs_max_data_value = self._get_data_field_max_value(field="fs")  # kPa
         NB_class = self._get_zero_value_class(
-            field="zero_value_friction",
-            pressure_class_map=[
-                (max(Decimal("5"), fs_max_data_value * Decimal("0.1")), ApplicationClass.ONE),
-                (max(Decimal("15"), fs_max_data_value * Decimal("0.15")), ApplicationClass.TWO),
-                (max(Decimal("25"), fs_max_data_value * Decimal("0.15")), ApplicationClass.THREE),
-                (max(Decimal("50"), fs_max_data_value * Decimal("0.2")), ApplicationClass.FOUR),
-            ],
+            "zero_value_friction",
+            self._get_data_field_max_value(field="fs"),
+            thresholds.friction,  # kPa
         )
-
-        u2_max_data_value = self._get_data_field_max_value(field="u2")  # kPa
         NC_class = self._get_zero_value_class(
-            field="zero_value_pressure",
-            pressure_class_map=[
-                (max(Decimal("10"), u2_max_data_value * Decimal("0.02")), ApplicationClass.ONE),
-                (max(Decimal("25"), u2_max_data_value * Decimal("0.03")), ApplicationClass.TWO),
-                (max(Decimal("50"), u2_max_data_value * Decimal("0.05")), ApplicationClass.THREE),
-            ],
+            "zero_value_pressure",
+            self._get_data_field_max_value(field="u2"),
+            thresholds.pressure,  # kPa
         )
 
         return depth_class, NA_class, NB_class, NC_class
 
-    def post_processing(self):
+    def classify(self, thresholds: ApplicationClassThresholds = DEFAULT_APPLICATION_CLASS_THRESHOLDS):
         """
-        Post-processing
+        (Re)calculate the application classes with the given thresholds, without parsing the file again.
 
+        Use `sgf_parser.analysis.application_classes` to classify many methods at once.
         """
-
         if not self.method_data:
             return
 
-        self._patch_zero_values_from_header_text()
-
         (
             self.application_class_depth,
             self.application_class_resistance,
             self.application_class_friction,
             self.application_class_pressure,
-        ) = self._calculate_application_class()
+        ) = self._calculate_application_class(thresholds)
+
+    def post_processing(self):
+        """
+        Post-processing
+
+        """
+
+        if self.method_data:
+            self._patch_zero_values_from_header_text()
+            self.classify()
+
+        super().post_processing()
 
     @property
     def application_class(self) -> ApplicationClass:
@@ -251,6 +246,54 @@ class MethodCPT(Method):
         else:
             return ApplicationClass.UNKNOWN
 
+    def derived_parameters(
+        self,
+        unit_weight: float = 19.0,
+        default_water_level: float = 0.0,
+        max_iterations: int = 20,
+        tolerance: float = 1e-3,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Compute qt, qn, Rf, Bq, Ic and related parameters, see `sgf_parser.analysis.cpt.cpt_parameters`.
+
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.analysis.cpt import cpt_parameters
+
+        return cpt_parameters(self, unit_weight, default_water_level, max_iterations, tolerance)
+
+    def rolling_filter(
+        self,
+        window: float = 0.2,
+        statistic: Literal["mean", "median"] = "median",
+        fields: Sequence[str] = CPT_CHANNELS,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Smooth the channels with a moving mean or median over a depth window (m), see
+        `sgf_parser.analysis.filters.rolling_filter`.
+
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.analysis.filters import rolling_filter
+
+        return rolling_filter(self, window, statistic, fields)
+
+    def hampel_filter(
+        self,
+        window: float = 0.2,
+        n_sigmas: float = 3.0,
+        fields: Sequence[str] = CPT_CHANNELS,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Detect and replace spikes in the channels with the Hampel filter over a depth window (m), see
+        `sgf_parser.analysis.filters.hampel_filter`.
+
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.analysis.filters import hampel_filter
+
+        return hampel_filter(self, window, n_sigmas, fields)
+
     # "MA": "cone_area_ratio",  # same as header code IE
     # "IE": "cone_area_ratio",  # same as header code MA
     # "MB": "sleeve_area_ratio",  # same as header code IF
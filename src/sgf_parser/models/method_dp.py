@@ -1,11 +1,14 @@
 from decimal import Decimal
-from typing import Literal, Any
+from typing import TYPE_CHECKING, Literal, Any
 
 from pydantic import Field, model_validator, AliasChoices
 
 from sgf_parser.models import MethodData, Method, MethodType
 from sgf_parser.models.types import DPType
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class MethodDPData(MethodData):
     """
@@ -79,3 +82,20 @@ class MethodDP(Method):
                 }[data["HM"]]
 
         return data
+
+    def derived_parameters(
+        self,
+        energy_ratio: float = 1.0,
+        reference_energy_ratio: float = 1.0,
+        subtract_rod_friction: bool = False,
+        rod_friction_factor: float = 0.04,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Compute normalized blow counts and the dynamic point resistance rd/qd, see
+        `sgf_parser.analysis.dp.dp_parameters`.
+
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.analysis.dp import dp_parameters
+
+        return dp_parameters(self, energy_ratio, reference_energy_ratio, subtract_rod_friction, rod_friction_factor)
@@ -38,3 +38,21 @@ class MethodDT(Method):
     depth: Decimal | None = Field(None, alias="IC", description="Depth (m)")
 
     method_data: list[MethodDTData] = []
+
+    def dissipation_parameters(
+        self,
+        u0: float | None = None,
+        water_level: float | None = None,
+        tail_fraction: float = 0.25,
+        root_time: bool = False,
+        root_time_range: tuple[float, float] = (0.3, 0.7),
+    ) -> dict[str, float]:
+        """
+        Compute t50/t90, the initial and the equilibrium pore pressure of the test, see
+        `sgf_parser.analysis.dissipation.dissipation_parameters`.
+
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.analysis.dissipation import dissipation_parameters
+
+        return dissipation_parameters(self, u0, water_level, tail_fraction, root_time, root_time_range)
@@ -4,6 +4,7 @@ from typing import Literal
 from pydantic import Field
 
 from sgf_parser.models import MethodType, MethodData, Method
+from sgf_parser.models.sounding import DrillingParametersMixin
 
 
 class MethodRPData(MethodData):
@@ -26,7 +27,7 @@ class MethodRPData(MethodData):
     torque: Decimal | None = Field(None, alias="V", description="Torque (kNm)")
 
 
-class MethodRP(Method):
+class MethodRP(DrillingParametersMixin, Method):
     """
     Method RP
     """
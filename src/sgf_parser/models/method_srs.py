@@ -4,9 +4,20 @@ from typing import Literal, Any
 from pydantic import computed_field, Field, model_validator, AliasChoices
 
 from sgf_parser.models import MethodType, Method, MethodData
+from sgf_parser.models.method import cached_summary
+from sgf_parser.models.sounding import DrillingParametersMixin, LayerDetectionMixin
 from sgf_parser.models.types import SoundingClass, StopCode, CommentCode
 
 
+# Comment codes marking the top of rock
+_ROCK_CODES = (
+    CommentCode.ROCK_OR_BEDROCK_41,
+    CommentCode.BEDROCK_43,
+    CommentCode.ROCK_LEVEL_80,
+    StopCode.STOP_AGAINST_PRESUMED_ROCK_94,
+)
+
+
 class MethodSRSData(MethodData):
     """
     Soil-Rock-Sounding (Swedish Jord-bergsondering)
@@ -40,7 +51,7 @@ class MethodSRSData(MethodData):
     torque: Decimal | None = Field(None, alias="V", description="Torque (kNm)")
 
 
-class MethodSRS(Method):
+class MethodSRS(LayerDetectionMixin, DrillingParametersMixin, Method):
     """
     Method SRS
     """
@@ -56,27 +67,6 @@ class MethodSRS(Method):
 
     sounding_class: SoundingClass = SoundingClass.JBTOT
 
-    @computed_field
-    def depth_top(self) -> Decimal | None:
-        if not self.method_data:
-            return None
-
-        return min(method_data.depth for method_data in self.method_data)
-
-    @computed_field
-    def depth_base(self) -> Decimal | None:
-        if not self.method_data:
-            return None
-
-        return max(method_data.depth for method_data in self.method_data)
-
-    @computed_field
-    def stopcode(self) -> int | None:
-        if not self.method_data:
-            return None
-
-        return self.method_data[-1].comment_code
-
     @model_validator(mode="before")
     @classmethod
     def set_sounding_class(cls, data: Any) -> Any:
@@ -94,10 +84,8 @@ class MethodSRS(Method):
         return data
 
     @computed_field
+    @cached_summary
     def depth_in_rock(self) -> Decimal | None:
-        _rock_top_depth = None
-        _rock_base_depth = None
-
         if not self.method_data:
             return None
 
@@ -108,31 +96,14 @@ class MethodSRS(Method):
         ):
             return None
 
-        for sample in self.method_data[::-1]:
-            if sample.comment_code == CommentCode.ROCK_END_42:
-                # 42 false positive
-                break
-            elif sample.comment_code in (
-                CommentCode.ROCK_OR_BEDROCK_41,
-                CommentCode.BEDROCK_43,
-                CommentCode.ROCK_LEVEL_80,
-                StopCode.STOP_AGAINST_PRESUMED_ROCK_94,
-            ):
-                _rock_top_depth = sample.depth
-                if _rock_base_depth is None:
-                    _rock_base_depth = sample.depth
-                break
-            elif _rock_base_depth is None:
-                _rock_base_depth = sample.depth
-
-        if _rock_top_depth is None or _rock_base_depth is None:
-            depth_in_rock = None
-        else:
-            depth_in_rock = _rock_base_depth - _rock_top_depth
-
-        return depth_in_rock
+        rock_top = self._rock_top_row(_ROCK_CODES)
+        if rock_top is None:
+            return None
+
+        return self.method_data[-1].depth - self.method_data[rock_top].depth
 
     @computed_field
+    @cached_summary
     def depth_in_soil(self) -> Decimal | None:
         if not self.method_data:
             return None
@@ -140,28 +111,14 @@ class MethodSRS(Method):
         if self.stopcode in (StopCode.INTERRUPTED_WITHOUT_STOP_90, StopCode.CANNOT_DRIVE_FURTHER_91):
             return self.method_data[-1].depth
 
-        _depth_in_soil: Decimal | None = None
-
-        for sample in self.method_data[::-1]:
-            if sample.comment_code == CommentCode.ROCK_END_42:
-                # 42 false positive
-                if _depth_in_soil is None:
-                    _depth_in_soil = sample.depth
-                break
-            elif sample.comment_code in (
-                CommentCode.ROCK_OR_BEDROCK_41,
-                CommentCode.BEDROCK_43,
-                StopCode.STOP_AGAINST_PRESUMED_ROCK_94,
-                CommentCode.ROCK_LEVEL_80,
-            ):
-                _depth_in_soil = sample.depth
-                break
-            elif _depth_in_soil is None:
-                _depth_in_soil = sample.depth
-
-        return _depth_in_soil
+        rock_top = self._rock_top_row(_ROCK_CODES)
+        if rock_top is None:
+            return self.method_data[-1].depth
+
+        return self.method_data[rock_top].depth
 
     @computed_field
+    @cached_summary
     def bedrock_elevation(self) -> Decimal | None:
         # TODO: Unclear how to calculate bedrock elevation.
         #  Is it calculated in the same way as the norwegian total soundings?
@@ -4,9 +4,15 @@ from typing import Literal
 from pydantic import Field, computed_field, AliasChoices
 
 from sgf_parser.models import MethodType, Method, MethodData, StopCode
+from sgf_parser.models.method import cached_summary
+from sgf_parser.models.sounding import DrillingParametersMixin, LayerDetectionMixin
 from sgf_parser.models.types import CommentCode
 
 
+# Comment codes marking the top of rock
+_ROCK_CODES = (CommentCode.ROCK_OR_BEDROCK_41, CommentCode.BEDROCK_43)
+
+
 class MethodTOTData(MethodData):
     """
     Method TOT data
@@ -74,7 +80,7 @@ class MethodTOTData(MethodData):
     torque: Decimal | None = Field(None, alias="V", description="Torque (kNm)")
 
 
-class MethodTOT(Method):
+class MethodTOT(LayerDetectionMixin, DrillingParametersMixin, Method):
     """
     Method TOT
     """
@@ -89,10 +95,8 @@ class MethodTOT(Method):
     method_data: list[MethodTOTData] = []
 
     @computed_field
+    @cached_summary
     def depth_in_rock(self) -> Decimal | None:
-        _rock_top_depth = None
-        _rock_base_depth = None
-
         if not self.method_data:
             return None
 
@@ -102,50 +106,29 @@ class MethodTOT(Method):
         ):
             return None
 
-        for sample in self.method_data[::-1]:
-            if sample.comment_code == CommentCode.ROCK_END_42:
-                # 42 false positive
-                break
-            elif sample.comment_code in (CommentCode.ROCK_OR_BEDROCK_41, CommentCode.BEDROCK_43):
-                _rock_top_depth = sample.depth
-                if _rock_base_depth is None:
-                    _rock_base_depth = sample.depth
-                break
-            elif _rock_base_depth is None:
-                _rock_base_depth = sample.depth
-
-        if _rock_top_depth is None or _rock_base_depth is None:
-            depth_in_rock = None
-        else:
-            depth_in_rock = _rock_base_depth - _rock_top_depth
-
-        return depth_in_rock
+        rock_top = self._rock_top_row(_ROCK_CODES)
+        if rock_top is None:
+            return None
+
+        return self.method_data[-1].depth - self.method_data[rock_top].depth
 
     @computed_field
+    @cached_summary
     def depth_in_soil(self) -> Decimal | None:
-        _depth_in_soil = None
-
         if not self.method_data:
             return None
 
         if self.stopcode in (StopCode.INTERRUPTED_WITHOUT_STOP_90, StopCode.CANNOT_DRIVE_FURTHER_91):
             return self.method_data[-1].depth
 
-        for sample in self.method_data[::-1]:
-            if sample.comment_code == CommentCode.ROCK_END_42:
-                # 42 false positive
-                if _depth_in_soil is None:
-                    _depth_in_soil = sample.depth
-                break
-            elif sample.comment_code in (CommentCode.ROCK_OR_BEDROCK_41, CommentCode.BEDROCK_43):
-                _depth_in_soil = sample.depth
-                break
-            elif _depth_in_soil is None:
-                _depth_in_soil = sample.depth
+        rock_top = self._rock_top_row(_ROCK_CODES)
+        if rock_top is None:
+            return self.method_data[-1].depth
 
-        return _depth_in_soil
+        return self.method_data[rock_top].depth
 
     @computed_field
+    @cached_summary
     def bedrock_elevation(self) -> Decimal | None:
         if self.point_z is None:
             return None
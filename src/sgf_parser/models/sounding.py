@@ -0,0 +1,61 @@
+"""
+Analysis methods shared by the drilling sounding methods (TOT, SRS and RP)
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from sgf_parser.models import Method
+
+# Data fields used for layer detection, by default
+DEFAULT_LAYER_FIELDS = ("penetration_force", "penetration_rate", "torque")
+
+# Drilling parameters and data fields with rolling statistics, by default
+DEFAULT_ROLLING_FIELDS = ("specific_energy", "penetration_rate", "penetration_force")
+
+
+class DrillingParametersMixin:
+    """
+    Drilling parameters of methods with penetration force, penetration rate, rotation rate and torque data fields
+    """
+
+    def drilling_parameters(
+        self: "Method",
+        bit_diameter: float = 0.057,
+        window: float = 0.5,
+        rolling_fields: Sequence[str] = DEFAULT_ROLLING_FIELDS,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Compute drilling parameters (specific energy, normalized penetration resistance and rolling statistics), see
+        `sgf_parser.analysis.drilling.drilling_parameters`.
+
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.analysis.drilling import drilling_parameters
+
+        return drilling_parameters(self, bit_diameter, window, rolling_fields)
+
+
+class LayerDetectionMixin:
+    """
+    Layer detection of soundings with penetration force, penetration rate and torque data fields
+    """
+
+    def detect_layers(
+        self: "Method",
+        fields: Sequence[str] = DEFAULT_LAYER_FIELDS,
+        penalty: float | None = None,
+        min_size: int = 3,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Split the sounding into layers at changes in the given data fields, with depths and statistics per layer, see
+        `sgf_parser.analysis.segmentation.detect_layers`.
+
+        Requires the optional numpy dependency.
+        """
+        from sgf_parser.analysis.segmentation import detect_layers
+
+        return detect_layers(self, fields, penalty, min_size)
@@ -0,0 +1,129 @@
+"""
+Run-length encoded depth intervals of the boolean drilling states (flushing, hammering and increased rotation rate)
+"""
+
+import bisect
+from collections.abc import Iterable, Iterator, Sequence
+from decimal import Decimal
+from typing import Any, Literal, NamedTuple, overload
+
+from sgf_parser.models.depth_index import to_decimal
+
+StateName = Literal["flushing", "hammering", "increased_rotation_rate"]
+
+STATE_NAMES: tuple[StateName, ...] = ("flushing", "hammering", "increased_rotation_rate")
+
+
+class StateInterval(NamedTuple):
+    """
+    A run of consecutive data rows with a state on.
+
+    The interval starts at the depth of the first row with the state on, and ends at the depth of the row where the
+    state is turned off again (or at the last row). The rows of the run are method_data[start:stop].
+    """
+
+    depth_from: Decimal
+    depth_to: Decimal
+    start: int
+    stop: int
+
+    @property
+    def length(self) -> Decimal:
+        return self.depth_to - self.depth_from
+
+
+class StateIntervals(Sequence):
+    """
+    Sorted, non-overlapping depth intervals with a state on
+    """
+
+    __slots__ = ("_depths_from", "_intervals")
+
+    def __init__(self, intervals: Iterable[StateInterval] = ()):
+        self._intervals = tuple(intervals)
+        self._depths_from = [interval.depth_from for interval in self._intervals]
+
+    @classmethod
+    def from_tuples(cls, pairs: Iterable[tuple[Decimal | float | str, Decimal | float | str]]) -> "StateIntervals":
+        """
+        Create from (depth_from, depth_to) pairs, e.g. as stored by `as_tuples`. The row positions are not known, and
+        are set to -1.
+        """
+        return cls(StateInterval(to_decimal(top), to_decimal(base), -1, -1) for top, base in pairs)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    @overload
+    def __getitem__(self, index: int) -> StateInterval: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "StateIntervals": ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return StateIntervals(self._intervals[index])
+
+        return self._intervals[index]
+
+    def __iter__(self) -> Iterator[StateInterval]:
+        return iter(self._intervals)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, StateIntervals):
+            return self.as_tuples() == other.as_tuples()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.as_tuples()}>"
+
+    @property
+    def total_length(self) -> Decimal:
+        """
+        Sum of the lengths (m) of the intervals
+        """
+        return sum((interval.length for interval in self._intervals), Decimal(0))
+
+    def is_active(self, depth: Decimal | float | str) -> bool:
+        """
+        Return True if the state is on at the given depth, i.e. the depth is within one of the intervals
+        """
+        depth = to_decimal(depth)
+        position = bisect.bisect_right(self._depths_from, depth) - 1
+        return position >= 0 and depth <= self._intervals[position].depth_to
+
+    def as_tuples(self) -> list[tuple[Decimal, Decimal]]:
+        """
+        Return the compact form of the intervals, as (depth_from, depth_to) pairs, for storage and export
+        """
+        return [(interval.depth_from, interval.depth_to) for interval in self._intervals]
+
+
+def build_state_intervals(rows: Sequence[Any], names: Sequence[str]) -> dict[str, StateIntervals]:
+    """
+    Run-length encode the given boolean state fields of the data rows, in one pass. Rows without depth are skipped.
+    """
+    runs: dict[str, list[StateInterval]] = {name: [] for name in names}
+    starts: dict[str, int | None] = dict.fromkeys(names)
+    last: int | None = None
+
+    for position, row in enumerate(rows):
+        if row.depth is None:
+            continue
+
+        for name in names:
+            active = bool(getattr(row, name))
+            start = starts[name]
+            if active and start is None:
+                starts[name] = position
+            elif not active and start is not None:
+                runs[name].append(StateInterval(rows[start].depth, row.depth, start, position))
+                starts[name] = None
+
+        last = position
+
+    for name, start in starts.items():
+        if start is not None and last is not None:
+            runs[name].append(StateInterval(rows[start].depth, rows[last].depth, start, last + 1))
+
+    return {name: StateIntervals(intervals) for name, intervals in runs.items()}
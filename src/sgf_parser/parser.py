@@ -1,5 +1,6 @@
 import copy
 import re
+from collections.abc import Iterator
 from typing import TextIO, Any
 
 from sgf_parser.models.method import Method, MethodData
@@ -57,6 +58,26 @@ class Parser:
         The file parameter must be an opened file in text mode (with correct character encoding), pointing at the start
         of the file to parse. The file pointer may not point at the end of the file when this method returns.
         """
+        return list(self._iter_parse(file, load_data=True))
+
+    def iter_parse(self, file: TextIO) -> Iterator[Method]:
+        """
+        Parse the SGF file, yielding each method when all its data rows are parsed.
+
+        The methods are the same as those returned by `parse`, but only one method is kept in memory at a time (unless
+        the caller keeps them). See `parse` for the file parameter.
+        """
+        return self._iter_parse(file, load_data=True)
+
+    def scan_headers(self, file: TextIO) -> list[Method]:
+        """
+        Parse only the method headers of the SGF file, e.g. the coordinates and method types for a spatial index.
+
+        The data rows are skipped without being parsed, so the methods have no data. See `parse` for the file parameter.
+        """
+        return list(self._iter_parse(file, load_data=False))
+
+    def _iter_parse(self, file: TextIO, load_data: bool) -> Iterator[Method]:
 
         blocks = {
             "£": ParseState.METHOD,
@@ -65,7 +86,6 @@ class Parser:
             "€": ParseState.METHOD,
             "#$": ParseState.QUIT,
         }
-        methods: list[Method] = []
         method: Method | None = None
         header: dict[str, Any] = {}
 
@@ -87,14 +107,14 @@ class Parser:
                     # Starting a new data block, while handling data. No new header,
                     # so use the previous method to create a new method of the same type
                     if method:
-                        methods.append(method)
+                        yield method
                     method = copy.copy(method)
                     method.method_data = []
                 elif _new_state in (ParseState.HEADER, ParseState.METHOD) and _old_state == ParseState.DATA:
                     # Finished populating current method, since new method is starting
                     # Store the current method, and empty the current method
                     if method:
-                        methods.append(method)
+                        yield method
                     else:
                         raise Exception("Method is None, that is unexpected")
                     method = None
@@ -107,7 +127,8 @@ class Parser:
                 case ParseState.DATA:
                     if not method:
                         raise ValueError("No method to add data to")
-                    method.method_data.append(self.parse_data(method, row))
+                    if load_data:
+                        method.method_data.append(self.parse_data(method, row))
                 case ParseState.QUIT:
                     break
                 case None:
@@ -115,9 +136,7 @@ class Parser:
 
         if method:
             method.post_processing()
-            methods.append(method)
-
-        return methods
+            yield method
 
     @staticmethod
     def _convert_str_to_dict(line: str) -> dict[str, Any]:
@@ -0,0 +1,19 @@
+from collections.abc import Callable
+from io import StringIO
+
+import pytest
+
+from sgf_parser import Parser, models
+
+
+@pytest.fixture
+def parse_sgf() -> Callable[[str], list[models.Method]]:
+    """
+    Return a function parsing the methods of SGF content, e.g. `[method] = parse_sgf("$\\r\\nHM=7\\r\\n#\\r\\nD=1.0\\r\\n")`
+    """
+
+    def parse(content: str) -> list[models.Method]:
+        with StringIO(content) as file:
+            return Parser().parse(file)
+
+    return parse
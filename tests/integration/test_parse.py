@@ -696,3 +696,25 @@ def test_parse_file_with_text_in_K_code():
         [method] = Parser().parse(file)
 
     assert method
+
+
+@pytest.mark.parametrize("file_name", ("tests/data/cpt-dt-test-1.std", "tests/data/dt-test-2.dpt"))
+def test_scan_headers(file_name):
+    with open(file_name, "r", encoding="windows-1252") as file:
+        methods = Parser().parse(file)
+    with open(file_name, "r", encoding="windows-1252") as file:
+        headers = Parser().scan_headers(file)
+
+    assert [method.method_type for method in headers] == [method.method_type for method in methods]
+    assert [method.point_x for method in headers] == [method.point_x for method in methods]
+    assert all(not method.method_data for method in headers)
+
+
+@pytest.mark.parametrize("file_name", ("tests/data/cpt-dt-test-1.std", "tests/data/tot-test-multiple-codes.tot"))
+def test_iter_parse(file_name):
+    with open(file_name, "r", encoding="windows-1252") as file:
+        methods = Parser().parse(file)
+    with open(file_name, "r", encoding="windows-1252") as file:
+        iterated = list(Parser().iter_parse(file))
+
+    assert [method.model_dump() for method in iterated] == [method.model_dump() for method in methods]
@@ -0,0 +1,81 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.aggregate import aggregate_intervals
+
+
+def sgf(method_code: str, *rows: str) -> str:
+    return f"$\r\nHM={method_code}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+class TestAggregateIntervals:
+    def test_regular_intervals(self, parse_sgf):
+        methods = parse_sgf(
+            sgf("24", "D=0.5,A=1", "D=0.9,A=3", "D=1.0,A=10", "D=1.5,A=20", "D=2.7")
+            + sgf("24")
+            + sgf("24", "D=0.0,A=5,V=0.1", "D=0.3,A=7,V=0.3")
+        )
+
+        result = aggregate_intervals(
+            methods, ["penetration_force", "torque"], statistics=("count", "mean", "std", "min", "max")
+        )
+
+        np.testing.assert_array_equal(result["method"], [0, 0, 0, 2])
+        np.testing.assert_allclose(result["depth_from"], [0, 1, 2, 0])
+        np.testing.assert_allclose(result["depth_to"], [1, 2, 3, 1])
+        np.testing.assert_array_equal(result["penetration_force_count"], [2, 2, 0, 2])
+        np.testing.assert_allclose(result["penetration_force_mean"], [2, 15, np.nan, 6])
+        np.testing.assert_allclose(result["penetration_force_std"], [1, 5, np.nan, 1])
+        np.testing.assert_allclose(result["penetration_force_min"], [1, 10, np.nan, 5])
+        np.testing.assert_allclose(result["penetration_force_max"], [3, 20, np.nan, 7])
+        np.testing.assert_allclose(result["torque_mean"], [np.nan, np.nan, np.nan, 0.2])
+
+    def test_percentiles(self, parse_sgf):
+        [method] = parse_sgf(
+            sgf("7", *(f"D={depth / 10:.1f},QC={value}" for depth, value in enumerate([4, 1, 3, 2, 5])))
+        )
+
+        result = aggregate_intervals([method], ["qc"], interval=1.0, statistics=("p0", "p25", "p50", "p90", "p100"))
+
+        np.testing.assert_allclose(
+            [result[f"qc_{statistic}"][0] for statistic in ("p0", "p25", "p50", "p90", "p100")],
+            np.percentile([4, 1, 3, 2, 5], [0, 25, 50, 90, 100]),
+        )
+
+    def test_interval_edges(self, parse_sgf):
+        [method] = parse_sgf(sgf("7", "D=0.2,QC=1", "D=0.3,QC=2", "D=2.0,QC=3", "D=5.0,QC=4", "D=6.0,QC=5"))
+
+        result = aggregate_intervals([method], ["qc"], interval=[0.3, 2.0, 5.0], statistics=("mean",))
+
+        np.testing.assert_allclose(result["depth_from"], [0.3, 2.0])
+        np.testing.assert_allclose(result["depth_to"], [2.0, 5.0])
+        np.testing.assert_allclose(result["qc_mean"], [2, 3.5])
+
+    def test_interval_boundaries(self, parse_sgf):
+        [method] = parse_sgf(sgf("7", *(f"D={depth / 10:.1f},QC={depth}" for depth in range(10))))
+
+        result = aggregate_intervals([method], ["qc"], interval=0.3, statistics=("count",))
+
+        np.testing.assert_array_equal(result["qc_count"], [3, 3, 3, 1])
+
+    def test_empty(self, parse_sgf):
+        result = aggregate_intervals(parse_sgf(sgf("7")), ["qc"], statistics=("mean",))
+
+        assert {name: len(values) for name, values in result.items()} == {
+            "method": 0,
+            "depth_from": 0,
+            "depth_to": 0,
+            "qc_mean": 0,
+        }
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"statistics": ("median",)}, {"statistics": ("p101",)}, {"interval": 0}, {"interval": [1.0, 0.5]}],
+    )
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            aggregate_intervals([], ["qc"], **kwargs)
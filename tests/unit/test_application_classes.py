@@ -0,0 +1,56 @@
+import itertools
+from decimal import Decimal
+
+import pytest
+
+from sgf_parser.models.application_class import ApplicationClassThresholds, ZeroValueLimit
+from sgf_parser.models.types import ApplicationClass
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from test_cpt_application_class import build_test_string
+
+from sgf_parser.analysis import application_classes
+
+
+class TestApplicationClasses:
+    def test_batch_equals_method_classification(self, parse_sgf):
+        methods = []
+        for values in itertools.product(
+            (0.02, 0.05, 0.06), (0.035, 0.5, 0.501), (5, 15), (10, 25, 50), (5, 5.1), (10, 15, 20), (2, 3, 5)
+        ):
+            methods += parse_sgf(build_test_string(*values))
+
+        result = application_classes(methods)
+
+        expected = [
+            (
+                method.application_class_depth,
+                method.application_class_resistance,
+                method.application_class_friction,
+                method.application_class_pressure,
+                method.application_class,
+            )
+            for method in methods
+        ]
+        np.testing.assert_array_equal(
+            np.column_stack(
+                [result[key] for key in ("depth", "resistance", "friction", "pressure", "application_class")]
+            ),
+            expected,
+        )
+
+    def test_custom_thresholds(self, parse_sgf):
+        [method] = parse_sgf(build_test_string(0.02, 0.035, 5, 10, 5, 10, 2))
+        assert method.application_class == ApplicationClass.ONE
+
+        thresholds = ApplicationClassThresholds(
+            friction=(ZeroValueLimit(Decimal(1), Decimal("0.01"), ApplicationClass.TWO),),
+        )
+        result = application_classes([method], thresholds, assign=True)
+
+        assert result["friction"][0] == ApplicationClass.OUT_OF_BOUNDS
+        assert method.application_class_friction == ApplicationClass.OUT_OF_BOUNDS
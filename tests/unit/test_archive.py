@@ -0,0 +1,78 @@
+import glob
+import io
+import struct
+from decimal import Decimal
+
+import pytest
+
+from sgf_parser import Parser, archive, models
+
+
+def exact(methods: list[models.Method]) -> list[str]:
+    """The methods, with the exact representation of all values (e.g. the exponents of Decimals)"""
+    return [repr(sorted(method.model_dump().items())) for method in methods]
+
+
+class TestArchive:
+    @pytest.mark.parametrize("file_name", sorted(glob.glob("tests/data/*-test-[0-9].*")))
+    def test_round_trip(self, file_name):
+        with open(file_name, "r", encoding="windows-1252") as file:
+            methods = Parser().parse(file)
+
+        loaded = archive.loads(archive.dumps(methods))
+
+        assert exact(loaded) == exact(methods)
+        for method, loaded_method in zip(methods, loaded):
+            assert type(loaded_method) is type(method)
+            assert loaded_method.depth_base == method.depth_base
+            assert loaded_method.stopcode == method.stopcode
+            assert [row.model_fields_set for row in loaded_method.method_data] == [
+                row.model_fields_set for row in method.method_data
+            ]
+            assert [row.model_dump(exclude_unset=True) for row in loaded_method.method_data] == [
+                row.model_dump(exclude_unset=True) for row in method.method_data
+            ]
+
+    def test_values(self, parse_sgf):
+        [method] = parse_sgf(
+            "$\r\nHM=7,HK=P1,HX=1.5\r\n#\r\nD=1.000,QC=1.5,K=91\r\nD=1.02,T=Remark\r\nD=1.040,QC=-0.25,AR=1\r\n"
+        )
+
+        [loaded] = archive.loads(archive.dumps([method]))
+
+        assert [str(row.depth) for row in loaded.method_data] == ["1.000", "1.02", "1.040"]
+        assert [row.qc for row in loaded.method_data] == [Decimal("1.5"), None, Decimal("-0.25")]
+        assert [row.comment_code for row in loaded.method_data] == [91, None, None]
+        assert [row.remarks for row in loaded.method_data] == [None, "Remark", None]
+        assert loaded.method_type == models.MethodType.CPT
+        assert loaded.point_x == 1.5
+
+    def test_unusual_decimals(self, parse_sgf):
+        [method] = parse_sgf("$\r\nHM=7\r\n#\r\nD=1.0\r\nD=2.0\r\n")
+        method.method_data[0].qc = Decimal("1E+200")
+        method.method_data[1].qc = Decimal("-0.0")
+
+        [loaded] = archive.loads(archive.dumps([method]))
+
+        assert [str(row.qc) for row in loaded.method_data] == ["1E+200", "-0.0"]
+
+    def test_stream(self, parse_sgf):
+        methods = parse_sgf("$\r\nHM=7\r\n#\r\nD=1.0\r\n$\r\nHM=24\r\n#\r\n$\r\nHM=7\r\n#\r\nD=2.0\r\n")
+
+        with io.BytesIO() as file:
+            assert archive.dump(iter(methods), file) == 3
+            file.seek(0)
+            loaded = archive.iter_load(file)
+
+            assert exact([next(loaded)]) == exact(methods[:1])
+            assert exact(list(loaded)) == exact(methods[1:])
+
+    def test_invalid(self, parse_sgf):
+        data = archive.dumps(parse_sgf("$\r\nHM=7\r\n#\r\nD=1.0\r\n"))
+
+        with pytest.raises(ValueError, match="Not an SGF archive"):
+            archive.loads(b"$\r\nHM=7\r\n")
+        with pytest.raises(ValueError, match="version"):
+            archive.loads(archive.MAGIC + struct.pack("<H", archive.VERSION + 1) + data[len(archive.MAGIC) + 2 :])
+        with pytest.raises(ValueError, match="Truncated"):
+            archive.loads(data[:-1])
@@ -0,0 +1,113 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis import bedrock
+from sgf_parser.analysis.bedrock import bedrock_grid, bedrock_points
+
+
+def tot(x: float, y: float, z: float, depth: float, stop_code: int, method_code: int = 24) -> str:
+    return f"$\r\nHM={method_code},HX={x},HY={y},HZ={z}\r\n#\r\nD=0.0\r\nD={depth},K={stop_code}\r\n"
+
+
+class TestBedrock:
+    def test_points(self, parse_sgf):
+        methods = parse_sgf(
+            tot(0, 0, 100, 5, 93) + tot(10, 0, 100, 8, 90) + tot(20, 0, 100, 8, 92) + tot(30, 0, 100, 4, 94)
+        )
+
+        used, points = bedrock_points(methods)
+
+        assert used == [methods[0], methods[1], methods[3]]
+        np.testing.assert_allclose(points["x"], [0, 10, 30])
+        np.testing.assert_allclose(points["elevation"], [95, 92, 96])
+        assert points["upper_bound"].tolist() == [False, True, False]
+
+    def test_points_of_rock_soundings_only(self, parse_sgf):
+        # A CPT stopped at 90 or 91 has not searched for rock, so it is no bound on the bedrock
+        [cpt] = parse_sgf(tot(0, 0, 100, 5, 90, method_code=7))
+        [srs] = parse_sgf(tot(10, 0, 100, 8, 91, method_code=12))
+
+        used, points = bedrock_points([cpt, srs])
+
+        assert cpt.stopcode == 90
+        assert used == [srs]
+        assert points["upper_bound"].tolist() == [True]
+
+    def test_grid(self, parse_sgf):
+        methods = parse_sgf(tot(0, 0, 100, 10, 93) + tot(10, 0, 100, 20, 93) + tot(0, 10, 110, 10, 93))
+
+        result = bedrock_grid(methods, cell_size=5)
+
+        np.testing.assert_allclose(result["x"], [0, 5, 10])
+        np.testing.assert_allclose(result["y"], [0, 5, 10])
+        assert result["elevation"].shape == (3, 3)
+        assert result["elevation"][0, 0] == 90
+        assert result["elevation"][0, 2] == 80
+        assert result["elevation"][2, 0] == 100
+        # Halfway between the two soundings at y = 0, the third sounding is farther away
+        assert 80 < result["elevation"][0, 1] < 90
+
+    def test_upper_bound(self, parse_sgf):
+        reached = parse_sgf(tot(0, 0, 100, 10, 93) + tot(20, 0, 100, 10, 93))
+        [not_reached] = parse_sgf(tot(10, 0, 100, 15, 91))
+
+        without_bound = bedrock_grid(reached, cell_size=10)
+        with_bound = bedrock_grid([*reached, not_reached], cell_size=10)
+
+        assert without_bound["elevation"][0, 1] == 90
+        # Bedrock is below the end of the sounding that did not reach rock
+        assert with_bound["elevation"][0, 1] == 85
+
+    def test_bound_already_honoured(self, parse_sgf):
+        reached = parse_sgf(tot(0, 0, 100, 10, 93) + tot(20, 0, 100, 10, 93))
+        [not_reached] = parse_sgf(tot(10, 0, 100, 5, 90))
+
+        result = bedrock_grid([*reached, not_reached], cell_size=10)
+
+        np.testing.assert_allclose(result["elevation"], [[90, 90, 90]])
+
+    def test_max_distance_and_chunks(self, parse_sgf, monkeypatch):
+        rng = np.random.default_rng(1)
+        methods = parse_sgf("".join(tot(x, y, 100, depth, 93) for x, y, depth in rng.uniform(0, 100, (40, 3))))
+        expected = bedrock_grid(methods, cell_size=2, max_neighbours=5, max_distance=30, bounds=(0, 0, 100, 100))
+
+        monkeypatch.setattr(bedrock, "_MAX_CHUNK_ELEMENTS", 100)
+        result = bedrock_grid(methods, cell_size=2, max_neighbours=5, max_distance=30, bounds=(-50, 0, 100, 100))
+
+        np.testing.assert_allclose(result["elevation"][:, 25:], expected["elevation"])
+        # Nodes farther than max_distance from all soundings
+        assert np.isnan(result["elevation"][:, 0]).all()
+
+    def test_nearest_neighbours(self, parse_sgf, monkeypatch):
+        rng = np.random.default_rng(2)
+        methods = parse_sgf("".join(tot(x, y, 100, depth, 93) for x, y, depth in rng.uniform(0, 500, (500, 3))))
+        compared = []
+        idw_candidates = bedrock._idw_candidates
+
+        def record(index, values, candidates, *args):
+            compared.append(len(candidates))
+            return idw_candidates(index, values, candidates, *args)
+
+        monkeypatch.setattr(bedrock, "_idw_candidates", record)
+        result = bedrock_grid(methods, cell_size=10, max_neighbours=5)
+
+        # Inverse distance weighting of the 5 nearest soundings, compared with all soundings
+        _, points = bedrock_points(methods)
+        node_x, node_y = np.meshgrid(result["x"], result["y"])
+        distance = np.hypot(node_x.ravel()[:, None] - points["x"], node_y.ravel()[:, None] - points["y"])
+        nearest = np.argsort(distance, axis=1)[:, :5]
+        weight = np.take_along_axis(distance, nearest, axis=1) ** -2.0
+        expected = (weight * points["elevation"][nearest]).sum(axis=1) / weight.sum(axis=1)
+        np.testing.assert_allclose(result["elevation"].ravel(), expected)
+        # Only the soundings near each tile of grid nodes are compared
+        assert max(compared) < len(methods) / 4
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            bedrock_grid([], cell_size=1)
+        with pytest.raises(ValueError):
+            bedrock_grid([], cell_size=0, bounds=(0, 0, 1, 1))
@@ -0,0 +1,333 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from sgf_parser import Parser
+from sgf_parser import catalog as catalog_module
+from sgf_parser.catalog import SCHEMA_VERSION, Catalog, CatalogUpdate, data_table, hash_file, load_methods
+from sgf_parser.models import MethodType, StopCode
+
+DATA = Path(__file__).parent.parent / "data"
+
+CPT = "$\r\nHM=7,HK=Borehole 1,HX=10.5,HY=20.5\r\n#\r\nD=1.0,QC=1\r\nD=1.1,QC=2\r\n"
+
+
+def methods(catalog: Catalog) -> list[tuple]:
+    return catalog.connection.execute(
+        "SELECT files.path, position, method_type, borehole_name, point_x, point_y, depth_top, depth_base, row_count "
+        "FROM methods JOIN files ON files.id = methods.file_id ORDER BY files.path, position"
+    ).fetchall()
+
+
+@pytest.fixture
+def folder(tmp_path) -> Path:
+    (tmp_path / "cpt.cpt").write_text(CPT)
+    shutil.copy(DATA / "cpt-dt-test-1.std", tmp_path)
+    (tmp_path / "sub").mkdir()
+    shutil.copy(DATA / "tot-test-1.tot", tmp_path / "sub")
+    return tmp_path
+
+
+class TestCatalog:
+    def test_add(self, folder):
+        with Catalog() as catalog:
+            result = catalog.update([folder])
+
+            assert result == CatalogUpdate(added=3)
+            rows = methods(catalog)
+            assert (str(folder / "cpt.cpt"), 0, "CPT", "Borehole 1", 10.5, 20.5, 1.0, 1.1, 2) in rows
+            assert {row[2] for row in rows} == {"CPT", "DT", "TOT"}
+
+    def test_overlapping_paths(self, folder):
+        with Catalog() as catalog:
+            # The file is also in the directory, and its directory is given twice
+            result = catalog.update([folder, folder / "cpt.cpt", folder / "sub", folder / ".." / folder.name])
+
+            assert result == CatalogUpdate(added=3)
+            assert catalog.connection.execute("SELECT count(*) FROM files").fetchone() == (3,)
+
+    def test_sgf_suffixes(self, folder):
+        (folder / "README.md").write_text("# Soundings")
+        (folder / "sub" / "photo.png").write_bytes(b"\x89PNG")
+        shutil.copy(DATA / "tot-test-9.TOT", folder / "sub")
+        (folder / "other.txt").write_text(CPT)
+
+        with Catalog() as catalog:
+            # Files in directories need an SGF suffix (in any case), files given directly do not
+            assert catalog.update([folder]) == CatalogUpdate(added=4)
+            assert catalog.update([folder / "other.txt"]) == CatalogUpdate(added=1)
+            assert catalog.update([folder], suffixes={".cpt"}) == CatalogUpdate(unchanged=1)
+
+    def test_incremental_update(self, folder):
+        with Catalog() as catalog:
+            catalog.update([folder])
+            before = methods(catalog)
+
+            assert catalog.update([folder]) == CatalogUpdate(unchanged=3)
+
+            # Same content with a new modification time is not parsed again
+            path = folder / "cpt.cpt"
+            stat = path.stat()
+            os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+            assert catalog.update([folder]) == CatalogUpdate(unchanged=3)
+            assert catalog.update([folder]) == CatalogUpdate(unchanged=3)
+
+            path.write_text(CPT + "D=1.2,QC=3\r\n")
+            assert catalog.update([folder]) == CatalogUpdate(updated=1, unchanged=2)
+            after = methods(catalog)
+            assert len(after) == len(before)
+            assert (str(path), 0, "CPT", "Borehole 1", 10.5, 20.5, 1.0, 1.2, 3) in after
+
+    def test_prune(self, folder):
+        with Catalog() as catalog:
+            catalog.update([folder])
+            (folder / "cpt.cpt").unlink()
+
+            assert catalog.update([folder]) == CatalogUpdate(unchanged=2)
+            assert catalog.update([folder], prune=True) == CatalogUpdate(unchanged=2, removed=1)
+            assert all(row[0] != str(folder / "cpt.cpt") for row in methods(catalog))
+
+    def test_failed(self, tmp_path):
+        path = tmp_path / "malformed.cpt"
+        shutil.copy(DATA / "cpt-test-wrong-type.cpt", path)
+
+        with Catalog() as catalog:
+            assert catalog.update([path]) == CatalogUpdate(added=1, failed=1)
+            [(error,)] = catalog.connection.execute("SELECT error FROM files").fetchall()
+            assert error
+            assert methods(catalog) == []
+
+    def test_batch_size(self, folder):
+        with Catalog() as batched, Catalog() as catalog:
+            # Written in bulk across files, or after each row
+            assert catalog.update([folder], load_data=True) == CatalogUpdate(added=3)
+            assert batched.update([folder], load_data=True, batch_size=1) == CatalogUpdate(added=3)
+
+            assert methods(batched) == methods(catalog)
+            for method_type in ("CPT", "DT", "TOT"):
+                sql = f"SELECT * FROM {data_table(method_type)} ORDER BY method_id, position"
+                assert batched.connection.execute(sql).fetchall() == catalog.connection.execute(sql).fetchall()
+
+    def test_database_file(self, folder, tmp_path):
+        database = tmp_path / "catalog.sqlite"
+        with Catalog(database) as catalog:
+            catalog.update([folder / "cpt.cpt"])
+
+        with Catalog(database) as catalog:
+            assert catalog.update([folder / "cpt.cpt"]) == CatalogUpdate(unchanged=1)
+            assert len(methods(catalog)) == 1
+
+    def test_old_schema(self, folder, tmp_path):
+        database = tmp_path / "catalog.sqlite"
+        with sqlite3.connect(database) as connection:
+            # A catalog without schema version, from before the data rows were loaded
+            connection.execute("CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE)")
+            connection.execute("INSERT INTO files (path) VALUES ('old.cpt')")
+        connection.close()
+
+        with Catalog(database) as catalog:
+            assert catalog.connection.execute("PRAGMA user_version").fetchone() == (SCHEMA_VERSION,)
+            assert catalog.connection.execute("SELECT count(*) FROM files").fetchone() == (0,)
+            assert catalog.update([folder / "cpt.cpt"], load_data=True) == CatalogUpdate(added=1)
+
+        with Catalog(database) as catalog:
+            assert catalog.update([folder / "cpt.cpt"], load_data=True) == CatalogUpdate(unchanged=1)
+
+    def test_newer_schema(self, tmp_path):
+        database = tmp_path / "catalog.sqlite"
+        with sqlite3.connect(database) as connection:
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        connection.close()
+
+        with pytest.raises(ValueError, match="schema version"):
+            Catalog(database)
+
+    @pytest.mark.parametrize(
+        "content, encoding",
+        [
+            ("HK=Å".encode(), "utf-8"),
+            ("HK=Å".encode("windows-1252"), "windows-1252"),
+            # Incomplete UTF-8 sequence at the end of the file
+            (b"HK=\xc3", "windows-1252"),
+        ],
+    )
+    def test_hash_file(self, tmp_path, monkeypatch, content, encoding):
+        path = tmp_path / "file.cpt"
+        path.write_bytes(content)
+        # The UTF-8 sequence of Å is split across chunks
+        monkeypatch.setattr(catalog_module, "_CHUNK_SIZE", 4)
+
+        assert hash_file(path) == (hashlib.sha256(content).hexdigest(), encoding)
+        assert hash_file(path, "latin-1") == (hashlib.sha256(content).hexdigest(), "latin-1")
+
+
+def sgf(method_code: str, name: str, x: float, y: float, date: str, depth: float, stop_code: int = 93) -> str:
+    return (
+        f"$\r\nHM={method_code},HK={name},HX={x},HY={y},HD={date}\r\n#\r\n"
+        f"D=0.0,A=1\r\nD={depth},A=2\r\nD={depth},K={stop_code}\r\n"
+    )
+
+
+@pytest.fixture
+def catalog(tmp_path) -> Catalog:
+    (tmp_path / "a.tot").write_text(
+        sgf("24", "P1", 0, 0, "01.06.2023", 25) + sgf("24", "P2", 50, 50, "01.06.2022", 15, 91)
+    )
+    (tmp_path / "b.cpt").write_text(sgf("7", "P1", 0, 0, "02.06.2023", 22) + sgf("7", "P3", 500, 0, "03.06.2023", 30))
+    with Catalog() as catalog:
+        catalog.update([tmp_path])
+        yield catalog
+
+
+class TestQuery:
+    def test_all(self, catalog):
+        handles = catalog.query()
+
+        assert [(Path(handle.path).name, handle.position) for handle in handles] == [
+            ("a.tot", 0),
+            ("a.tot", 1),
+            ("b.cpt", 0),
+            ("b.cpt", 1),
+        ]
+        assert handles[0].method_type == MethodType.TOT
+        assert handles[0].conducted_at == datetime(2023, 6, 1)
+        assert handles[1].stopcode == StopCode.CANNOT_DRIVE_FURTHER_91
+
+    def test_filters(self, catalog):
+        def names(**filters):
+            return [(handle.method_type, handle.borehole_name) for handle in catalog.query(**filters)]
+
+        assert names(method_type=MethodType.CPT) == [("CPT", "P1"), ("CPT", "P3")]
+        assert names(method_type=[MethodType.CPT, MethodType.TOT], borehole_name="P2") == [("TOT", "P2")]
+        assert names(method_code="24") == [("TOT", "P1"), ("TOT", "P2")]
+        assert names(conducted_from=datetime(2023, 1, 1), conducted_to=datetime(2023, 6, 3)) == [
+            ("TOT", "P1"),
+            ("CPT", "P1"),
+        ]
+        assert names(min_depth=20, max_depth=25) == [("TOT", "P1"), ("CPT", "P1")]
+        assert names(stopcode=StopCode.CANNOT_DRIVE_FURTHER_91) == [("TOT", "P2")]
+        assert names(bbox=(0, 0, 100, 100), method_type=MethodType.CPT) == [("CPT", "P1")]
+        assert names(limit=1) == [("TOT", "P1")]
+
+    def test_application_class(self, catalog):
+        [first, second] = catalog.query(method_type=MethodType.CPT)
+
+        assert first.application_class is not None
+        result = catalog.query(application_class=first.application_class)
+        assert [handle.id for handle in result] == [first.id, second.id]
+        assert catalog.query(application_class=[]) == []
+
+    @pytest.mark.parametrize("column", ["stopcode", "application_class"])
+    def test_indexed(self, catalog, column):
+        plan = catalog.connection.execute(f"EXPLAIN QUERY PLAN SELECT id FROM methods WHERE {column} = 1").fetchall()
+
+        assert f"INDEX methods_{column} " in plan[0][3]
+
+    def test_load(self, catalog):
+        [handle] = catalog.query(borehole_name="P3")
+
+        method = handle.load()
+
+        assert method.method_type == MethodType.CPT
+        assert method.borehole_name == "P3"
+        assert len(method.method_data) == 3
+        assert handle.load() is method
+
+    def test_load_methods(self, catalog):
+        handles = catalog.query(borehole_name="P1")
+
+        methods = load_methods(handles)
+
+        assert [method.method_type for method in methods] == [MethodType.TOT, MethodType.CPT]
+        assert all(method.depth_base is not None for method in methods)
+
+    def test_load_changed_file(self, catalog):
+        [handle] = catalog.query(borehole_name="P3")
+        with open(handle.path, "a") as file:
+            file.write("D=31.0,QC=1\r\n")
+
+        with pytest.raises(ValueError):
+            handle.load()
+
+
+class TestLoadData:
+    def test_schema(self):
+        with Catalog() as catalog:
+            columns = {
+                name: column_type
+                for _, name, column_type, *_ in catalog.connection.execute(f"PRAGMA table_info({data_table('TOT')})")
+            }
+
+        assert columns["method_id"] == "INTEGER"
+        assert columns["depth"] == "REAL"
+        assert columns["comment_code"] == "INTEGER"
+        assert columns["flushing"] == "INTEGER"
+        assert columns["remarks"] == "TEXT"
+
+    def test_rows(self, folder):
+        path = folder / "cpt-dt-test-1.std"
+        with open(path, encoding="windows-1252") as file:
+            methods = Parser().parse(file)
+
+        with Catalog() as catalog:
+            assert catalog.update([path], load_data=True) == CatalogUpdate(added=1)
+
+            for position, method in enumerate(methods):
+                [(method_id,)] = catalog.connection.execute(
+                    "SELECT id FROM methods WHERE position = ?", (position,)
+                ).fetchall()
+                rows = catalog.connection.execute(
+                    f"SELECT position, depth, comment_code FROM {data_table(method.method_type)} WHERE method_id = ? "
+                    "ORDER BY position",
+                    (method_id,),
+                ).fetchall()
+                expected = [
+                    (i, None if row.depth is None else float(row.depth), row.comment_code)
+                    for i, row in enumerate(method.method_data)
+                ]
+                assert rows == expected
+
+    def test_incremental(self, folder):
+        path = folder / "cpt.cpt"
+        with Catalog() as catalog:
+            catalog.update([path])
+            assert catalog.connection.execute(f"SELECT count(*) FROM {data_table('CPT')}").fetchone() == (0,)
+
+            # Files cataloged without data rows are parsed again
+            assert catalog.update([path], load_data=True) == CatalogUpdate(updated=1)
+            assert catalog.update([path], load_data=True) == CatalogUpdate(unchanged=1)
+            assert catalog.connection.execute(f"SELECT qc FROM {data_table('CPT')}").fetchall() == [(1.0,), (2.0,)]
+
+            # The rows of the previous version are deleted
+            path.write_text(CPT + "D=1.2,QC=3\r\n")
+            assert catalog.update([path], load_data=True) == CatalogUpdate(updated=1)
+            rows = catalog.connection.execute(f"SELECT qc FROM {data_table('CPT')}").fetchall()
+            assert rows == [(1.0,), (2.0,), (3.0,)]
+
+    def test_failed_rolled_back(self, tmp_path):
+        path = tmp_path / "partly-malformed.cpt"
+        path.write_text(CPT + "$\r\nHM=999\r\n#\r\nD=1.0\r\n")
+
+        with Catalog() as catalog:
+            assert catalog.update([path], load_data=True) == CatalogUpdate(added=1, failed=1)
+            assert methods(catalog) == []
+            assert catalog.connection.execute(f"SELECT count(*) FROM {data_table('CPT')}").fetchone() == (0,)
+
+    def test_failed_after_flush(self, folder):
+        path = folder / "partly-malformed.cpt"
+        path.write_text(CPT + "$\r\nHM=999\r\n#\r\nD=1.0\r\n")
+
+        with Catalog() as catalog:
+            # The rows of the first method are already written when the second method fails
+            result = catalog.update([folder / "cpt.cpt", path], load_data=True, batch_size=1)
+
+            assert result == CatalogUpdate(added=2, failed=1)
+            assert [row[0] for row in methods(catalog)] == [str(folder / "cpt.cpt")]
+            assert catalog.connection.execute(f"SELECT count(*) FROM {data_table('CPT')}").fetchone() == (2,)
+            errors = catalog.connection.execute("SELECT path, error IS NOT NULL FROM files ORDER BY path").fetchall()
+            assert errors == [(str(folder / "cpt.cpt"), 0), (str(path), 1)]
@@ -0,0 +1,61 @@
+import pytest
+
+from sgf_parser import models
+
+ROWS = (
+    "B=1",
+    "K=72,T=Spyling begynner",
+    "B=1",
+    "K=41, 74",
+    "K=92",
+    "B=1",
+    "K=92,T=Stein",
+    "K=73",
+    "K=93",
+)
+
+
+@pytest.fixture
+def method(parse_sgf) -> models.MethodTOT:
+    [method] = parse_sgf("$\r\nHM=24,HZ=40.5\r\n#\r\n" + "".join(f"D={i}.0,{row}\r\n" for i, row in enumerate(ROWS)))
+    return method
+
+
+class TestCodeIndex:
+    def test_code_index(self, method):
+        assert method.code_index == {72: (1,), 41: (3,), 74: (3,), 92: (4, 6), 73: (7,), 93: (8,)}
+
+    @pytest.mark.parametrize(
+        "codes, include_remarks, expected",
+        [
+            ((92,), True, (4, 6)),
+            ((74,), True, (3,)),
+            ((74,), False, ()),
+            ((72, 73, 74, 75), True, (1, 3, 7)),
+            ((72, 73, 74, 75), False, (1, 7)),
+            ((99,), True, ()),
+        ],
+    )
+    def test_rows_with_code(self, method, codes, include_remarks, expected):
+        assert method.rows_with_code(*codes, include_remarks=include_remarks) == expected
+
+    @pytest.mark.parametrize(
+        "codes, include_remarks, expected",
+        [
+            ((41, 43), True, 3),
+            ((92,), True, 6),
+            ((72, 74), True, 3),
+            ((72, 74), False, 1),
+            ((42,), True, None),
+        ],
+    )
+    def test_last_row_with_code(self, method, codes, include_remarks, expected):
+        assert method.last_row_with_code(*codes, include_remarks=include_remarks) == expected
+
+    def test_index_follows_method_data(self, method):
+        assert method.last_row_with_code(94) is None
+
+        method.method_data.append(models.MethodTOTData(D="9.0", K="94"))
+
+        assert method.last_row_with_code(94) == 9
+        assert method.stopcode == 94
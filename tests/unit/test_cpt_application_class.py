@@ -1,8 +1,10 @@
+from decimal import Decimal
 from io import StringIO
 
 import pytest
 
 from sgf_parser import Parser
+from sgf_parser.models.application_class import ApplicationClassThresholds, ZeroValueLimit
 from sgf_parser.models.types import ApplicationClass
 
 
@@ -140,3 +142,18 @@ class TestCPTApplicationClass:
             [method] = Parser().parse(file)
 
         assert method.application_class == expected_application_class
+
+    def test_custom_thresholds(self):
+        with StringIO(build_test_string(0.02, 0.035, 5, 10, 5, 10, 2)) as file:
+            [method] = Parser().parse(file)
+        assert method.application_class == ApplicationClass.ONE
+
+        thresholds = ApplicationClassThresholds(
+            friction=(ZeroValueLimit(Decimal(1), Decimal("0.01"), ApplicationClass.TWO),),
+        )
+        method.classify(thresholds)
+        assert method.application_class_friction == ApplicationClass.OUT_OF_BOUNDS
+        assert method.application_class == ApplicationClass.OUT_OF_BOUNDS
+
+        method.classify()
+        assert method.application_class == ApplicationClass.ONE
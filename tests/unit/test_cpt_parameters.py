@@ -0,0 +1,71 @@
+import pytest
+
+from sgf_parser import Parser
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.cpt import cpt_parameters_batch
+
+
+def cpt(header: str, *rows: str) -> str:
+    return f"$\r\nHM=7,{header}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+class TestCPTParameters:
+    def test_parameters(self, parse_sgf):
+        [method] = parse_sgf(cpt("MA=0.8,HG=1.0,HO=1.0", "D=0.5,QC=1.0,FS=10,U=0", "D=2.0,QC=2.0,FS=20,U=100"))
+
+        result = method.derived_parameters(unit_weight=20.0)
+
+        np.testing.assert_allclose(result["depth"], [0.5, 2.0])
+        # Above the predrilling depth the derived values are undefined
+        assert np.isnan(result["qt"][0])
+        assert np.isnan(result["ic"][0])
+
+        u0 = 9.81
+        sigma_v0 = 40.0
+        qt = 2000 + 100 * 0.2
+        assert result["u0"][1] == pytest.approx(u0)
+        assert result["sigma_v0"][1] == pytest.approx(sigma_v0)
+        assert result["sigma_v0_eff"][1] == pytest.approx(sigma_v0 - u0)
+        assert result["qt"][1] == pytest.approx(qt / 1000)
+        assert result["qn"][1] == pytest.approx((qt - sigma_v0) / 1000)
+        assert result["rf"][1] == pytest.approx(20 / qt * 100)
+        assert result["bq"][1] == pytest.approx((100 - u0) / (qt - sigma_v0))
+        assert result["fr"][1] == pytest.approx(20 / (qt - sigma_v0) * 100)
+
+        # The stress exponent and Ic must be consistent with each other
+        pa = 101.325
+        n = result["n"][1]
+        qtn = (qt - sigma_v0) / pa * (pa / (sigma_v0 - u0)) ** n
+        ic = np.sqrt((3.47 - np.log10(qtn)) ** 2 + (np.log10(result["fr"][1]) + 1.22) ** 2)
+        assert result["qtn"][1] == pytest.approx(qtn)
+        assert result["ic"][1] == pytest.approx(ic)
+        assert n == pytest.approx(min(1.0, 0.381 * ic + 0.05 * (sigma_v0 - u0) / pa - 0.15), abs=1e-3)
+
+    def test_without_cone_area_ratio_or_pore_pressure(self, parse_sgf):
+        [method] = parse_sgf(cpt("HJ=1", "D=1.0,QC=2.0,FS=20,U=100", "D=1.1,QC=2.0,FS=20"))
+
+        result = method.derived_parameters()
+
+        np.testing.assert_allclose(result["qt"], [2.0, 2.0])
+        assert np.isnan(result["bq"][1])
+
+    def test_batch_equals_single(self, parse_sgf):
+        with open("tests/data/cpt-test-1.cpt", encoding="windows-1252") as file:
+            methods = Parser().parse(file)
+        with open("tests/data/cpt-test-2.cpt", encoding="windows-1252") as file:
+            methods += Parser().parse(file)
+        methods += parse_sgf(cpt("MA=0.8,HG=1.0", "D=1.0,QC=1.0,FS=10,U=30"))
+
+        batch = cpt_parameters_batch(methods)
+
+        assert len(batch) == len(methods)
+        for method, result in zip(methods, batch):
+            single = method.derived_parameters()
+            assert len(result["ic"]) == len(method.method_data)
+            for name in single:
+                np.testing.assert_allclose(result[name], single[name], rtol=1e-6)
@@ -0,0 +1,66 @@
+import csv
+
+import pytest
+
+from sgf_parser import models
+from sgf_parser.export.csv import CsvWriter, export_csv
+
+
+@pytest.fixture
+def methods(parse_sgf) -> list[models.Method]:
+    content = (
+        "$\r\nHM=7,HK=P1,HX=10.5,HY=20.25\r\n#\r\nD=1.000,QC=1.5\r\nD=1.020,T=A remark, with a comma\r\n"
+        "$\r\nHM=24,HK=P2,HD=01.06.2023\r\n#\r\nD=0.0,A=1,AR=1\r\nD=2.0,A=2,K=93\r\n"
+        "$\r\nHM=7,HK=P3\r\n#\r\nD=0.5,QC=3\r\n"
+    )
+    return parse_sgf(content)
+
+
+def read(path) -> list[dict[str, str]]:
+    with open(path, encoding="utf-8", newline="") as file:
+        return list(csv.DictReader(file))
+
+
+class TestCsvExport:
+    def test_files(self, methods, tmp_path):
+        assert export_csv(methods, tmp_path) == 3
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["cpt.csv", "tot.csv"]
+        with open(tmp_path / "cpt.csv", encoding="utf-8") as file:
+            columns = next(csv.reader(file))
+        assert columns == [
+            "borehole_name",
+            "point_x",
+            "point_y",
+            "point_z",
+            "position",
+            *models.MethodCPTData.model_fields,
+        ]
+
+    def test_values(self, methods, tmp_path):
+        export_csv(methods, tmp_path)
+
+        cpt = read(tmp_path / "cpt.csv")
+        assert [(row["borehole_name"], row["position"], row["depth"], row["qc"]) for row in cpt] == [
+            ("P1", "0", "1.000", "1.5"),
+            ("P1", "1", "1.020", ""),
+            ("P3", "0", "0.5", "3"),
+        ]
+        assert cpt[0]["point_x"] == "10.5"
+        assert cpt[1]["remarks"] == "A remark, with a comma"
+        assert cpt[2]["point_x"] == ""
+
+        tot = read(tmp_path / "tot.csv")
+        assert [(row["flushing"], row["comment_code"]) for row in tot] == [("True", ""), ("True", "93")]
+
+    def test_header_fields_and_batches(self, methods, tmp_path):
+        with CsvWriter(tmp_path, header_fields=("borehole_name", "conducted_at", "stopcode"), batch_size=1) as writer:
+            for method in methods:
+                writer.write(method)
+            # Rows are written in batches, before the writer is closed
+            assert len(read(writer.path(models.MethodType.TOT))) == 2
+
+        tot = read(tmp_path / "tot.csv")
+        assert tot[0]["conducted_at"] == "2023-06-01T00:00:00"
+        assert tot[0]["stopcode"] == "93"
+        assert "point_x" not in tot[0]
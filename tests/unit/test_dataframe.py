@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+
+from sgf_parser import models
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    pytest.skip("Requires the optional pandas and numpy dependencies", allow_module_level=True)
+
+from sgf_parser.dataframe import methods_to_dataframe
+
+
+@pytest.fixture
+def methods(parse_sgf) -> list[models.Method]:
+    content = (
+        "$\r\nHM=7,HK=P1,HX=10.5,HD=01.06.2023\r\n#\r\nD=1.000,QC=1.5\r\nD=1.020,T=Remark,K=91\r\n"
+        "$\r\nHM=24,HK=P2\r\n#\r\nD=0.0,A=1,AR=1\r\nD=2.0,A=2,K=93\r\n"
+    )
+    return parse_sgf(content)
+
+
+class TestDataFrame:
+    def test_method(self, methods):
+        df = methods[1].to_dataframe()
+
+        assert list(df.columns) == ["position", *models.MethodTOTData.model_fields]
+        assert df["depth"].dtype == np.float64
+        assert df["depth"].tolist() == [0.0, 2.0]
+        assert df["comment_code"].dtype == "Int64"
+        assert df["comment_code"].isna().tolist() == [True, False]
+        assert df["flushing"].dtype == "boolean"
+        assert df["flushing"].tolist() == [True, True]
+        assert df["remarks"].dtype == "string"
+
+    def test_header_fields(self, methods):
+        df = methods[0].to_dataframe(header_fields=("borehole_name", "point_x", "conducted_at", "stopcode"))
+
+        assert list(df.columns[:5]) == ["borehole_name", "point_x", "conducted_at", "stopcode", "position"]
+        assert df["borehole_name"].tolist() == ["P1", "P1"]
+        assert df["point_x"].tolist() == [10.5, 10.5]
+        assert df["conducted_at"].tolist() == [pd.Timestamp(datetime(2023, 6, 1))] * 2
+        assert df["stopcode"].tolist() == [91, 91]
+        assert df["qc"].tolist()[0] == 1.5
+        assert np.isnan(df["qc"].tolist()[1])
+        assert df["remarks"].tolist()[1] == "Remark"
+
+    def test_methods(self, methods):
+        df = methods_to_dataframe(methods)
+
+        assert list(df.columns[:7]) == [
+            "method",
+            "method_type",
+            "borehole_name",
+            "point_x",
+            "point_y",
+            "point_z",
+            "position",
+        ]
+        assert df["method"].tolist() == [0, 0, 1, 1]
+        assert df["method_type"].tolist() == ["CPT", "CPT", "TOT", "TOT"]
+        assert df["position"].tolist() == [0, 1, 0, 1]
+        assert df["depth"].tolist() == [1.0, 1.02, 0.0, 2.0]
+        # Fields of only one of the method types
+        assert df["qc"].isna().tolist() == [False, True, True, True]
+        assert df["flushing"].isna().tolist() == [True, True, False, False]
+
+    def test_empty(self):
+        df = methods_to_dataframe([])
+
+        assert len(df) == 0
+        assert "position" in df.columns
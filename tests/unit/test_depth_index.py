@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+import pytest
+
+from sgf_parser import models
+
+
+def sgf(method_code: str, *rows: str) -> str:
+    return f"$\r\nHM={method_code}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+class TestDepthIndex:
+    @pytest.mark.parametrize(
+        "depth, mode, expected_position",
+        [
+            (0.0, "nearest", 0),
+            (-1, "nearest", 0),
+            (0.04, "nearest", 0),
+            (0.05, "nearest", 0),  # Halfway, pick the shallower row
+            (0.06, "nearest", 1),
+            (0.35, "nearest", 3),
+            (10, "nearest", 3),
+            (-1, "floor", None),
+            (0.0, "floor", 0),
+            (0.19, "floor", 1),
+            ("0.2", "floor", 2),
+            (Decimal("12.35"), "floor", 3),
+        ],
+    )
+    def test_at_depth(self, parse_sgf, depth, mode, expected_position):
+        [method] = parse_sgf(sgf("24", "D=0.0", "D=0.1", "D=0.2", "D=0.3"))
+
+        row = method.at_depth(depth, mode=mode)
+
+        if expected_position is None:
+            assert row is None
+        else:
+            assert row is method.method_data[expected_position]
+
+    def test_at_depth_unsupported_mode(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.0", "D=0.1"))
+
+        with pytest.raises(ValueError):
+            method.at_depth(0.0, mode="ceil")
+
+    def test_depth_window_is_a_view(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", *(f"D={i / 10:.1f}" for i in range(100))))
+
+        window = method.depth_window(5, 6.05)
+
+        assert [row.depth for row in window] == [Decimal(f"{i / 10:.1f}") for i in range(50, 61)]
+        assert len(window) == 11
+        assert window[0] is method.method_data[50]
+        assert window[-1] is method.method_data[60]
+        assert isinstance(window.positions, range)
+        assert [row.depth for row in window[1:3]] == [Decimal("5.1"), Decimal("5.2")]
+        assert len(method.depth_window(6, 5)) == 0
+
+    def test_non_monotonic_and_duplicate_depths(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.0", "D=0.2", "D=0.1", "D=0.2,K=41", "D=0.3"))
+
+        assert [row.depth for row in method.depth_window(0, 1)] == [
+            Decimal(d) for d in ("0.0", "0.1", "0.2", "0.2", "0.3")
+        ]
+        assert list(method.depth_window(0.2, 0.2).positions) == [1, 3]
+        # Rows with the same depth resolve to the last one in file order
+        assert method.at_depth(0.2, mode="floor") is method.method_data[3]
+        assert method.at_depth(0.19) is method.method_data[3]
+        assert method.at_depth(0.12) is method.method_data[2]
+
+    def test_rows_without_depth(self, parse_sgf):
+        [method] = parse_sgf(sgf("3", "D=1.0,A=1", "A=2", "D=2.0,A=3"))
+
+        assert method.at_depth(1.4) is method.method_data[0]
+        assert [row.penetration_force for row in method.depth_window(0, 5)] == [Decimal(1), Decimal(3)]
+
+    def test_method_without_depths(self, parse_sgf):
+        [method] = parse_sgf(sgf("35", "AD=1,U=100", "AD=2,U=90"))
+
+        assert method.at_depth(1.0) is None
+        assert method.at_depth(1.0, mode="floor") is None
+        assert len(method.depth_window(0, 10)) == 0
+
+    def test_index_follows_method_data(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.0", "D=0.1"))
+        assert method.at_depth(5).depth == Decimal("0.1")
+
+        method.method_data.append(models.MethodTOTData(D="5.0"))
+
+        assert method.at_depth(5).depth == Decimal("5.0")
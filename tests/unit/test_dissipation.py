@@ -0,0 +1,102 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.dissipation import dissipation_parameters_batch
+
+
+def dt(header: str, *rows: str) -> str:
+    return f"$\r\nHM=35,{header}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+def dissipation_rows(ui: float, u0: float, t50: float, times) -> list[str]:
+    """Rows of the dissipation curve u = u0 + (ui - u0) / (1 + t / t50), starting at t = 0"""
+    return [f"AD={time:.3f},AG={u0 + (ui - u0) / (1 + time / t50):.3f}" for time in (0, *times)]
+
+
+class TestDissipation:
+    def test_t50_and_t90(self, parse_sgf):
+        [method] = parse_sgf(dt("IC=5.0", *dissipation_rows(300, 50, 60, np.geomspace(0.5, 10000, 200))))
+
+        result = method.dissipation_parameters(u0=50)
+
+        assert result["depth"] == 5.0
+        assert result["ui"] == 300
+        assert result["u0"] == 50
+        assert result["t50"] == pytest.approx(60, rel=0.01)
+        assert result["t90"] == pytest.approx(540, rel=0.01)
+
+    def test_hydrostatic_u0(self, parse_sgf):
+        [method] = parse_sgf(dt("IC=6.0", *dissipation_rows(300, 39.24, 60, np.geomspace(0.5, 10000, 200))))
+
+        result = method.dissipation_parameters(water_level=2.0)
+
+        assert result["u0"] == pytest.approx(9.81 * 4)
+        assert result["t50"] == pytest.approx(60, rel=0.01)
+
+    def test_extrapolated_u0(self, parse_sgf):
+        # u = 50 + 250 / (1 + t / 60) tends to 50 + 15000 / t, which is close to linear in 1 / sqrt(t) near zero
+        [method] = parse_sgf(dt("IC=5.0", *dissipation_rows(300, 50, 60, np.geomspace(0.5, 100000, 200))))
+
+        result = method.dissipation_parameters()
+
+        assert result["u0"] == pytest.approx(50, abs=5)
+
+    def test_dilatory_response(self, parse_sgf):
+        rows = ["AD=0.0,AG=100", "AD=5.0,AG=200", "AD=10.0,AG=150", "AD=100.0,AG=100", "AD=1000.0,AG=70"]
+        [method] = parse_sgf(dt("IC=5.0", *rows))
+
+        result = method.dissipation_parameters(u0=50)
+
+        assert result["ui"] == 200
+        # The crossing of u = 125 is between 10 s and 100 s, interpolated in log time
+        assert result["t50"] == pytest.approx(10 * 10**0.5)
+        assert np.isnan(result["t90"])
+
+    def test_missing_value_before_crossing(self, parse_sgf):
+        rows = ["AD=0.0,AG=100", "AD=5.0,AG=200", "AD=10.0,AG=150", "AD=50.0", "AD=100.0,AG=100"]
+        [method] = parse_sgf(dt("IC=5.0", *rows))
+
+        result = method.dissipation_parameters(u0=50)
+
+        # The row without a pore pressure is skipped, and the crossing interpolated between 10 s and 100 s
+        assert result["t50"] == pytest.approx(10 * 10**0.5)
+
+    def test_root_time(self, parse_sgf):
+        times = np.linspace(0, 30, 31) ** 2
+        rows = [f"AD={time:.1f},AG={max(300 - 10 * np.sqrt(time), 50):.3f}" for time in times]
+        [method] = parse_sgf(dt("IC=5.0", *rows))
+
+        result = method.dissipation_parameters(u0=50, root_time=True)
+
+        assert result["ui_root"] == pytest.approx(300)
+        assert result["t50_root"] == pytest.approx(12.5**2)
+        assert result["t50"] == pytest.approx(12.5**2, rel=0.02)
+
+    def test_batch(self, parse_sgf):
+        methods = parse_sgf(
+            dt("IC=5.0", *dissipation_rows(300, 50, 60, np.geomspace(0.5, 10000, 50)))
+            + dt("IC=2.0")
+            + dt("IC=8.0", *dissipation_rows(500, 70, 10, np.geomspace(0.5, 10000, 50)))
+        )
+
+        result = dissipation_parameters_batch(methods, u0=[50, None, 70], root_time=True)
+
+        assert len(result["t50"]) == 3
+        assert np.isnan(result["t50"][1])
+        for position in (0, 2):
+            single = methods[position].dissipation_parameters(u0=result["u0"][position], root_time=True)
+            for name, value in single.items():
+                assert result[name][position] == pytest.approx(value, nan_ok=True)
+
+    def test_header_water_level(self, parse_sgf):
+        [method] = parse_sgf(dt("IC=6.0,HG=2.0", *dissipation_rows(300, 39.24, 60, np.geomspace(0.5, 10000, 200))))
+
+        result = method.dissipation_parameters()
+
+        assert result["u0"] == pytest.approx(9.81 * 4)
+        # The given water level is used instead of the header
+        assert method.dissipation_parameters(water_level=4.0)["u0"] == pytest.approx(9.81 * 2)
@@ -0,0 +1,57 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.dp import dp_parameters_batch
+
+
+def dp(method_code: str, *rows: str) -> str:
+    return f"$\r\nHM={method_code}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+class TestDPParameters:
+    def test_blow_counts(self, parse_sgf):
+        [method] = parse_sgf(dp("108E", "D=0.2,S=10", "D=0.4,SA=6", "D=0.6,S=0", "D=0.8"))
+
+        result = method.derived_parameters()
+
+        np.testing.assert_allclose(result["n_20"], [10, 12, 0, np.nan])
+        np.testing.assert_allclose(result["n_10"], [5, 6, 0, np.nan])
+        np.testing.assert_allclose(result["n_energy"], result["n_20"])
+        assert np.isnan(result["rd"][2])
+
+    def test_dynamic_point_resistance(self, parse_sgf):
+        [method] = parse_sgf(dp("108E", "D=2.0,S=10"))
+
+        result = method.derived_parameters(energy_ratio=0.8, reference_energy_ratio=0.6)
+
+        # DPSH-B: M = 63.5 kg, h = 0.75 m, A = 20 cm2, rods 8 kg/m, anvil 30 kg
+        rd = 0.8 * 63.5 * 9.81 * 0.75 / (20e-4 * 0.02) / 1e6
+        assert result["rd"][0] == pytest.approx(rd)
+        assert result["qd"][0] == pytest.approx(rd * 63.5 / (63.5 + 30 + 8 * 2.0))
+        assert result["n_energy"][0] == pytest.approx(10 * 0.8 / 0.6)
+
+    def test_subtract_rod_friction(self, parse_sgf):
+        [method] = parse_sgf(dp("108E", "D=0.2,S=30,V=0.1", "D=0.4,S=12,AB=100", "D=0.6,S=10"))
+
+        result = method.derived_parameters(subtract_rod_friction=True)
+
+        # AB=100 Nm is converted to a torque of 0.1 kNm
+        np.testing.assert_allclose(method.derived_parameters()["n_20"], [30, 12, 10])
+        np.testing.assert_allclose(result["n_20"], [26, 8, 10])
+
+    def test_batch_with_different_types(self, parse_sgf):
+        methods = parse_sgf(dp("108B", "D=1.0,S=10", "D=1.2,S=12") + dp("108E", "D=1.0,S=10") + dp("108C"))
+
+        batch = dp_parameters_batch(methods)
+
+        assert [len(result["rd"]) for result in batch] == [2, 1, 0]
+        for method, result in zip(methods, batch):
+            single = method.derived_parameters()
+            for name in single:
+                np.testing.assert_allclose(result[name], single[name])
+        # DPL has a lighter hammer than DPSH-B
+        assert batch[0]["rd"][0] < batch[1]["rd"][0]
@@ -0,0 +1,86 @@
+import math
+
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.drilling import drilling_parameters_batch
+from sgf_parser.analysis.rolling import DepthWindows
+
+
+def drilling(method_code: str, *rows: str) -> str:
+    return f"$\r\nHM={method_code}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+class TestDrillingParameters:
+    def test_specific_energy(self, parse_sgf):
+        [method] = parse_sgf(drilling("24", "D=1.0,A=5,B=20,R=25,V=0.1"))
+
+        result = method.drilling_parameters(bit_diameter=0.057)
+
+        area = math.pi * 0.057**2 / 4
+        # Thrust and rotary terms, kPa -> MJ/m3
+        expected = (5 / area + 2 * math.pi * (25 / 60) * 0.1 / (area * 0.02)) / 1000
+        assert result["specific_energy"][0] == pytest.approx(expected)
+        assert result["penetration_per_revolution"][0] == pytest.approx(20 * 60 / 25)
+        assert result["penetration_resistance"][0] == pytest.approx(5 / 20)
+        assert result["normalized_penetration_resistance"][0] == pytest.approx(5 / 48)
+
+    def test_undefined_values(self, parse_sgf):
+        [method] = parse_sgf(drilling("23", "D=1.0,A=5,B=0,R=25,V=0.1", "D=1.1,A=5,B=20", "D=1.2"))
+
+        result = method.drilling_parameters()
+
+        assert np.isnan(result["specific_energy"][0])
+        assert np.isnan(result["penetration_resistance"][0])
+        # Without rotation only the thrust term is left
+        assert result["specific_energy"][1] == pytest.approx(5 / (math.pi * 0.057**2 / 4) / 1000)
+        assert np.isnan(result["penetration_per_revolution"][1])
+        assert np.isnan(result["specific_energy"][2])
+
+    def test_rolling_statistics(self, parse_sgf):
+        [method] = parse_sgf(drilling("73", *(f"D={depth / 10:.1f},A={depth},B=10" for depth in range(10, 20))))
+
+        result = method.drilling_parameters(window=0.2, rolling_fields=("penetration_force", "depth"))
+
+        # The window of each row holds the row above and below
+        np.testing.assert_allclose(result["penetration_force_mean"], [10.5, *range(11, 19), 18.5])
+        np.testing.assert_allclose(result["penetration_force_std"][1:-1], np.std([0, 1, 2]))
+        np.testing.assert_allclose(result["depth_mean"][1:-1], np.arange(1.1, 1.85, 0.1))
+
+    def test_batch(self, parse_sgf):
+        methods = parse_sgf(
+            drilling("24", "D=1.0,A=5,B=20,R=25,V=0.1", "D=1.2,A=6,B=10,R=25,V=0.2")
+            + drilling("23")
+            + drilling("73", "D=1.1,A=50,B=20,R=25,V=0.3")
+        )
+
+        batch = drilling_parameters_batch(methods)
+
+        assert [len(result["depth"]) for result in batch] == [2, 0, 1]
+        for method, result in zip(methods, batch):
+            single = method.drilling_parameters()
+            assert single.keys() == result.keys()
+            for name in single:
+                np.testing.assert_allclose(result[name], single[name])
+        # Windows do not extend across methods
+        assert batch[2]["penetration_force_mean"][0] == 50
+
+
+class TestDepthWindows:
+    def test_windows_per_method(self):
+        depth = np.array([0.0, 0.1, 0.5, 0.0, 0.1, np.nan])
+        values = np.array([1.0, 3.0, 5.0, 10.0, np.nan, 7.0])
+
+        windows = DepthWindows(depth, np.array([0, 3, 6]), window=0.4)
+
+        np.testing.assert_allclose(windows.count(values), [2, 2, 1, 1, 1, 0])
+        np.testing.assert_allclose(windows.mean(values), [2, 2, 5, 10, 10, np.nan])
+        np.testing.assert_allclose(windows.std(values), [1, 1, 0, 0, 0, np.nan])
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            DepthWindows(np.array([0.0]), np.array([0, 1]), window=0)
@@ -0,0 +1,49 @@
+from datetime import datetime, time
+from decimal import Decimal
+from typing import Literal
+
+import pytest
+
+from sgf_parser import models
+from sgf_parser.fields import data_fields, field_kind, header_fields
+from sgf_parser.models.types import ApplicationClass, DPType
+
+
+class TestFields:
+    @pytest.mark.parametrize(
+        "annotation, kind",
+        (
+            (Decimal | None, "float"),
+            (Decimal, "float"),
+            (float | None, "float"),
+            (int | None, "int"),
+            (bool | None, "bool"),
+            (datetime | None, "datetime"),
+            (time | None, "time"),
+            (str | None, "str"),
+            (ApplicationClass | None, "int"),
+            (DPType | None, "str"),
+            (Literal[models.MethodType.CPT], "str"),
+            (int | str, "str"),
+        ),
+    )
+    def test_field_kind(self, annotation, kind):
+        assert field_kind(annotation) == kind
+
+    def test_header_fields(self):
+        fields = header_fields(models.MethodTOT)
+
+        assert "method_data" not in fields
+        assert fields["method_type"] == "str"
+        assert fields["conducted_at"] == "datetime"
+        # Computed fields
+        assert fields["depth_base"] == "float"
+        assert fields["bedrock_elevation"] == "float"
+
+    def test_data_fields(self):
+        fields = data_fields(models.MethodTOTData)
+
+        assert fields["depth"] == "float"
+        assert fields["comment_code"] == "int"
+        assert fields["flushing"] == "bool"
+        assert fields["remarks"] == "str"
@@ -0,0 +1,85 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.filters import hampel_filter_batch, rolling_filter_batch
+from sgf_parser.analysis.rolling import DepthWindows
+
+
+def cpt(*rows: str) -> str:
+    return "$\r\nHM=7\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+def cpt_rows(qc_values) -> list[str]:
+    return [f"D={position / 50:.2f},QC={qc},FS={10 + position % 2}" for position, qc in enumerate(qc_values)]
+
+
+class TestRollingFilter:
+    def test_median(self, parse_sgf):
+        [method] = parse_sgf(cpt(*cpt_rows([1, 1, 9, 1, 2, 2, 2])))
+
+        # Window 0.04 m holds the row above and below
+        result = method.rolling_filter(window=0.04, fields=("qc",))
+
+        np.testing.assert_allclose(result["qc"], [1, 1, 1, 2, 2, 2, 2])
+        assert set(result) == {"depth", "qc"}
+
+    def test_mean(self, parse_sgf):
+        [method] = parse_sgf(cpt(*cpt_rows([1, 2, 3, 10])))
+
+        result = method.rolling_filter(window=0.04, statistic="mean", fields=("qc", "fs"))
+
+        np.testing.assert_allclose(result["qc"], [1.5, 2, 5, 6.5])
+        np.testing.assert_allclose(result["fs"], [10.5, 10 + 1 / 3, 10 + 2 / 3, 10.5])
+
+    def test_missing_values_stay_missing(self, parse_sgf):
+        [method] = parse_sgf(cpt("D=0.00,QC=1", "D=0.02", "D=0.04,QC=3"))
+
+        result = method.rolling_filter(window=0.04, fields=("qc", "u2"))
+
+        np.testing.assert_allclose(result["qc"], [1, np.nan, 3])
+        assert np.isnan(result["u2"]).all()
+
+    def test_unknown_statistic(self):
+        with pytest.raises(ValueError):
+            rolling_filter_batch([], statistic="max")
+
+
+class TestHampelFilter:
+    def test_spikes(self, parse_sgf):
+        qc = [5.0, 5.1, 4.9, 5.0, 25.0, 5.1, 5.0, 4.9, 0.5, 5.0, 5.1]
+        [method] = parse_sgf(cpt(*cpt_rows(qc)))
+
+        result = method.hampel_filter(window=0.1, fields=("qc",))
+
+        assert np.flatnonzero(result["qc_outlier"]).tolist() == [4, 8]
+        assert result["qc"][4] == pytest.approx(5.0, abs=0.1)
+        np.testing.assert_allclose(result["qc"][:4], qc[:4])
+
+    def test_batch_windows_per_method(self, parse_sgf):
+        methods = parse_sgf(cpt(*cpt_rows([1, 1, 1, 1])) + cpt() + cpt(*cpt_rows([50, 1, 1, 1, 1])))
+
+        batch = hampel_filter_batch(methods, window=0.1, fields=("qc",))
+
+        assert [len(result["qc"]) for result in batch] == [4, 0, 5]
+        for method, result in zip(methods, batch):
+            single = method.hampel_filter(window=0.1, fields=("qc",))
+            for name in single:
+                np.testing.assert_array_equal(result[name], single[name])
+        assert batch[2]["qc_outlier"].tolist() == [True, False, False, False, False]
+
+
+class TestDepthWindowsMedian:
+    def test_median_absolute_deviation(self):
+        depth = np.arange(6) / 10
+        values = np.array([1.0, 2.0, np.nan, 4.0, 8.0, 16.0])
+
+        windows = DepthWindows(depth, np.array([0, 6]), window=0.2)
+        median, deviation = windows.median_absolute_deviation(values)
+
+        np.testing.assert_allclose(median, [1.5, 1.5, 3, 6, 8, 12])
+        np.testing.assert_allclose(deviation, [0.5, 0.5, 1, 2, 4, 4])
+        np.testing.assert_allclose(windows.median(values), median)
@@ -0,0 +1,61 @@
+import io
+import json
+
+import pytest
+
+from sgf_parser import models
+from sgf_parser.export.jsonl import JsonLinesWriter, export_jsonl
+
+
+@pytest.fixture
+def methods(parse_sgf) -> list[models.Method]:
+    content = (
+        "$\r\nHM=7,HK=P1\r\n#\r\nD=1.000,QC=1.5\r\nD=1.020,QC=2\r\nD=1.040,K=91\r\n$\r\nHM=24\r\n#\r\nD=0.0,A=1\r\n"
+    )
+    return parse_sgf(content)
+
+
+def lines(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode("utf-8").splitlines()]
+
+
+class TestJsonLinesExport:
+    def test_rows(self, methods):
+        with io.BytesIO() as file:
+            assert export_jsonl(methods, file) == 2
+            result = lines(file.getvalue())
+
+        assert [(line["method_id"], line.get("position")) for line in result] == [
+            (0, None),
+            (0, 0),
+            (0, 1),
+            (0, 2),
+            (1, None),
+            (1, 0),
+        ]
+        header = result[0]["method"]
+        assert header["borehole_name"] == "P1"
+        assert header["depth_base"] == "1.040"
+        assert header["stopcode"] == 91
+        assert "method_data" not in header
+        assert result[1]["row"] == json.loads(methods[0].method_data[0].model_dump_json())
+        assert result[5]["row"]["penetration_force"] == "1"
+
+    def test_batches(self, methods, tmp_path):
+        path = tmp_path / "methods.jsonl"
+
+        export_jsonl(methods, path, batch_size=2)
+
+        result = lines(path.read_bytes())
+        assert [(line["method_id"], line.get("position"), len(line.get("rows", []))) for line in result] == [
+            (0, None, 0),
+            (0, 0, 2),
+            (0, 2, 1),
+            (1, None, 0),
+            (1, 0, 1),
+        ]
+        assert result[1]["rows"] == [json.loads(row.model_dump_json()) for row in methods[0].method_data[:2]]
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            JsonLinesWriter(io.BytesIO(), batch_size=0)
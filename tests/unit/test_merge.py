@@ -0,0 +1,93 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.merge import group_by_borehole, merge_boreholes, merge_methods
+
+
+def sgf(header: str, *rows: str) -> str:
+    return f"$\r\n{header}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+class TestMergeMethods:
+    def test_merge_on_union_of_depths(self, parse_sgf):
+        [tot] = parse_sgf(sgf("HM=24,HK=1", "D=0.0,A=1", "D=0.2,A=2", "D=0.4,A=3"))
+        [cpt] = parse_sgf(sgf("HM=7,HK=1", "D=0.21,QC=5", "D=0.41,QC=6", "D=1.0,QC=7"))
+
+        result = merge_methods([tot, cpt], tolerance=0.05)
+
+        np.testing.assert_allclose(result["depth"], [0.0, 0.2, 0.21, 0.4, 0.41, 1.0])
+        np.testing.assert_allclose(result["TOT_penetration_force"], [1, 2, 2, 3, 3, np.nan])
+        np.testing.assert_allclose(result["CPT_qc"], [np.nan, 5, 5, 6, 6, 7])
+        np.testing.assert_allclose(result["CPT_depth"], [np.nan, 0.21, 0.21, 0.41, 0.41, 1.0])
+        assert result["TOT_hammering"].dtype == np.bool_
+        assert result["CPT_comment_code"].tolist() == [-1] * 6
+
+    def test_merge_on_method(self, parse_sgf):
+        [tot] = parse_sgf(sgf("HM=24", "D=0.0,A=1", "D=0.2,A=2", "D=0.4,A=3"))
+        [cpt] = parse_sgf(sgf("HM=7", "D=0.1,QC=5", "D=0.3,QC=6", "D=0.3,QC=7"))
+
+        result = merge_methods([tot, cpt], tolerance=0.1, on=0, fields={"TOT": ["penetration_force"], "CPT": ["qc"]})
+
+        assert set(result) == {"depth", "TOT_depth", "TOT_penetration_force", "CPT_depth", "CPT_qc"}
+        np.testing.assert_allclose(result["depth"], [0.0, 0.2, 0.4])
+        # Halfway between two rows picks the shallower row, and equal depths the last row
+        np.testing.assert_allclose(result["CPT_qc"], [5, 5, 7])
+
+    def test_same_method_type(self, parse_sgf):
+        [first] = parse_sgf(sgf("HM=7", "D=0.0,QC=1"))
+        [second] = parse_sgf(sgf("HM=7", "D=0.0,QC=2"))
+
+        result = merge_methods([first, second], fields={"CPT": ["qc"]})
+
+        assert result["CPT_qc"].tolist() == [1]
+        assert result["CPT_2_qc"].tolist() == [2]
+
+    def test_empty(self, parse_sgf):
+        result = merge_methods(parse_sgf(sgf("HM=7")), fields={"CPT": ["qc"]})
+
+        assert {name: len(values) for name, values in result.items()} == {"depth": 0, "CPT_depth": 0, "CPT_qc": 0}
+
+
+class TestMergeBoreholes:
+    def test_group_by_borehole(self, parse_sgf):
+        methods = parse_sgf(
+            sgf("HM=24,HK=A", "D=0.0")
+            + sgf("HM=7,HX=100.2,HY=200.1", "D=0.0")
+            + sgf("HM=7,HK=A", "D=0.0")
+            + sgf("HM=24,HX=100.4,HY=199.8", "D=0.0")
+            + sgf("HM=24", "D=0.0")
+        )
+
+        groups = group_by_borehole(methods)
+
+        assert [[methods.index(method) for method in group] for group in groups.values()] == [[0, 2], [1, 3], [4]]
+
+    def test_same_name_in_other_project(self, parse_sgf):
+        methods = parse_sgf(
+            sgf("HM=24,HJ=P1,HK=1", "D=0.0")
+            + sgf("HM=24,HJ=P2,HK=1", "D=0.0")
+            + sgf("HM=7,HJ=P1,HK=1", "D=0.0")
+            + sgf("HM=24,HJ=P2,HX=100.0,HY=200.0", "D=0.0")
+            + sgf("HM=7,HJ=P1,HX=100.0,HY=200.0", "D=0.0")
+        )
+
+        groups = group_by_borehole(methods)
+
+        assert [[methods.index(method) for method in group] for group in groups.values()] == [[0, 2], [1], [3], [4]]
+        assert list(groups)[:2] == [("P1", "1"), ("P2", "1")]
+
+    def test_merge_boreholes(self, parse_sgf):
+        methods = parse_sgf(
+            sgf("HM=24,HK=A", "D=0.0,A=1") + sgf("HM=7,HK=B", "D=0.0,QC=2") + sgf("HM=7,HK=A", "D=0.0,QC=3")
+        )
+
+        result = merge_boreholes(methods, fields={"TOT": ["penetration_force"], "CPT": ["qc"]})
+
+        assert list(result) == [(None, "A"), (None, "B")]
+        assert result[None, "A"]["TOT_penetration_force"].tolist() == [1]
+        assert result[None, "A"]["CPT_qc"].tolist() == [3]
+        assert "TOT_depth" not in result[None, "B"]
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import pytest
+
+from sgf_parser import models
+
+TOT = "$\r\nHM=24,HZ=40.5\r\n#\r\nD=0.0\r\nD=1.0,K=41\r\nD=2.0\r\nD=3.0,K=93\r\n"
+
+
+@pytest.fixture
+def method(parse_sgf) -> models.MethodTOT:
+    [method] = parse_sgf(TOT)
+    return method
+
+
+class TestMethodCache:
+    def test_summaries_are_served_from_cache(self, method):
+
+        # Poke the cache to prove that model_dump() does not rescan method_data
+        method._cache["depth_in_soil"] = Decimal(-1)
+
+        assert method.model_dump()["depth_in_soil"] == Decimal(-1)
+        assert method.depth_in_soil == Decimal(-1)
+
+    def test_cache_is_populated_after_post_processing(self, method):
+
+        assert {"depth_top", "depth_base", "stopcode", "depth_in_soil", "depth_in_rock"} <= method._cache.keys()
+
+    def test_append_row_invalidates(self, method):
+        assert method.depth_base == Decimal("3.0")
+
+        method.method_data.append(models.MethodTOTData(D="4.0", K="94"))
+
+        assert method.depth_base == Decimal("4.0")
+        assert method.stopcode == 94
+
+    def test_replace_method_data_invalidates(self, method):
+        assert method.stopcode == 93
+
+        method.method_data = [models.MethodTOTData(D="0.5"), models.MethodTOTData(D="1.5", K="90")]
+
+        assert method.depth_top == Decimal("0.5")
+        assert method.stopcode == 90
+        assert method.depth_in_soil == Decimal("1.5")
+
+    def test_header_assignment_invalidates(self, method):
+        assert method.bedrock_elevation == Decimal("39.5")
+
+        method.point_z = 10.0
+
+        assert method.bedrock_elevation == Decimal("9.0")
+
+    def test_model_copy_update(self, method):
+        assert method.bedrock_elevation == Decimal("39.5")
+
+        copy = method.model_copy(update={"point_z": 10.0})
+
+        assert copy.bedrock_elevation == Decimal("9.0")
+        assert method.bedrock_elevation == Decimal("39.5")
+
+    def test_private_assignment_keeps_cache(self, method):
+        method._cache["depth_in_soil"] = Decimal(-1)
+
+        method._current_hammer_active_state = True
+
+        assert method._current_hammer_active_state is True
+        assert method.depth_in_soil == Decimal(-1)
+
+    def test_in_place_row_change_needs_explicit_invalidation(self, method):
+        assert method.depth_in_soil == Decimal("1.0")
+
+        method.method_data[1].comment_code = None
+        assert method.depth_in_soil == Decimal("1.0")
+
+        method.invalidate_cache()
+        assert method.depth_in_soil == Decimal("3.0")
@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import pytest
+
+from sgf_parser import models
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pytest.skip("Requires the optional pyarrow dependency", allow_module_level=True)
+
+from sgf_parser.export.parquet import PARTITION_SCHEMA, ParquetDatasetWriter, export_parquet
+
+
+def sgf(method_code: str, project_number: str | None, *rows: str) -> str:
+    header = f"HM={method_code},HD=01.06.2023" + ("" if project_number is None else f",HJ={project_number}")
+    return f"$\r\n{header}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+@pytest.fixture
+def methods(parse_sgf) -> list[models.Method]:
+    return parse_sgf(
+        sgf("7", "P1", "D=1.0,QC=1.5", "D=1.1,QC=2.5,K=91")
+        + sgf("24", "P1", "D=0.0,A=1,AR=1", "D=2.0,A=2")
+        + sgf("7", "P2/x", "D=0.5,QC=3")
+        + sgf("7", None, "D=0.7")
+    )
+
+
+class TestParquetExport:
+    def test_layout(self, methods, tmp_path):
+        assert export_parquet(methods, tmp_path / "dataset") == 4
+
+        files = sorted(str(path.relative_to(tmp_path / "dataset")) for path in tmp_path.rglob("*.parquet"))
+        assert files == [
+            "data/method_type=CPT/project_number=P1/part-0.parquet",
+            "data/method_type=CPT/project_number=P2%2Fx/part-0.parquet",
+            "data/method_type=CPT/project_number=__HIVE_DEFAULT_PARTITION__/part-0.parquet",
+            "data/method_type=TOT/project_number=P1/part-0.parquet",
+            "methods/method_type=CPT/project_number=P1/part-0.parquet",
+            "methods/method_type=CPT/project_number=P2%2Fx/part-0.parquet",
+            "methods/method_type=CPT/project_number=__HIVE_DEFAULT_PARTITION__/part-0.parquet",
+            "methods/method_type=TOT/project_number=P1/part-0.parquet",
+        ]
+
+    def test_tables(self, methods, tmp_path):
+        export_parquet(methods, tmp_path)
+
+        partitioning = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+        headers = pq.read_table(tmp_path / "methods" / "method_type=CPT", partitioning=partitioning)
+        headers = headers.sort_by("method_id")
+        assert headers["method_id"].to_pylist() == [0, 2, 3]
+        assert headers["project_number"].to_pylist() == ["P1", "P2/x", None]
+        assert headers["conducted_at"].to_pylist() == [datetime(2023, 6, 1)] * 3
+        assert headers["depth_base"].to_pylist() == [1.1, 0.5, 0.7]
+        assert headers["stopcode"].to_pylist() == [91, None, None]
+        assert headers.schema.field("point_x").type == pa.float64()
+
+        data = pq.read_table(tmp_path / "data" / "method_type=TOT").sort_by([("method_id", "ascending")])
+        assert data["method_id"].to_pylist() == [1, 1]
+        assert data["position"].to_pylist() == [0, 1]
+        assert data["penetration_force"].to_pylist() == [1.0, 2.0]
+        assert data["flushing"].to_pylist() == [True, True]
+        assert data.schema.field("comment_code").type == pa.int64()
+
+    def test_project_number_partitions(self, parse_sgf, tmp_path):
+        methods = parse_sgf(sgf("7", "0123", "D=1.0,QC=1") + sgf("24", None, "D=0.0,A=1"))
+
+        export_parquet(methods, tmp_path)
+
+        partitioning = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+        cpt = pq.read_table(tmp_path / "data" / "method_type=CPT", partitioning=partitioning)
+        assert cpt["project_number"].to_pylist() == ["0123"]
+        # Without a project number in any partition
+        tot = pq.read_table(tmp_path / "methods" / "method_type=TOT", partitioning=partitioning)
+        assert tot["project_number"].to_pylist() == [None]
+
+    def test_batches(self, parse_sgf, tmp_path):
+        methods = parse_sgf("".join(sgf("7", "P1", *(f"D={i / 10},QC={i}" for i in range(25))) for _ in range(4)))
+
+        with ParquetDatasetWriter(tmp_path, batch_size=10, max_buffered_rows=15) as writer:
+            for method in methods:
+                writer.write(method)
+
+        metadata = pq.ParquetFile(tmp_path / "data" / "method_type=CPT" / "project_number=P1" / "part-0.parquet")
+        assert metadata.metadata.num_row_groups == 4
+        data = pq.read_table(tmp_path / "data" / "method_type=CPT")
+        assert data.num_rows == 100
+        assert data["qc"].to_pylist() == [float(i) for i in range(25)] * 4
+
+    def test_max_open_files(self, parse_sgf, tmp_path):
+        projects = ["P1", "P2", "P3", "P1", "P2", "P3"]
+        methods = parse_sgf("".join(sgf("7", project, f"D={i},QC={i}") for i, project in enumerate(projects)))
+
+        with ParquetDatasetWriter(tmp_path, batch_size=1, max_open_files=2) as writer:
+            for method in methods:
+                writer.write(method)
+                assert len(writer._open) <= 2
+
+        # Files closed to open another are continued in a new part file
+        files = sorted(str(path.relative_to(tmp_path / "data")) for path in (tmp_path / "data").rglob("*.parquet"))
+        assert files == [
+            f"method_type=CPT/project_number={project}/part-{part}.parquet"
+            for project in ("P1", "P2", "P3")
+            for part in (0, 1)
+        ]
+        data = pq.read_table(tmp_path / "data" / "method_type=CPT" / "project_number=P2")
+        assert sorted(data["qc"].to_pylist()) == [1.0, 4.0]
+        headers = pq.read_table(tmp_path / "methods" / "method_type=CPT" / "project_number=P3")
+        assert sorted(headers["method_id"].to_pylist()) == [2, 5]
+
+    def test_flush_largest_buffers(self, parse_sgf, tmp_path):
+        methods = parse_sgf(
+            sgf("7", "P1", *(f"D={i / 10},QC={i}" for i in range(8)))
+            + sgf("7", "P2", "D=0.0,QC=1")
+            + sgf("7", "P3", *(f"D={i / 10},QC={i}" for i in range(4)))
+        )
+
+        with ParquetDatasetWriter(tmp_path, batch_size=100, max_buffered_rows=10) as writer:
+            for method in methods:
+                writer.write(method)
+            # Only the largest buffer (P1) is written, the small buffers are kept for larger row groups
+            assert [key[2] for key in writer._open] == ["P1"]
+            assert writer._buffers["data", "CPT", "P2"].rows == 1
+
+        for project, rows in (("P1", 8), ("P2", 1), ("P3", 4)):
+            file = pq.ParquetFile(
+                tmp_path / "data" / "method_type=CPT" / f"project_number={project}" / "part-0.parquet"
+            )
+            assert file.metadata.num_row_groups == 1
+            assert file.metadata.num_rows == rows
+
+    def test_not_empty(self, methods, tmp_path):
+        (tmp_path / "file").write_text("")
+
+        with pytest.raises(FileExistsError):
+            export_parquet(methods, tmp_path)
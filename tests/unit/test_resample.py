@@ -0,0 +1,95 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+
+def sgf(method_code: str, *rows: str) -> str:
+    return f"$\r\nHM={method_code}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+class TestResample:
+    def test_as_arrays(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.0,A=1.5,AR=1", "D=0.1,K=41", "D=0.2,A=2.5,AR=0"))
+
+        arrays = method.as_arrays()
+
+        np.testing.assert_array_equal(arrays["depth"], [0.0, 0.1, 0.2])
+        np.testing.assert_array_equal(arrays["penetration_force"], [1.5, np.nan, 2.5])
+        np.testing.assert_array_equal(arrays["flushing"], [True, True, False])
+        np.testing.assert_array_equal(arrays["comment_code"], [-1, 41, -1])
+        assert arrays is method.as_arrays()
+        assert not arrays["depth"].flags.writeable
+
+    def test_linear(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.00,A=0", "D=0.03,A=3", "D=0.07,A=7", "D=0.25,A=25"))
+
+        result = method.resample(0.1)
+
+        np.testing.assert_allclose(result["depth"], [0.0, 0.1, 0.2])
+        np.testing.assert_allclose(result["penetration_force"], [0.0, 10.0, 20.0])
+
+    def test_linear_outside_samples_is_nan(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.05,A=5", "D=0.15,A=15"))
+
+        result = method.resample(0.05, depth_from=0.0, depth_to=0.2)
+
+        np.testing.assert_allclose(result["depth"], [0.0, 0.05, 0.1, 0.15, 0.2])
+        np.testing.assert_allclose(result["penetration_force"], [np.nan, 5, 10, 15, np.nan])
+
+    def test_mean_and_max(self, parse_sgf):
+        [method] = parse_sgf(
+            sgf("7", "D=0.00,QC=1", "D=0.04,QC=3", "D=0.06,QC=5", "D=0.10,QC=7", "D=0.14", "D=0.31,QC=9")
+        )
+
+        mean = method.resample(0.1, agg="mean")
+        maximum = method.resample(0.1, agg={"qc": "max"})
+
+        np.testing.assert_allclose(mean["depth"], [0.0, 0.1, 0.2, 0.3])
+        # Intervals [-0.05, 0.05), [0.05, 0.15), [0.15, 0.25), [0.25, 0.35)
+        np.testing.assert_allclose(mean["qc"], [2, 6, np.nan, 9])
+        np.testing.assert_allclose(maximum["qc"], [3, 7, np.nan, 9])
+
+    def test_nearest(self, parse_sgf):
+        [method] = parse_sgf(sgf("7", "D=0.00,QC=1", "D=0.04,QC=3", "D=0.16,QC=5"))
+
+        result = method.resample(0.1, agg="nearest", fields=["qc"])
+
+        assert list(result) == ["depth", "qc"]
+        np.testing.assert_allclose(result["qc"], [1, 5])
+
+    def test_state_columns_are_forward_filled(self, parse_sgf):
+        [method] = parse_sgf(
+            sgf("24", "D=0.00,AR=0", "D=0.03,AR=1", "D=0.12,K=73", "D=0.18", "D=0.21,AP=1", "D=0.30,AR=0")
+        )
+
+        result = method.resample(0.1, agg="mean")
+
+        np.testing.assert_array_equal(result["flushing"], [False, True, False, False])
+        np.testing.assert_array_equal(result["hammering"], [False, False, False, True])
+        assert result["flushing"].dtype == np.bool_
+
+    def test_non_monotonic_and_missing_depths(self, parse_sgf):
+        [method] = parse_sgf(sgf("3", "D=0.2,A=2", "A=100", "D=0.0,A=0", "D=0.1,A=1"))
+
+        result = method.resample(0.05)
+
+        np.testing.assert_allclose(result["depth"], [0.0, 0.05, 0.1, 0.15, 0.2])
+        np.testing.assert_allclose(result["penetration_force"], [0, 0.5, 1, 1.5, 2])
+
+    def test_empty(self, parse_sgf):
+        [method] = parse_sgf(sgf("35", "AD=1,U=100"))
+
+        result = method.resample(0.1)
+
+        assert len(result["depth"]) == 0
+        assert len(result["u2"]) == 0
+
+    @pytest.mark.parametrize("step, agg", [(0, "linear"), (0.1, "median")])
+    def test_invalid_arguments(self, parse_sgf, step, agg):
+        [method] = parse_sgf(sgf("24", "D=0.0,A=1", "D=0.1,A=1"))
+
+        with pytest.raises(ValueError):
+            method.resample(step, agg=agg)
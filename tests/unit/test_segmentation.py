@@ -0,0 +1,78 @@
+import pytest
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.segmentation import detect_layers_batch
+
+
+def sgf(method_code: str, *rows: str) -> str:
+    return f"$\r\nHM={method_code}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+def layered_rows(seed: int, *layers: tuple[int, float, float]) -> list[str]:
+    """Rows every 0.1 m of layers given as (rows, penetration force, penetration rate), with some noise"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for count, force, rate in layers:
+        for _ in range(count):
+            noise = rng.normal(0, 0.2, 2)
+            rows.append(f"D={len(rows) / 10:.1f},A={force + noise[0]:.3f},B={rate + noise[1]:.3f}")
+    return rows
+
+
+class TestDetectLayers:
+    def test_layers(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", *layered_rows(1, (30, 5, 20), (20, 10, 20), (25, 10, 5))))
+
+        result = method.detect_layers()
+
+        np.testing.assert_array_equal(result["start"], [0, 30, 50])
+        np.testing.assert_array_equal(result["stop"], [30, 50, 75])
+        np.testing.assert_allclose(result["depth_from"], [0.0, 3.0, 5.0])
+        np.testing.assert_allclose(result["depth_to"], [3.0, 5.0, 7.4])
+        np.testing.assert_allclose(result["penetration_force_mean"], [5, 10, 10], atol=0.2)
+        np.testing.assert_allclose(result["penetration_rate_mean"], [20, 20, 5], atol=0.2)
+        assert np.all(result["penetration_force_std"] < 0.5)
+        assert np.all(np.isnan(result["torque_mean"]))
+
+    def test_penalty(self, parse_sgf):
+        [method] = parse_sgf(sgf("73", *layered_rows(2, (30, 5, 20), (20, 10, 20), (25, 10, 5))))
+
+        assert len(method.detect_layers(penalty=1e6)["start"]) == 1
+        result = method.detect_layers(penalty=0, min_size=5)
+        assert len(result["start"]) > 3
+        assert np.all(result["stop"] - result["start"] >= 5)
+
+    def test_missing_values(self, parse_sgf):
+        rows = layered_rows(3, (20, 5, 20), (20, 15, 20))
+        rows[5] = "D=0.5"
+        rows[25] = "D=2.5,B=20"
+        [method] = parse_sgf(sgf("24", *rows))
+
+        result = method.detect_layers(fields=("penetration_force",))
+
+        np.testing.assert_array_equal(result["start"], [0, 20])
+        np.testing.assert_array_equal(result["stop"], [20, 40])
+        np.testing.assert_allclose(result["penetration_force_mean"], [5, 15], atol=0.2)
+
+    def test_batch(self, parse_sgf):
+        methods = parse_sgf(
+            sgf("24", *layered_rows(4, (10, 5, 20), (10, 10, 10)))
+            + sgf("24")
+            + sgf("73", *layered_rows(5, (15, 1, 20), (5, 10, 10)))
+        )
+
+        batch = detect_layers_batch(methods)
+
+        assert [len(result["start"]) for result in batch] == [2, 0, 2]
+        for method, result in zip(methods, batch):
+            single = method.detect_layers()
+            for name in single:
+                np.testing.assert_allclose(result[name], single[name])
+
+    def test_invalid_min_size(self):
+        with pytest.raises(ValueError):
+            detect_layers_batch([], min_size=0)
@@ -0,0 +1,107 @@
+from io import StringIO
+
+import pytest
+
+from sgf_parser import Parser, models
+
+try:
+    import numpy as np
+except ImportError:
+    pytest.skip("Requires the optional numpy dependency", allow_module_level=True)
+
+from sgf_parser.analysis.spatial import SpatialIndex
+
+
+def sgf(method_code: str, x: float, y: float, *rows: str) -> str:
+    return f"$\r\nHM={method_code},HX={x},HY={y}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+@pytest.fixture(scope="module")
+def methods() -> list[models.Method]:
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 1000, (300, 2))
+    content = "".join(sgf("7" if i % 3 else "24", x, y, "D=0.0") for i, (x, y) in enumerate(points))
+    # A method without coordinates
+    content += "$\r\nHM=7\r\n#\r\nD=0.0\r\n"
+    with StringIO(content) as file:
+        return Parser().scan_headers(file)
+
+
+def brute_force(methods, x, y, method_type=None):
+    distances = [
+        (np.hypot(method.point_x - x, method.point_y - y), position)
+        for position, method in enumerate(methods)
+        if method.point_x is not None and (method_type is None or method.method_type == method_type)
+    ]
+    return sorted(distances)
+
+
+class TestSpatialIndex:
+    def test_scan_headers(self, methods):
+        assert len(methods) == 301
+        assert all(not method.method_data for method in methods)
+        assert methods[0].method_type == models.MethodType.TOT
+        assert methods[1].method_type == models.MethodType.CPT
+
+    @pytest.mark.parametrize("cell_size", [None, 1.0, 5000.0])
+    def test_radius(self, methods, cell_size):
+        index = SpatialIndex(methods, cell_size)
+
+        positions, distances = index.query_radius(500, 500, 120)
+
+        expected = [(distance, position) for distance, position in brute_force(methods, 500, 500) if distance <= 120]
+        assert positions.tolist() == [position for _, position in expected]
+        np.testing.assert_allclose(distances, [distance for distance, _ in expected])
+        assert len(index) == 300
+
+    def test_bbox_with_method_type(self, methods):
+        index = SpatialIndex(methods)
+
+        result = index.within_bbox(100, 200, 400, 300, method_type=models.MethodType.TOT)
+
+        expected = [
+            method
+            for method in methods
+            if method.point_x is not None
+            and 100 <= method.point_x <= 400
+            and 200 <= method.point_y <= 300
+            and method.method_type == models.MethodType.TOT
+        ]
+        assert result == expected
+
+    @pytest.mark.parametrize("x, y", [(500, 500), (0, 0), (-3000, 2000)])
+    def test_nearest(self, methods, x, y):
+        index = SpatialIndex(methods)
+
+        positions, distances = index.query_nearest(x, y, k=5, method_type=models.MethodType.CPT)
+
+        expected = brute_force(methods, x, y, models.MethodType.CPT)[:5]
+        assert positions.tolist() == [position for _, position in expected]
+        np.testing.assert_allclose(distances, [distance for distance, _ in expected])
+
+    def test_nearest_max_distance(self, methods):
+        index = SpatialIndex(methods)
+
+        assert index.nearest(-3000, 2000, k=3, max_distance=100) == []
+
+    def test_nearest_many(self, methods):
+        index = SpatialIndex(methods)
+        tot = [method for method in methods if method.method_type == models.MethodType.TOT]
+
+        positions, distances = index.nearest_many(
+            np.array([method.point_x for method in tot]),
+            np.array([method.point_y for method in tot]),
+            k=1,
+            method_type=models.MethodType.CPT,
+        )
+
+        for method, position, distance in zip(tot, positions[:, 0], distances[:, 0]):
+            assert (distance, position) == brute_force(methods, method.point_x, method.point_y, models.MethodType.CPT)[
+                0
+            ]
+
+    def test_empty(self):
+        index = SpatialIndex([])
+
+        assert index.within_radius(0, 0, 10) == []
+        assert index.nearest(0, 0) == []
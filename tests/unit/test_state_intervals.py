@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+import pytest
+
+from sgf_parser.models.state_intervals import StateInterval, StateIntervals
+
+
+def sgf(method_code: str, *rows: str) -> str:
+    return f"$\r\nHM={method_code}\r\n#\r\n" + "".join(f"{row}\r\n" for row in rows)
+
+
+class TestStateIntervals:
+    def test_intervals(self, parse_sgf):
+        [method] = parse_sgf(
+            sgf(
+                "24",
+                "D=0.0",
+                "D=0.2,K=72",
+                "D=0.4",
+                "D=0.6,K=74",
+                "D=0.8,K=73",
+                "D=1.0,K=76",
+                "D=1.2",
+            )
+        )
+
+        flushing = method.state_intervals("flushing")
+        hammering = method.state_intervals("hammering")
+
+        assert list(flushing) == [
+            StateInterval(Decimal("0.2"), Decimal("0.8"), 1, 4),
+            StateInterval(Decimal("1.0"), Decimal("1.2"), 5, 7),
+        ]
+        assert flushing.total_length == Decimal("0.8")
+        assert hammering.as_tuples() == [(Decimal("0.6"), Decimal("1.2"))]
+        assert len(method.state_intervals("increased_rotation_rate")) == 0
+        assert all(row.flushing for row in method.method_data[flushing[0].start : flushing[0].stop])
+
+    @pytest.mark.parametrize(
+        "depth, expected",
+        [(0.1, False), (0.2, True), (0.5, True), (0.8, True), (0.9, False), (1.1, True), (1.3, False)],
+    )
+    def test_is_active(self, depth, expected):
+        intervals = StateIntervals.from_tuples([("0.2", "0.8"), ("1.0", "1.2")])
+
+        assert intervals.is_active(depth) is expected
+
+    def test_from_tuples_round_trip(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.0,AR=1", "D=0.2,AR=0", "D=0.4,AR=1", "D=0.6"))
+
+        intervals = method.state_intervals("flushing")
+
+        assert StateIntervals.from_tuples(intervals.as_tuples()) == intervals
+
+    def test_updated_with_data(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.0,AP=1", "D=0.2"))
+        assert method.state_intervals("hammering").total_length == Decimal("0.2")
+
+        method.method_data.append(method.method_data_type.model_validate({"D": "0.4", "AP": "1"}))
+
+        assert method.state_intervals("hammering").total_length == Decimal("0.4")
+
+    def test_method_without_states(self, parse_sgf):
+        [method] = parse_sgf(sgf("7", "D=0.0,QC=1"))
+
+        assert method.state_intervals("hammering") == StateIntervals()
+
+    def test_unknown_state(self, parse_sgf):
+        [method] = parse_sgf(sgf("24", "D=0.0"))
+
+        with pytest.raises(ValueError):
+            method.state_intervals("rotation")
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from sgf_parser import models
+
+
+@pytest.fixture
+def method(parse_sgf) -> models.Method:
+    content = "$\r\nHM=7,HK=P1,HD=01.06.2023\r\n#\r\nD=1.000,QC=1.5\r\nD=1.020,T=Remark\r\nD=1.040,QC=2,K=91\r\n"
+    [method] = parse_sgf(content)
+    return method
+
+
+class TestToColumns:
+    def test_python(self, method):
+        result = method.to_columns()
+
+        dump = method.model_dump()
+        assert {name: value for name, value in result.items() if name != "method_data"} == {
+            name: value for name, value in dump.items() if name not in ("method_data", "method_data_type")
+        }
+        assert list(result["method_data"]) == list(models.MethodCPTData.model_fields)
+        for name, values in result["method_data"].items():
+            assert values == [row[name] for row in dump["method_data"]]
+        assert result["stopcode"] == 91
+
+    def test_json(self, method):
+        result = method.to_columns(mode="json")
+
+        rows = [json.loads(row.model_dump_json()) for row in method.method_data]
+        assert result["method_data"]["depth"] == ["1.000", "1.020", "1.040"]
+        assert result["method_data"]["remarks"] == [None, "Remark", None]
+        for name, values in result["method_data"].items():
+            assert values == [row[name] for row in rows]
+        assert result["conducted_at"] == "2023-06-01T00:00:00"
+        assert json.loads(method.to_columns_json()) == result
+
+    def test_empty(self, parse_sgf):
+        [method] = parse_sgf("$\r\nHM=24\r\n#\r\n")
+
+        assert method.to_columns()["method_data"]["depth"] == []